@@ -1,19 +1,39 @@
 from flask import Flask
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
+from sqlalchemy.exc import IntegrityError
 from config import Config
 from models import db
+from migrations import run_migrations, schema_lock
+from services.drive_status_service import DriveStatusService
+from services.import_job_service import ImportJobService
+from services.replica_service import ReplicaService
+from services.search_service import SearchService
+from services.stats_service import StatsService
+from utils.background import init_background_tasks
+from utils.conditional import init_conditional_requests
+from utils.json_provider import init_json_provider
+from utils.query_budget import init_query_budget
+from utils.response_cache import init_response_cache
+from utils.sqlite_tuning import init_sqlite_pragmas
+from utils.tenancy import init_tenancy, known_schools, tenant_context, tenant_engine
 import routes
 
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    init_json_provider(app)
 
     # Initialize extensions
     db.init_app(app)
-    CORS(app)
+    init_sqlite_pragmas(app, db)
+    CORS(app, expose_headers=['ETag', 'Last-Modified'])
     JWTManager(app)
+    init_tenancy(app)
+    init_query_budget(app, db)
+    init_response_cache(app)
+    init_conditional_requests(app)
 
     # Register blueprints
     app.register_blueprint(routes.auth_bp)
@@ -23,16 +43,61 @@ def create_app():
     app.register_blueprint(routes.vaccinations_bp)
     app.register_blueprint(routes.reports_bp)
 
-    # Create database tables
-    with app.app_context():
-        db.create_all()
-        # Create default admin user if not exists
-        from models.user import User
-        if not User.query.filter_by(username='admin').first():
-            admin = User(username='admin', role='coordinator', name='School Coordinator')
-            admin.set_password('admin123')
-            db.session.add(admin)
-            db.session.commit()
+    # Create each school's tables and apply pending schema migrations
+    for school in known_schools(app):
+        with tenant_context(app, school):
+            engine = tenant_engine(db)
+            with schema_lock(engine) as connection:
+                db.metadata.create_all(connection)
+            run_migrations(db, engine)
+            SearchService.detect_indexes()
+
+            # Create default admin user if not exists
+            from models.user import User
+            if not User.query.filter_by(username='admin').first():
+                admin = User(username='admin', role='coordinator', name='School Coordinator')
+                admin.set_password('admin123')
+                db.session.add(admin)
+                try:
+                    db.session.commit()
+                except IntegrityError:
+                    # Another worker booting at the same time created it first
+                    db.session.rollback()
+
+            # Build the dashboard counters if this database has never had them
+            StatsService.get_counters()
+
+    # Server processes start their worker threads, recover orphaned imports, catch up on drive
+    # statuses and sync replicas on their first request; CLI commands do none of it
+    init_background_tasks(
+        app, ImportJobService.start_heartbeat, DriveStatusService.start_scheduler, ReplicaService.start_scheduler
+    )
+
+    @app.cli.command('migrate')
+    def migrate():
+        """Apply pending schema migrations to every school's database"""
+        for school in known_schools(app):
+            with tenant_context(app, school):
+                applied = run_migrations(db, tenant_engine(db))
+                print(f"{school}: applied migrations: {', '.join(applied)}" if applied
+                      else f'{school}: database is up to date')
+
+    @app.cli.command('rebuild-stats')
+    def rebuild_stats():
+        """Recompute the dashboard counters from the base tables"""
+        for school in known_schools(app):
+            with tenant_context(app, school):
+                counters = StatsService.rebuild()
+                print(f'{school}: ' + ', '.join(f'{name}={value}' for name, value in counters.items()))
+
+    @app.cli.command('reconcile-drives')
+    def reconcile_drives():
+        """Mark past drives Completed and future ones Scheduled"""
+        for school in known_schools(app):
+            with tenant_context(app, school):
+                run = DriveStatusService.reconcile()
+                print(f'{school}: {run.completed_count} completed, {run.reopened_count} reopened '
+                      f'in {run.duration_ms} ms')
 
     return app
 
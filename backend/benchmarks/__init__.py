@@ -0,0 +1 @@
+# Benchmark scripts, run from the backend directory: python -m benchmarks.<name>
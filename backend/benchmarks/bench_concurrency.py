@@ -0,0 +1,88 @@
+"""Measure read/write throughput under concurrent requests for each DATABASE_PROFILE.
+
+Each profile runs in its own process against its own database, since the
+engine options and pragmas are fixed when the app creates its engines.
+"""
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from flask_jwt_extended import create_access_token
+from benchmarks.common import create_benchmark_app, seed_students
+
+PROFILES = ['basic', 'production']
+STUDENTS = int(os.environ.get('BENCH_STUDENTS', 20000))
+READERS = int(os.environ.get('BENCH_READERS', 8))
+WRITERS = int(os.environ.get('BENCH_WRITERS', 4))
+SECONDS = float(os.environ.get('BENCH_SECONDS', 10))
+
+
+def run_profile():
+    """Hammer one app with reader and writer threads for SECONDS and print its counts"""
+    app, db_path = create_benchmark_app()
+
+    with app.app_context():
+        from models import db, Student
+        seed_students(db, STUDENTS, random.Random(42))
+        student_ids = [row[0] for row in db.session.query(Student.id)]
+        headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + SECONDS
+
+    def worker(seed, write):
+        rng = random.Random(seed)
+        done = errors = 0
+        with app.test_client() as client:
+            while time.perf_counter() < deadline:
+                if write:
+                    response = client.put(f'/api/students/{rng.choice(student_ids)}', headers=headers,
+                                          json={'name': f'Renamed {rng.randint(0, 10 ** 6)}'})
+                else:
+                    response = client.get(f'/api/students?page={rng.randint(1, 50)}&per_page=50',
+                                          headers=headers)
+                if response.status_code == 200:
+                    done += 1
+                else:
+                    errors += 1
+        with lock:
+            counts['writes' if write else 'reads'] += done
+            counts['errors'] += errors
+
+    threads = [threading.Thread(target=worker, args=(i, i < WRITERS)) for i in range(READERS + WRITERS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    with app.app_context():
+        from models import db
+        journal_mode = db.session.execute(db.text('PRAGMA journal_mode')).scalar()
+
+    print(f'{os.environ["DATABASE_PROFILE"]} {journal_mode} {counts["reads"] / elapsed:.1f} '
+          f'{counts["writes"] / elapsed:.1f} {counts["errors"]}')
+
+
+def main():
+    print(f'{STUDENTS} students, {READERS} reader and {WRITERS} writer threads, {SECONDS:.0f}s per profile')
+    print(f'\n{"profile":12s} {"journal":8s} {"reads/s":>10s} {"writes/s":>10s} {"errors":>8s}')
+    for profile in PROFILES:
+        result = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_concurrency', '--run'],
+            env={**os.environ, 'DATABASE_PROFILE': profile, 'DRIVE_STATUS_INTERVAL': '0'},
+            capture_output=True, text=True, check=True
+        )
+        name, journal_mode, reads, writes, errors = result.stdout.split('\n')[-2].split()
+        print(f'{name:12s} {journal_mode:8s} {float(reads):10.1f} {float(writes):10.1f} {int(errors):8d}')
+
+
+if __name__ == '__main__':
+    if '--run' in sys.argv:
+        run_profile()
+    else:
+        main()
@@ -0,0 +1,73 @@
+"""Compare query plans and latency of hot queries with and without the m001 indexes"""
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from benchmarks.common import create_benchmark_app, seed_data, time_call
+from migrations import m001_query_indexes
+
+INDEX_NAMES = [
+    'ix_student_class_name',
+    'ix_vaccination_drive_date',
+    'ix_vaccination_drive_status_date',
+    'ix_vaccination_drive_vaccine_name',
+    'ix_vaccination_record_drive_id',
+    'ix_vaccination_record_date',
+    'uq_vaccination_record_student_drive',
+]
+
+
+def benchmark_queries():
+    today = datetime.now().date()
+    return {
+        'records for drive': (
+            'SELECT * FROM vaccination_record WHERE drive_id = :drive_id', {'drive_id': 7}
+        ),
+        'duplicate check': (
+            'SELECT id FROM vaccination_record WHERE student_id = :student_id AND drive_id = :drive_id',
+            {'student_id': 1234, 'drive_id': 7}
+        ),
+        'vaccinated students': (
+            'SELECT COUNT(DISTINCT student_id) FROM vaccination_record', {}
+        ),
+        'report page by date': (
+            'SELECT id FROM vaccination_record WHERE date <= :date ORDER BY date DESC, id DESC LIMIT 100',
+            {'date': today}
+        ),
+        'upcoming drives': (
+            'SELECT * FROM vaccination_drive WHERE status = :status AND date BETWEEN :start AND :end ORDER BY date',
+            {'status': 'Scheduled', 'start': today, 'end': today + timedelta(days=30)}
+        ),
+        'students in class': (
+            'SELECT * FROM student WHERE class_name = :class_name', {'class_name': '7'}
+        ),
+    }
+
+
+def run(connection, label):
+    print(f'\n== {label} ==')
+    for name, (sql, params) in benchmark_queries().items():
+        plan = connection.execute(text(f'EXPLAIN QUERY PLAN {sql}'), params).fetchall()
+        latency = time_call(lambda: connection.execute(text(sql), params).fetchall())
+        print(f'{name:22s} {latency:9.3f} ms   {" | ".join(row[-1] for row in plan)}')
+
+
+def main():
+    app, db_path = create_benchmark_app()
+
+    with app.app_context():
+        from models import db
+        record_count = seed_data(db)
+        print(f'Seeded {record_count} vaccination records into {db_path}')
+
+        with db.engine.begin() as connection:
+            for index_name in INDEX_NAMES:
+                connection.execute(text(f'DROP INDEX IF EXISTS {index_name}'))
+            connection.execute(text('ANALYZE'))
+            run(connection, 'before (no indexes)')
+
+            m001_query_indexes.upgrade(connection)
+            connection.execute(text('ANALYZE'))
+            run(connection, 'after m001_query_indexes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Compare serializing a large vaccination record listing through to_dict() and through RowSerializer"""
+import json
+import os
+from benchmarks.common import create_benchmark_app, seed_data, time_call
+
+STUDENTS = int(os.environ.get('BENCH_STUDENTS', 50000))
+
+
+def main():
+    app, db_path = create_benchmark_app()
+
+    with app.app_context():
+        from models import db, Student, VaccinationDrive, VaccinationRecord
+        from utils.json_provider import FastJSONProvider
+        from utils.serializers import vaccination_record_serializer
+
+        record_count = seed_data(db, students=STUDENTS)
+        print(f'Seeded {record_count} vaccination records into {db_path} (orjson installed: {FastJSONProvider.use_orjson})')
+
+        stdlib = FastJSONProvider(app)
+        stdlib.use_orjson = False
+        fast = FastJSONProvider(app)
+
+        joined = VaccinationRecord.query.join(
+            Student, VaccinationRecord.student_id == Student.id
+        ).join(
+            VaccinationDrive, VaccinationRecord.drive_id == VaccinationDrive.id
+        )
+
+        def orm_rows():
+            records = VaccinationRecord.query.options(
+                db.joinedload(VaccinationRecord.student).load_only(Student.name),
+                db.joinedload(VaccinationRecord.drive).load_only(VaccinationDrive.vaccine_name).lazyload(
+                    VaccinationDrive.classes)
+            ).all()
+            rows = [record.to_dict() for record in records]
+            db.session.expunge_all()
+            return rows
+
+        def projected_rows():
+            return vaccination_record_serializer.serialize(vaccination_record_serializer.select(joined).all())
+
+        cases = [
+            ('to_dict + json', lambda: json.dumps(orm_rows())),
+            ('to_dict + fast json', lambda: fast.dumps(orm_rows())),
+            ('projected + json', lambda: stdlib.dumps(projected_rows())),
+            ('projected + fast json', lambda: fast.dumps(projected_rows())),
+        ]
+
+        print(f'\n{"path":22s} {"ms":>9s} {"rows/s":>12s}')
+        for name, func in cases:
+            elapsed = time_call(func, repeat=5)
+            print(f'{name:22s} {elapsed:9.1f} {record_count / elapsed * 1000:12,.0f}')
+
+
+if __name__ == '__main__':
+    main()
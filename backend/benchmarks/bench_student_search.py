@@ -0,0 +1,44 @@
+"""Compare leading-wildcard ILIKE search with the FTS5 student search index.
+
+Each search fetches the first page plus the total, as GET /api/students does.
+"""
+import os
+import random
+from benchmarks.common import create_benchmark_app, seed_students, time_call
+
+STUDENTS = int(os.environ.get('BENCH_STUDENTS', 500000))
+SEARCH_TERMS = ['Meera', 'kur', 'ST00123', 'Arjun Sh', '7']
+
+
+def main():
+    app, db_path = create_benchmark_app()
+
+    with app.app_context():
+        from sqlalchemy import or_
+        from models import db, Student
+        from services.search_service import SearchService
+
+        seed_students(db, STUDENTS, random.Random(42))
+        print(f'Seeded {STUDENTS} students into {db_path} (FTS5 available: {SearchService.fts_available()})')
+
+        def ilike_page(term):
+            search_term = f'%{term}%'
+            return Student.query.filter(or_(
+                Student.name.ilike(search_term),
+                Student.student_id.ilike(search_term),
+                Student.class_name.ilike(search_term)
+            )).paginate(page=1, per_page=10).items
+
+        def indexed_page(term):
+            return SearchService.search_students(Student.query, term).paginate(page=1, per_page=10).items
+
+        print(f'\n{"term":12s} {"ILIKE ms":>10s} {"index ms":>10s}  top match')
+        for term in SEARCH_TERMS:
+            ilike_ms = time_call(lambda: ilike_page(term), repeat=5)
+            indexed_ms = time_call(lambda: indexed_page(term), repeat=5)
+            top = indexed_page(term)
+            print(f'{term:12s} {ilike_ms:10.2f} {indexed_ms:10.2f}  {top[0].name if top else "-"}')
+
+
+if __name__ == '__main__':
+    main()
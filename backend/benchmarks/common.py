@@ -0,0 +1,102 @@
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def create_benchmark_app(db_path=None):
+    """Create the app against a throwaway SQLite database"""
+    db_path = db_path or os.path.join(tempfile.mkdtemp(prefix='vaccination_bench_'), 'bench.db')
+    os.environ['DATABASE_URI'] = f'sqlite:///{db_path}'
+
+    from app import create_app
+    return create_app(), db_path
+
+
+FIRST_NAMES = ['Aarav', 'Diya', 'Ishaan', 'Meera', 'Rohan', 'Saanvi', 'Kabir', 'Anaya', 'Vihaan', 'Zara',
+               'Arjun', 'Kiara', 'Reyansh', 'Myra', 'Aditya', 'Nisha', 'Dev', 'Tara', 'Yash', 'Leela']
+LAST_NAMES = ['Sharma', 'Menon', 'Nair', 'Iyer', 'Reddy', 'Das', 'Khan', 'Joseph', 'Pillai', 'Gupta',
+              'Rao', 'Kapoor', 'Thomas', 'Varma', 'Bose', 'Singh', 'Mehta', 'Kurian', 'Shetty', 'Paul']
+CLASSES = [str(i) for i in range(1, 13)]
+
+
+def seed_students(db, students, rng, batch_size=50000):
+    """Insert synthetic students with executemany"""
+    from models import Student
+
+    now = datetime.utcnow()
+    for start in range(1, students + 1, batch_size):
+        db.session.execute(db.insert(Student), [
+            {
+                'student_id': f'ST{i:07d}',
+                'name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                'class_name': rng.choice(CLASSES),
+                'section': rng.choice('ABCD'),
+                'age': rng.randint(5, 18),
+                'gender': rng.choice(['Male', 'Female']),
+                'created_at': now,
+                'updated_at': now
+            }
+            for i in range(start, min(start + batch_size, students + 1))
+        ])
+    db.session.commit()
+
+
+def seed_data(db, students=50000, drives=200, vaccination_rate=0.6, seed=42):
+    """Insert a large synthetic dataset with executemany"""
+    from models import VaccinationDrive, VaccinationRecord, DriveClass
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    today = now.date()
+    classes = CLASSES
+
+    seed_students(db, students, rng)
+
+    drive_rows = []
+    for i in range(1, drives + 1):
+        drive_date = today + timedelta(days=i - drives // 2)
+        drive_rows.append({
+            'vaccine_name': f'Vaccine {i % 15}',
+            'date': drive_date,
+            'available_doses': students,
+            'used_doses': 0,
+            'status': 'Completed' if drive_date < today else 'Scheduled',
+            'created_at': now,
+            'updated_at': now
+        })
+    db.session.execute(db.insert(VaccinationDrive), drive_rows)
+    db.session.execute(db.insert(DriveClass), [
+        {'drive_id': drive, 'class_name': class_name}
+        for drive in range(1, drives + 1)
+        for class_name in rng.sample(classes, 4)
+    ])
+
+    records = []
+    for student in range(1, students + 1):
+        if rng.random() < vaccination_rate:
+            for drive in rng.sample(range(1, drives // 2 + 1), 3):
+                records.append({
+                    'student_id': student,
+                    'drive_id': drive,
+                    'date': drive_rows[drive - 1]['date'],
+                    'status': 'Completed',
+                    'created_at': now,
+                    'updated_at': now
+                })
+    db.session.execute(db.insert(VaccinationRecord), records)
+    db.session.commit()
+
+    return len(records)
+
+
+def time_call(func, repeat=20):
+    """Return the median wall-clock time of func() in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
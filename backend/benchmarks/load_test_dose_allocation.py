@@ -0,0 +1,78 @@
+"""Hammer one drive from many threads and check that doses are never overbooked"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from sqlalchemy import func
+from benchmarks.common import create_benchmark_app
+
+THREADS = 16
+STUDENTS = 400
+AVAILABLE_DOSES = 300
+DUPLICATE_ATTEMPTS = 2  # Each student is submitted this many times
+
+
+def main():
+    app, db_path = create_benchmark_app()
+
+    with app.app_context():
+        from models import db, Student, VaccinationDrive, VaccinationRecord
+
+        db.session.execute(db.insert(Student), [
+            {'student_id': f'LT{i:05d}', 'name': f'Student {i}', 'class_name': '5', 'section': 'A',
+             'created_at': datetime.utcnow(), 'updated_at': datetime.utcnow()}
+            for i in range(STUDENTS)
+        ])
+        drive = VaccinationDrive(
+            vaccine_name='Load Test Vaccine',
+            date=datetime.now().date() + timedelta(days=1),
+            available_doses=AVAILABLE_DOSES,
+            used_doses=0,
+            applicable_classes='5',
+            status='Scheduled'
+        )
+        db.session.add(drive)
+        db.session.commit()
+        drive_id = drive.id
+        student_ids = [row[0] for row in db.session.query(Student.id)]
+        headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+
+    def record(student_id):
+        with app.test_client() as client:
+            response = client.post('/api/vaccinations', json={'student_id': student_id, 'drive_id': drive_id},
+                                   headers=headers)
+            return response.status_code, (response.get_json() or {}).get('error')
+
+    attempts = [student_id for student_id in student_ids for _ in range(DUPLICATE_ATTEMPTS)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as executor:
+        results = list(executor.map(record, attempts))
+    elapsed = time.perf_counter() - start
+
+    outcomes = {}
+    for status, error in results:
+        key = f'{status} {error or ""}'.strip()
+        outcomes[key] = outcomes.get(key, 0) + 1
+
+    with app.app_context():
+        drive = VaccinationDrive.query.get(drive_id)
+        record_count = VaccinationRecord.query.filter_by(drive_id=drive_id).count()
+        distinct_students = db.session.query(func.count(func.distinct(VaccinationRecord.student_id))).filter(
+            VaccinationRecord.drive_id == drive_id).scalar()
+        duplicate_count = record_count - distinct_students
+
+    print(f'{len(attempts)} requests from {THREADS} threads in {elapsed:.2f}s '
+          f'({len(attempts) / elapsed:.0f} req/s) against {db_path}')
+    for key, count in sorted(outcomes.items()):
+        print(f'  {count:5d}  {key}')
+    print(f'used_doses={drive.used_doses} records={record_count} available={AVAILABLE_DOSES} '
+          f'duplicates={duplicate_count}')
+
+    assert drive.used_doses == record_count, 'used_doses drifted from the number of records'
+    assert record_count <= AVAILABLE_DOSES, 'drive was overbooked'
+    assert duplicate_count == 0, 'student vaccinated twice in one drive'
+    print('OK: no overbooking')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,114 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 from datetime import timedelta
+from sqlalchemy.engine import make_url
 
 load_dotenv()
 
+
+def parse_databases(value):
+    """Parse comma-separated school=URI pairs"""
+    return dict(entry.strip().split('=', 1) for entry in (value or '').split(',') if '=' in entry)
+
+
+# Engine tuning per DATABASE_PROFILE: pool options go to every engine, pragmas run on each new SQLite connection
+QUEUE_POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout')
+DATABASE_PROFILES = {
+    'basic': {
+        'engine_options': {},
+        'sqlite_pragmas': {}
+    },
+    'production': {
+        'engine_options': {'pool_size': 10, 'max_overflow': 20, 'pool_recycle': 1800, 'pool_pre_ping': True},
+        'sqlite_pragmas': {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'busy_timeout': 5000,
+                           'mmap_size': 256 * 1024 * 1024}
+    }
+}
+
+
+def database_profile(name):
+    """Return a profile's engine options and SQLite pragmas, with DB_* and SQLITE_* environment overrides"""
+    if name not in DATABASE_PROFILES:
+        raise ValueError(f"Unknown DATABASE_PROFILE '{name}', expected one of {', '.join(DATABASE_PROFILES)}")
+    engine_options = dict(DATABASE_PROFILES[name]['engine_options'])
+    sqlite_pragmas = dict(DATABASE_PROFILES[name]['sqlite_pragmas'])
+
+    for option, variable in (('pool_size', 'DB_POOL_SIZE'), ('max_overflow', 'DB_MAX_OVERFLOW'),
+                             ('pool_recycle', 'DB_POOL_RECYCLE'), ('pool_timeout', 'DB_POOL_TIMEOUT')):
+        if os.environ.get(variable):
+            engine_options[option] = int(os.environ[variable])
+    if os.environ.get('DB_POOL_PRE_PING'):
+        engine_options['pool_pre_ping'] = os.environ['DB_POOL_PRE_PING'].lower() == 'true'
+    for pragma, variable in (('busy_timeout', 'SQLITE_BUSY_TIMEOUT'), ('mmap_size', 'SQLITE_MMAP_SIZE')):
+        if os.environ.get(variable):
+            sqlite_pragmas[pragma] = int(os.environ[variable])
+
+    return engine_options, sqlite_pragmas
+
+
+def engine_options_for(uri, engine_options):
+    """The profile's engine options that apply to uri.
+
+    In-memory SQLite databases get a single-connection pool (StaticPool or
+    SingletonThreadPool) that rejects QueuePool sizing, so those options are dropped.
+    """
+    url = make_url(uri)
+    in_memory = url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+    if url.get_backend_name() == 'sqlite' and in_memory:
+        return {option: value for option, value in engine_options.items() if option not in QUEUE_POOL_OPTIONS}
+    return dict(engine_options)
+
+
+def database_binds(prefix, databases, engine_options):
+    """Flask-SQLAlchemy binds named prefix:school, each with the engine options that apply to its URI"""
+    return {f'{prefix}:{school}': {'url': uri, **engine_options_for(uri, engine_options)}
+            for school, uri in databases.items()}
+
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev_key')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URI', 'sqlite:///vaccination_portal.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    DATABASE_PROFILE = os.environ.get('DATABASE_PROFILE', 'production')  # 'basic' keeps driver defaults (rollback journal)
+    DATABASE_ENGINE_OPTIONS, SQLITE_PRAGMAS = database_profile(DATABASE_PROFILE)
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options_for(SQLALCHEMY_DATABASE_URI, DATABASE_ENGINE_OPTIONS)
+    DEDUPE_VACCINATION_RECORDS = os.environ.get('DEDUPE_VACCINATION_RECORDS', 'false').lower() == 'true'  # Let migration 1 delete duplicate vaccination records instead of stopping
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt_dev_key')
-    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)  # Changed to use timedelta
\ No newline at end of file
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)  # Changed to use timedelta
+    BULK_IMPORT_BATCH_SIZE = int(os.environ.get('BULK_IMPORT_BATCH_SIZE', 1000))  # Rows per INSERT executemany
+    BULK_IMPORT_CHUNK_SIZE = int(os.environ.get('BULK_IMPORT_CHUNK_SIZE', 10000))  # Rows per committed chunk when streaming
+    BULK_IMPORT_MAX_ERRORS = int(os.environ.get('BULK_IMPORT_MAX_ERRORS', 1000))  # Error messages kept when streaming
+    BULK_IMPORT_WORKERS = int(os.environ.get('BULK_IMPORT_WORKERS', 2))  # Background import worker threads
+    BULK_IMPORT_HEARTBEAT_INTERVAL = int(os.environ.get('BULK_IMPORT_HEARTBEAT_INTERVAL', 15))  # Seconds between job lease renewals and orphan sweeps
+    BULK_IMPORT_LEASE_TIMEOUT = int(os.environ.get('BULK_IMPORT_LEASE_TIMEOUT', 120))  # Seconds without a heartbeat before another process recovers a job
+    BULK_IMPORT_UPLOAD_DIR = os.environ.get('BULK_IMPORT_UPLOAD_DIR',
+                                            os.path.join(tempfile.gettempdir(), 'vaccination_portal_imports'))
+    REPORT_STREAM_BATCH_SIZE = int(os.environ.get('REPORT_STREAM_BATCH_SIZE', 1000))  # Rows fetched per cursor batch
+    REPORT_PAGE_SIZE = int(os.environ.get('REPORT_PAGE_SIZE', 100))  # Default report rows per page
+    REPORT_MAX_PAGE_SIZE = int(os.environ.get('REPORT_MAX_PAGE_SIZE', 1000))
+    REPORT_COUNT_CAP = int(os.environ.get('REPORT_COUNT_CAP', 10000))  # Matching records counted for estimated_total before it reports a lower bound
+    COUNT_CACHE_TTL = int(os.environ.get('COUNT_CACHE_TTL', 30))  # Seconds to reuse list totals in cursor mode, 0 disables
+    QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', 'false').lower() == 'true'  # Raise when a view exceeds its SQL statement budget
+    VACCINATION_BATCH_MAX_SIZE = int(os.environ.get('VACCINATION_BATCH_MAX_SIZE', 1000))  # Students per batch recording request
+    SUGGEST_INDEX_TTL = int(os.environ.get('SUGGEST_INDEX_TTL', 300))  # Seconds before the autocomplete index is rebuilt, 0 never
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 300))  # Seconds to cache lookup responses, 0 disables
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 1024))  # Entries kept by the in-process cache
+    JSON_USE_ORJSON = os.environ.get('JSON_USE_ORJSON', 'true').lower() == 'true'  # Serialize responses with orjson when it is installed
+    REPORT_COLUMNAR_BATCH_SIZE = int(os.environ.get('REPORT_COLUMNAR_BATCH_SIZE', 50000))  # Rows per Parquet row group / Arrow record batch
+    DRIVE_STATUS_INTERVAL = int(os.environ.get('DRIVE_STATUS_INTERVAL', 3600))  # Seconds between drive status reconciliation runs, 0 disables
+    DRIVE_MIN_LEAD_DAYS = int(os.environ.get('DRIVE_MIN_LEAD_DAYS', 15))  # Days ahead a drive must be scheduled
+    DRIVE_SLOTS_PER_DAY = int(os.environ.get('DRIVE_SLOTS_PER_DAY', 1))  # Drives allowed on the same date
+    # Schools with their own database, as school=URI pairs; the default school uses SQLALCHEMY_DATABASE_URI
+    TENANT_DATABASES = parse_databases(os.environ.get('TENANT_DATABASES'))
+    # Read replicas per school, as school=URI pairs; REPLICA_DATABASE_URI is the default school's replica
+    REPLICA_DATABASES = parse_databases(os.environ.get('REPLICA_DATABASES'))
+    if os.environ.get('REPLICA_DATABASE_URI'):
+        REPLICA_DATABASES.setdefault('default', os.environ['REPLICA_DATABASE_URI'])
+    REPLICA_MAX_LAG = int(os.environ.get('REPLICA_MAX_LAG', 30))  # Seconds a replica may trail the primary before reads fall back
+    REPLICA_LAG_CHECK_INTERVAL = int(os.environ.get('REPLICA_LAG_CHECK_INTERVAL', 5))  # Seconds to reuse a replica lag measurement
+    REPLICA_HEARTBEAT_INTERVAL = int(os.environ.get('REPLICA_HEARTBEAT_INTERVAL', 10))  # Seconds between heartbeats (and SQLite replica copies), 0 disables
+    SQLALCHEMY_BINDS = {
+        **database_binds('school', TENANT_DATABASES, DATABASE_ENGINE_OPTIONS),
+        **database_binds('replica', REPLICA_DATABASES, DATABASE_ENGINE_OPTIONS)
+    }
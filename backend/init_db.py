@@ -1,5 +1,6 @@
 from app import create_app
 from models import db, User, Student, VaccinationDrive
+from services.stats_service import StatsService
 from datetime import datetime, timedelta
 
 
@@ -69,6 +70,9 @@ def init_database():
                 db.session.add(drive)
 
         db.session.commit()
+
+        # Recompute dashboard counters for the sample data
+        StatsService.rebuild()
         print("Database initialized successfully!")
 
 
@@ -0,0 +1,65 @@
+"""Indexes for the hot dashboard, report and duplicate-check predicates"""
+from flask import current_app
+from sqlalchemy import text
+
+VERSION = 1
+NAME = 'query_indexes'
+
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS ix_student_class_name ON student (class_name, section)',
+    'CREATE INDEX IF NOT EXISTS ix_vaccination_drive_date ON vaccination_drive (date)',
+    'CREATE INDEX IF NOT EXISTS ix_vaccination_drive_status_date ON vaccination_drive (status, date)',
+    'CREATE INDEX IF NOT EXISTS ix_vaccination_drive_vaccine_name ON vaccination_drive (vaccine_name)',
+    'CREATE INDEX IF NOT EXISTS ix_vaccination_record_drive_id ON vaccination_record (drive_id)',
+    'CREATE INDEX IF NOT EXISTS ix_vaccination_record_date ON vaccination_record (date, id)',
+]
+MAX_LISTED_PAIRS = 50  # Duplicate (student_id, drive_id) pairs named in the error message
+
+
+class DuplicateRecordsError(Exception):
+    pass
+
+
+def remove_duplicates(connection, duplicates):
+    """Keep the earliest record of each duplicated pair and recount used_doses on the drives involved"""
+    removed = connection.execute(text(
+        'DELETE FROM vaccination_record WHERE id NOT IN ('
+        'SELECT MIN(id) FROM vaccination_record GROUP BY student_id, drive_id)'
+    )).rowcount
+    drive_ids = sorted({drive_id for _, drive_id, _ in duplicates})
+    for drive_id in drive_ids:
+        connection.execute(text(
+            'UPDATE vaccination_drive SET used_doses = ('
+            'SELECT COUNT(*) FROM vaccination_record WHERE vaccination_record.drive_id = :drive_id) '
+            'WHERE id = :drive_id'
+        ), {'drive_id': drive_id})
+    current_app.logger.warning('Deleted %d duplicate vaccination records and recounted used_doses for drives %s',
+                               removed, ', '.join(map(str, drive_ids)))
+
+
+def upgrade(connection):
+    # The unique index cannot be built over duplicate (student, drive) records. Deleting them is only done
+    # when the operator asks for it with DEDUPE_VACCINATION_RECORDS; otherwise the migration stops here.
+    duplicates = connection.execute(text(
+        'SELECT student_id, drive_id, COUNT(*) FROM vaccination_record '
+        'GROUP BY student_id, drive_id HAVING COUNT(*) > 1 ORDER BY student_id, drive_id'
+    )).all()
+    if duplicates:
+        if not current_app.config['DEDUPE_VACCINATION_RECORDS']:
+            pairs = ', '.join(f'({student_id}, {drive_id})' for student_id, drive_id, _ in duplicates[:MAX_LISTED_PAIRS])
+            if len(duplicates) > MAX_LISTED_PAIRS:
+                pairs += f' and {len(duplicates) - MAX_LISTED_PAIRS} more'
+            message = (f'{len(duplicates)} (student_id, drive_id) pairs have more than one vaccination record: '
+                       f'{pairs}. Resolve them by hand, or set DEDUPE_VACCINATION_RECORDS=true to keep the '
+                       f'earliest record of each pair, then start the app again.')
+            current_app.logger.error(message)
+            raise DuplicateRecordsError(message)
+        remove_duplicates(connection, duplicates)
+
+    connection.execute(text(
+        'CREATE UNIQUE INDEX IF NOT EXISTS uq_vaccination_record_student_drive '
+        'ON vaccination_record (student_id, drive_id)'
+    ))
+
+    for statement in INDEXES:
+        connection.execute(text(statement))
@@ -0,0 +1,33 @@
+"""Move comma-separated VaccinationDrive.applicable_classes into the drive_class table.
+
+The old column is left in place (unmapped) so the migration is safe on SQLite
+builds without DROP COLUMN support.
+"""
+from sqlalchemy import inspect, text
+
+VERSION = 2
+NAME = 'drive_class'
+
+
+def upgrade(connection):
+    from models import DriveClass
+    DriveClass.__table__.create(connection, checkfirst=True)
+
+    columns = {column['name'] for column in inspect(connection).get_columns('vaccination_drive')}
+    if 'applicable_classes' not in columns:
+        return
+
+    existing = {tuple(row) for row in connection.execute(text('SELECT drive_id, class_name FROM drive_class'))}
+    rows = connection.execute(text(
+        'SELECT id, applicable_classes FROM vaccination_drive WHERE applicable_classes IS NOT NULL'
+    ))
+
+    mappings = []
+    for drive_id, applicable_classes in rows:
+        for class_name in dict.fromkeys(name.strip() for name in applicable_classes.split(',')):
+            if class_name and (drive_id, class_name) not in existing:
+                mappings.append({'drive_id': drive_id, 'class_name': class_name})
+
+    if mappings:
+        connection.execute(text('INSERT INTO drive_class (drive_id, class_name) VALUES (:drive_id, :class_name)'),
+                           mappings)
@@ -0,0 +1,48 @@
+"""Search index for students: FTS5 on SQLite, trigram indexes on PostgreSQL"""
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+VERSION = 3
+NAME = 'student_search'
+
+SQLITE_STATEMENTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS student_fts USING fts5("
+    "student_id, name, class_name, content='student', content_rowid='id', prefix='2 3')",
+    # Keep the external-content index in step with every write path, including bulk inserts
+    "CREATE TRIGGER IF NOT EXISTS student_fts_insert AFTER INSERT ON student BEGIN "
+    "INSERT INTO student_fts (rowid, student_id, name, class_name) "
+    "VALUES (new.id, new.student_id, new.name, new.class_name); END",
+    "CREATE TRIGGER IF NOT EXISTS student_fts_delete AFTER DELETE ON student BEGIN "
+    "INSERT INTO student_fts (student_fts, rowid, student_id, name, class_name) "
+    "VALUES ('delete', old.id, old.student_id, old.name, old.class_name); END",
+    "CREATE TRIGGER IF NOT EXISTS student_fts_update AFTER UPDATE OF student_id, name, class_name ON student BEGIN "
+    "INSERT INTO student_fts (student_fts, rowid, student_id, name, class_name) "
+    "VALUES ('delete', old.id, old.student_id, old.name, old.class_name); "
+    "INSERT INTO student_fts (rowid, student_id, name, class_name) "
+    "VALUES (new.id, new.student_id, new.name, new.class_name); END",
+    "INSERT INTO student_fts (student_fts) VALUES ('rebuild')",
+]
+
+POSTGRESQL_STATEMENTS = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    'CREATE INDEX IF NOT EXISTS ix_student_name_trgm ON student USING gin (name gin_trgm_ops)',
+    'CREATE INDEX IF NOT EXISTS ix_student_student_id_trgm ON student USING gin (student_id gin_trgm_ops)',
+]
+
+
+def upgrade(connection):
+    dialect = connection.dialect.name
+
+    if dialect == 'sqlite':
+        try:
+            connection.execute(text('CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(value)'))
+            connection.execute(text('DROP TABLE temp.fts5_probe'))
+        except OperationalError:
+            # SQLite built without FTS5: searches fall back to ILIKE
+            return
+        for statement in SQLITE_STATEMENTS:
+            connection.execute(text(statement))
+
+    elif dialect == 'postgresql':
+        for statement in POSTGRESQL_STATEMENTS:
+            connection.execute(text(statement))
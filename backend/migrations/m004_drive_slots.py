@@ -0,0 +1,23 @@
+"""Give each drive a slot on its date and make (date, slot) unique.
+
+Drives that already share a date are numbered 0, 1, 2... in id order so the
+unique index can be built over existing data.
+"""
+from sqlalchemy import inspect, text
+
+VERSION = 4
+NAME = 'drive_slots'
+
+
+def upgrade(connection):
+    columns = {column['name'] for column in inspect(connection).get_columns('vaccination_drive')}
+    if 'slot' not in columns:
+        connection.execute(text('ALTER TABLE vaccination_drive ADD COLUMN slot INTEGER NOT NULL DEFAULT 0'))
+        connection.execute(text(
+            'UPDATE vaccination_drive SET slot = ('
+            'SELECT COUNT(*) FROM vaccination_drive AS earlier '
+            'WHERE earlier.date = vaccination_drive.date AND earlier.id < vaccination_drive.id)'
+        ))
+    connection.execute(text(
+        'CREATE UNIQUE INDEX IF NOT EXISTS uq_vaccination_drive_date_slot ON vaccination_drive (date, slot)'
+    ))
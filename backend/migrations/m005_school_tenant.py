@@ -0,0 +1,21 @@
+"""Add the school_id tenant column to students, drives, vaccination records and users.
+
+Runs once per school database, stamping existing rows with that school.
+"""
+from sqlalchemy import inspect, text
+from utils.tenancy import current_school
+
+VERSION = 5
+NAME = 'school_tenant'
+
+TABLES = ['student', 'vaccination_drive', 'vaccination_record', 'user']
+
+
+def upgrade(connection):
+    inspector = inspect(connection)
+    for table in TABLES:
+        columns = {column['name'] for column in inspector.get_columns(table)}
+        if 'school_id' in columns:
+            continue
+        connection.execute(text(f'ALTER TABLE "{table}" ADD COLUMN school_id VARCHAR(50) NOT NULL DEFAULT \'default\''))
+        connection.execute(text(f'UPDATE "{table}" SET school_id = :school'), {'school': current_school()})
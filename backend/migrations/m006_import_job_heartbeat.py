@@ -0,0 +1,15 @@
+"""Add the heartbeat column that import jobs use as their lease.
+
+Jobs left over from before the column existed have no heartbeat and count as
+orphaned, so the next recovery sweep picks them up.
+"""
+from sqlalchemy import inspect, text
+
+VERSION = 6
+NAME = 'import_job_heartbeat'
+
+
+def upgrade(connection):
+    columns = {column['name'] for column in inspect(connection).get_columns('import_job')}
+    if 'heartbeat_at' not in columns:
+        connection.execute(text('ALTER TABLE import_job ADD COLUMN heartbeat_at TIMESTAMP'))
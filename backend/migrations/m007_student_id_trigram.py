@@ -0,0 +1,40 @@
+"""Trigram index on student IDs so searches find IDs by any substring (SQLite 3.34+).
+
+The word-prefix FTS5 index from m003 only matches the start of an ID, so
+"001" no longer found "ST001" as the old ILIKE search did. PostgreSQL already
+has a trigram index on student_id from m003.
+"""
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+VERSION = 7
+NAME = 'student_id_trigram'
+
+SQLITE_STATEMENTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS student_id_trigram USING fts5("
+    "student_id, content='student', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS student_id_trigram_insert AFTER INSERT ON student BEGIN "
+    "INSERT INTO student_id_trigram (rowid, student_id) VALUES (new.id, new.student_id); END",
+    "CREATE TRIGGER IF NOT EXISTS student_id_trigram_delete AFTER DELETE ON student BEGIN "
+    "INSERT INTO student_id_trigram (student_id_trigram, rowid, student_id) "
+    "VALUES ('delete', old.id, old.student_id); END",
+    "CREATE TRIGGER IF NOT EXISTS student_id_trigram_update AFTER UPDATE OF student_id ON student BEGIN "
+    "INSERT INTO student_id_trigram (student_id_trigram, rowid, student_id) "
+    "VALUES ('delete', old.id, old.student_id); "
+    "INSERT INTO student_id_trigram (rowid, student_id) VALUES (new.id, new.student_id); END",
+    "INSERT INTO student_id_trigram (student_id_trigram) VALUES ('rebuild')",
+]
+
+
+def upgrade(connection):
+    if connection.dialect.name != 'sqlite':
+        return
+
+    try:
+        connection.execute(text("CREATE VIRTUAL TABLE temp.trigram_probe USING fts5(value, tokenize='trigram')"))
+        connection.execute(text('DROP TABLE temp.trigram_probe'))
+    except OperationalError:
+        # No FTS5 or a SQLite older than 3.34: IDs are matched by prefix only
+        return
+    for statement in SQLITE_STATEMENTS:
+        connection.execute(text(statement))
@@ -0,0 +1,89 @@
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import text
+from . import (
+    m001_query_indexes, m002_drive_class, m003_student_search, m004_drive_slots, m005_school_tenant,
+    m006_import_job_heartbeat, m007_student_id_trigram
+)
+
+# Ordered list of schema migrations; append new modules here
+MIGRATIONS = [
+    m001_query_indexes,
+    m002_drive_class,
+    m003_student_search,
+    m004_drive_slots,
+    m005_school_tenant,
+    m006_import_job_heartbeat,
+    m007_student_id_trigram,
+]
+
+LOCK_TIMEOUT_MS = 10 * 60 * 1000  # How long a booting process waits for another one's migrations on SQLite
+ADVISORY_LOCK_KEY = 73_100_007  # PostgreSQL advisory lock id shared by every process migrating the same database
+
+
+@contextmanager
+def schema_lock(engine):
+    """Yield a connection whose transaction holds an exclusive schema lock on engine's database.
+
+    SQLite takes the write lock up front with BEGIN EXCLUSIVE; PostgreSQL takes
+    a transaction-scoped advisory lock. Processes booting at the same time wait
+    here until the holder commits.
+    """
+    with engine.connect() as connection:
+        if connection.dialect.name != 'sqlite':
+            with connection.begin():
+                if connection.dialect.name == 'postgresql':
+                    connection.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': ADVISORY_LOCK_KEY})
+                yield connection
+            return
+
+        # Wait out a long migration in another process instead of failing with "database is locked"
+        busy_timeout = connection.exec_driver_sql('PRAGMA busy_timeout').scalar()
+        connection.exec_driver_sql(f'PRAGMA busy_timeout = {LOCK_TIMEOUT_MS}')
+        try:
+            connection.exec_driver_sql('BEGIN EXCLUSIVE')
+            try:
+                yield connection
+            except BaseException:
+                connection.rollback()
+                raise
+            connection.commit()
+        finally:
+            connection.exec_driver_sql(f'PRAGMA busy_timeout = {busy_timeout}')
+            connection.commit()
+
+
+def applied_versions(connection):
+    return {row[0] for row in connection.execute(text('SELECT version FROM schema_migration'))}
+
+
+def run_migrations(db, engine=None):
+    """Apply every migration not yet recorded in engine's schema_migration table (default: db.engine)"""
+    engine = engine or db.engine
+    with engine.begin() as connection:
+        connection.execute(text(
+            'CREATE TABLE IF NOT EXISTS schema_migration ('
+            'version INTEGER PRIMARY KEY, '
+            'name VARCHAR(100) NOT NULL, '
+            'applied_at TIMESTAMP NOT NULL)'
+        ))
+        applied = applied_versions(connection)
+
+    applied_now = []
+    for migration in MIGRATIONS:
+        if migration.VERSION in applied:
+            continue
+
+        # Each migration runs in its own locked transaction together with its bookkeeping row. Another
+        # process may have applied it while this one waited for the lock, so check again once it is held.
+        with schema_lock(engine) as connection:
+            if migration.VERSION in applied_versions(connection):
+                continue
+            migration.upgrade(connection)
+            connection.execute(
+                text('INSERT INTO schema_migration (version, name, applied_at) VALUES (:version, :name, :applied_at)'),
+                {'version': migration.VERSION, 'name': migration.NAME, 'applied_at': datetime.utcnow()}
+            )
+        applied_now.append(migration.NAME)
+
+    return applied_now
@@ -1,8 +1,17 @@
 from flask_sqlalchemy import SQLAlchemy
+from utils.tenancy import TenantSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': TenantSession})
+
+# Values per IN (...) lookup, keeping queries below SQLite's bound parameter limit
+LOOKUP_CHUNK_SIZE = 500
 
 from .student import Student
 from .vaccination_drive import VaccinationDrive
+from .drive_class import DriveClass
 from .vaccination_record import VaccinationRecord
-from .user import User
\ No newline at end of file
+from .user import User
+from .import_job import ImportJob
+from .dashboard_counter import DashboardCounter
+from .drive_status_run import DriveStatusRun
+from .replica_heartbeat import ReplicaHeartbeat
\ No newline at end of file
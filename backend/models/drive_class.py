@@ -0,0 +1,16 @@
+from . import db
+
+
+class DriveClass(db.Model):
+    __table_args__ = (
+        db.Index('ix_drive_class_class_name', 'class_name', 'drive_id'),
+    )
+
+    drive_id = db.Column(db.Integer, db.ForeignKey('vaccination_drive.id', ondelete='CASCADE'), primary_key=True)
+    class_name = db.Column(db.String(20), primary_key=True)
+
+    def to_dict(self):
+        return {
+            'drive_id': self.drive_id,
+            'class_name': self.class_name
+        }
@@ -0,0 +1,19 @@
+from datetime import datetime
+from . import db
+
+
+class DriveStatusRun(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    duration_ms = db.Column(db.Float, nullable=False, default=0)
+    completed_count = db.Column(db.Integer, nullable=False, default=0)  # Scheduled drives whose date has passed
+    reopened_count = db.Column(db.Integer, nullable=False, default=0)  # Completed drives moved back into the future
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'started_at': self.started_at.isoformat(),
+            'duration_ms': self.duration_ms,
+            'completed_count': self.completed_count,
+            'reopened_count': self.reopened_count
+        }
@@ -0,0 +1,48 @@
+import json
+import uuid
+from datetime import datetime
+from . import db
+
+
+class ImportJob(db.Model):
+    id = db.Column(db.String(36), primary_key=True, default=lambda: uuid.uuid4().hex)
+    filename = db.Column(db.String(255), nullable=False)
+    file_path = db.Column(db.String(500))
+    status = db.Column(db.String(20), default='Queued', index=True)  # Queued, Running, Completed, Failed
+    chunks_processed = db.Column(db.Integer, default=0)
+    rows_processed = db.Column(db.Integer, default=0)
+    success_count = db.Column(db.Integer, default=0)
+    error_count = db.Column(db.Integer, default=0)
+    errors = db.Column(db.Text)  # JSON-encoded list of row error messages
+    message = db.Column(db.String(500))
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)  # Renewed by the owning process; a stale heartbeat means the job is orphaned
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @property
+    def throughput(self):
+        """Rows processed per second since the job started"""
+        if not self.started_at:
+            return 0
+        elapsed = ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds()
+        return round(self.rows_processed / elapsed, 2) if elapsed > 0 else 0
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'filename': self.filename,
+            'status': self.status,
+            'chunks_processed': self.chunks_processed,
+            'rows_processed': self.rows_processed,
+            'success_count': self.success_count,
+            'error_count': self.error_count,
+            'rows_per_second': self.throughput,
+            'errors': json.loads(self.errors) if self.errors else [],
+            'message': self.message,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
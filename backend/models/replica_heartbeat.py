@@ -0,0 +1,8 @@
+from datetime import datetime
+from . import db
+
+
+class ReplicaHeartbeat(db.Model):
+    """Single row the primary rewrites periodically; its age on a replica is the replica's lag"""
+    id = db.Column(db.Integer, primary_key=True)
+    beat_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
@@ -1,9 +1,15 @@
 from datetime import datetime
+from utils.tenancy import current_school
 from . import db
 
 
 class Student(db.Model):
+    __table_args__ = (
+        db.Index('ix_student_class_name', 'class_name', 'section'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
+    school_id = db.Column(db.String(50), nullable=False, default=current_school)  # Tenant the row belongs to
     student_id = db.Column(db.String(20), unique=True, nullable=False)
     name = db.Column(db.String(100), nullable=False)
     class_name = db.Column(db.String(20), nullable=False)
@@ -1,10 +1,12 @@
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
+from utils.tenancy import current_school
 from . import db
 
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
+    school_id = db.Column(db.String(50), nullable=False, default=current_school)  # Tenant the row belongs to
     username = db.Column(db.String(50), unique=True, nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
     role = db.Column(db.String(20), default='coordinator')
@@ -22,6 +24,7 @@ class User(db.Model):
         return {
             'id': self.id,
             'username': self.username,
+            'school_id': self.school_id,
             'role': self.role,
             'name': self.name,
             'created_at': self.created_at.isoformat(),
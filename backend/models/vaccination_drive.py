@@ -1,26 +1,63 @@
 from datetime import datetime
+from utils.tenancy import current_school
 from . import db
+from .drive_class import DriveClass
 
 
 class VaccinationDrive(db.Model):
+    __table_args__ = (
+        db.Index('ix_vaccination_drive_date', 'date'),
+        db.Index('ix_vaccination_drive_status_date', 'status', 'date'),
+        db.Index('ix_vaccination_drive_vaccine_name', 'vaccine_name'),
+        db.Index('uq_vaccination_drive_date_slot', 'date', 'slot', unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
+    school_id = db.Column(db.String(50), nullable=False, default=current_school)  # Tenant the row belongs to
     vaccine_name = db.Column(db.String(100), nullable=False)
     date = db.Column(db.Date, nullable=False)
+    slot = db.Column(db.Integer, nullable=False, default=0)  # Position among the drives sharing this date
     available_doses = db.Column(db.Integer, nullable=False)
     used_doses = db.Column(db.Integer, default=0)
-    applicable_classes = db.Column(db.String(200))  # Comma-separated list of classes
     status = db.Column(db.String(20), default='Scheduled')  # Scheduled, Completed, Cancelled
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Eligible classes; an empty list means the drive is open to every class
+    classes = db.relationship('DriveClass', lazy='selectin', cascade='all, delete-orphan')
+
+    @property
+    def applicable_classes(self):
+        # Numeric classes first in numeric order, then named ones (KG, Pre-K)
+        names = [drive_class.class_name for drive_class in self.classes]
+        return sorted(names, key=lambda name: (not name.isdigit(), int(name) if name.isdigit() else 0, name))
+
+    @applicable_classes.setter
+    def applicable_classes(self, classes):
+        """Accept a list of class names or a comma-separated string"""
+        if isinstance(classes, str):
+            classes = classes.split(',')
+        names = list(dict.fromkeys(str(name).strip() for name in classes or [] if str(name).strip()))
+
+        existing = {drive_class.class_name: drive_class for drive_class in self.classes}
+        if self.id is not None and set(names) != set(existing):
+            # Class changes don't touch the drive row itself, so bump its timestamp explicitly
+            self.updated_at = datetime.utcnow()
+        self.classes = [existing.get(name) or DriveClass(class_name=name) for name in names]
+
+    def is_open_to(self, class_name):
+        """Check whether students of class_name may be vaccinated in this drive"""
+        return not self.classes or any(drive_class.class_name == class_name for drive_class in self.classes)
+
     def to_dict(self):
         return {
             'id': self.id,
             'vaccine_name': self.vaccine_name,
             'date': self.date.isoformat(),
+            'slot': self.slot,
             'available_doses': self.available_doses,
             'used_doses': self.used_doses,
-            'applicable_classes': self.applicable_classes.split(',') if self.applicable_classes else [],
+            'applicable_classes': self.applicable_classes,
             'status': self.status,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
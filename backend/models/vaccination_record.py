@@ -1,9 +1,17 @@
 from datetime import datetime
+from utils.tenancy import current_school
 from . import db
 
 
 class VaccinationRecord(db.Model):
+    __table_args__ = (
+        db.Index('uq_vaccination_record_student_drive', 'student_id', 'drive_id', unique=True),
+        db.Index('ix_vaccination_record_drive_id', 'drive_id'),
+        db.Index('ix_vaccination_record_date', 'date', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
+    school_id = db.Column(db.String(50), nullable=False, default=current_school)  # Tenant the row belongs to
     student_id = db.Column(db.Integer, db.ForeignKey('student.id'), nullable=False)
     drive_id = db.Column(db.Integer, db.ForeignKey('vaccination_drive.id'), nullable=False)
     date = db.Column(db.Date, nullable=False)
@@ -1,6 +1,7 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from models import db, User
+from utils.tenancy import DEFAULT_SCHOOL, is_known_school
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
@@ -14,13 +15,19 @@ def login():
     if not username or not password:
         return jsonify({'error': 'Username and password are required'}), 400
 
+    # Users are looked up in their own school's database
+    school = data.get('school') or DEFAULT_SCHOOL
+    if not is_known_school(school):
+        return jsonify({'error': 'Invalid credentials'}), 401
+    g.school_id = school
+
     user = User.query.filter_by(username=username).first()
 
     if not user or not user.check_password(password):
         return jsonify({'error': 'Invalid credentials'}), 401
 
     # Convert user.id to string for JWT
-    access_token = create_access_token(identity=str(user.id))
+    access_token = create_access_token(identity=str(user.id), additional_claims={'school': school})
     return jsonify({
         'access_token': access_token,
         'user': user.to_dict()
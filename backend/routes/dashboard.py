@@ -1,41 +1,41 @@
 from flask import Blueprint, jsonify
 from flask_jwt_extended import jwt_required
-from sqlalchemy import func
-from datetime import datetime, timedelta
-from models import db, Student, VaccinationDrive, VaccinationRecord
+from datetime import date, datetime, timedelta
+from models import VaccinationDrive
+from services.stats_service import StatsService
+from utils.query_budget import query_budget
+from utils.replica import read_replica
+from utils.response_cache import cached_response
 
 dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
 
 
 @dashboard_bp.route('/stats', methods=['GET'])
 @jwt_required()
+@read_replica
+@query_budget(1)
 def get_stats():
-    # Get total students
-    total_students = Student.query.count()
-
-    # Get vaccinated students (distinct)
-    vaccinated_students = db.session.query(VaccinationRecord.student_id).distinct().count()
+    # Read the incrementally maintained counters
+    counters = StatsService.get_counters()
+    total_students = counters['total_students']
+    vaccinated_students = counters['vaccinated_students']
 
     # Get vaccination percentage
     vaccination_percentage = (vaccinated_students / total_students * 100) if total_students > 0 else 0
 
-    # Get total vaccination drives
-    total_drives = VaccinationDrive.query.count()
-
-    # Get completed vaccination drives
-    completed_drives = VaccinationDrive.query.filter_by(status='Completed').count()
-
     return jsonify({
         'total_students': total_students,
         'vaccinated_students': vaccinated_students,
         'vaccination_percentage': round(vaccination_percentage, 2),
-        'total_drives': total_drives,
-        'completed_drives': completed_drives
+        'total_drives': counters['total_drives'],
+        'completed_drives': counters['completed_drives']
     }), 200
 
 
 @dashboard_bp.route('/upcoming-drives', methods=['GET'])
 @jwt_required()
+@query_budget(2)
+@cached_response('drives', vary=lambda: date.today().isoformat())
 def get_upcoming_drives():
     # Get upcoming vaccination drives (within next 30 days)
     today = datetime.now().date()
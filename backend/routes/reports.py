@@ -1,97 +1,105 @@
-from flask import Blueprint, request, jsonify, Response
+from itertools import chain
+from flask import Blueprint, request, jsonify, Response, current_app, stream_with_context
 from flask_jwt_extended import jwt_required
-import pandas as pd
-import io
-from datetime import datetime
 from models import db, Student, VaccinationDrive, VaccinationRecord
-from sqlalchemy.orm import joinedload
+from services.report_service import ReportService
+from utils.pagination import CursorPagination
+from utils.query_budget import query_budget
+from utils.replica import read_replica
+from utils.response_cache import cached_response
+from utils.streaming import requested_stream_format, stream_json
 
 reports_bp = Blueprint('reports', __name__, url_prefix='/api/reports')
 
 
 @reports_bp.route('/vaccinations', methods=['GET'])
 @jwt_required()
+@read_replica
+@query_budget(2)
 def get_vaccination_report():
     # Parse filters
-    vaccine_name = request.args.get('vaccine_name')
-    class_name = request.args.get('class_name')
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
+    filters = {
+        'vaccine_name': request.args.get('vaccine_name'),
+        'class_name': request.args.get('class_name'),
+        'start_date': request.args.get('start_date'),
+        'end_date': request.args.get('end_date')
+    }
     download = request.args.get('download', '').lower() == 'true'
+    export_format = request.args.get('format', '').lower() or ('csv' if download else None)
 
-    # Base query
-    query = db.session.query(
-        VaccinationRecord, Student, VaccinationDrive
-    ).join(
-        Student, VaccinationRecord.student_id == Student.id
-    ).join(
-        VaccinationDrive, VaccinationRecord.drive_id == VaccinationDrive.id
-    )
+    query = ReportService.build_report_query(**filters)
+
+    # If a download was requested, stream the file straight from the cursor
+    if export_format:
+        if export_format not in ReportService.EXPORT_FORMATS:
+            return jsonify({'error': f"Unsupported format. Use one of: {', '.join(ReportService.EXPORT_FORMATS)}"}), 400
+        if export_format != 'csv' and not ReportService.columnar_available():
+            return jsonify({'error': 'Parquet and Arrow exports require pyarrow to be installed'}), 501
+
+        if export_format == 'csv':
+            batch_size = current_app.config['REPORT_STREAM_BATCH_SIZE']
+        else:
+            batch_size = current_app.config['REPORT_COLUMNAR_BATCH_SIZE']
+        rows = iter(query.order_by(VaccinationRecord.date.desc(), VaccinationRecord.id.desc()).yield_per(batch_size))
 
-    # Apply filters
-    if vaccine_name:
-        query = query.filter(VaccinationDrive.vaccine_name == vaccine_name)
-
-    if class_name:
-        query = query.filter(Student.class_name == class_name)
-
-    if start_date:
-        try:
-            start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-            query = query.filter(VaccinationRecord.date >= start_date_obj)
-        except ValueError:
-            pass
-
-    if end_date:
-        try:
-            end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
-            query = query.filter(VaccinationRecord.date <= end_date_obj)
-        except ValueError:
-            pass
-
-    # Execute query
-    results = query.order_by(VaccinationRecord.date.desc()).all()
-
-    # Format results
-    records = []
-    for record, student, drive in results:
-        records.append({
-            'record_id': record.id,
-            'student_id': student.student_id,
-            'student_name': student.name,
-            'class_name': student.class_name,
-            'section': student.section,
-            'vaccine_name': drive.vaccine_name,
-            'vaccination_date': record.date.isoformat(),
-            'status': record.status
-        })
-
-    # If download requested, return CSV file
-    if download:
-        if not records:
+        first_row = next(rows, None)
+        if first_row is None:
             return jsonify({'error': 'No records found'}), 404
 
-        df = pd.DataFrame(records)
-        output = io.StringIO()
-        df.to_csv(output, index=False)
+        rows = chain([first_row], rows)
+        if export_format == 'csv':
+            content = ReportService.generate_csv(rows, batch_size)
+        else:
+            content = ReportService.generate_columnar(rows, batch_size, export_format)
 
+        mimetype, extension = ReportService.EXPORT_FORMATS[export_format]
         return Response(
-            output.getvalue(),
-            mimetype='text/csv',
+            stream_with_context(content),
+            mimetype=mimetype,
             headers={
-                'Content-Disposition': 'attachment;filename=vaccination_report.csv'
+                'Content-Disposition': f'attachment;filename=vaccination_report.{extension}'
             }
         )
 
-    # Otherwise return JSON
-    return jsonify({
+    # Streaming mode: the whole filtered report as a JSON array or NDJSON
+    stream_format = requested_stream_format()
+    if stream_format:
+        batch_size = current_app.config['REPORT_STREAM_BATCH_SIZE']
+        rows = query.order_by(VaccinationRecord.date.desc(), VaccinationRecord.id.desc()).yield_per(batch_size)
+        return stream_json(rows, lambda batch: [row._asdict() for row in batch], stream_format, batch_size)
+
+    # Otherwise return one keyset page of JSON
+    limit = CursorPagination.get_limit(
+        request.args, current_app.config['REPORT_PAGE_SIZE'], current_app.config['REPORT_MAX_PAGE_SIZE']
+    )
+
+    after = None
+    cursor = request.args.get('cursor')
+    if cursor:
+        after = ReportService.decode_report_cursor(cursor)
+        if after is None:
+            return jsonify({'error': 'Invalid cursor'}), 400
+
+    records, next_cursor = ReportService.paginate_report(query, after, limit)
+
+    response = {
         'count': len(records),
+        'limit': limit,
+        'next_cursor': next_cursor,
         'records': records
-    }), 200
+    }
+
+    if request.args.get('include_count', '').lower() == 'true':
+        response['estimated_total'], response['total_capped'] = ReportService.estimate_count(
+            query, any(filters.values()), current_app.config['REPORT_COUNT_CAP']
+        )
+
+    return jsonify(response), 200
 
 
 @reports_bp.route('/vaccines', methods=['GET'])
 @jwt_required()
+@cached_response('drives')
 def get_vaccines_list():
     # Get distinct vaccine names
     vaccines = db.session.query(VaccinationDrive.vaccine_name).distinct().all()
@@ -101,8 +109,9 @@ def get_vaccines_list():
 
 @reports_bp.route('/classes', methods=['GET'])
 @jwt_required()
+@cached_response('students')
 def get_classes_list():
     # Get distinct class names
     classes = db.session.query(Student.class_name).distinct().all()
 
-    return jsonify([cls[0] for cls in classes]), 200
\ No newline at end of file
+    return jsonify([cls[0] for cls in classes]), 200
@@ -1,15 +1,21 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required
-import pandas as pd
-import io
-from models import db, Student
-from sqlalchemy import or_
+from models import db, Student, ImportJob
+from services.import_job_service import ImportJobService
+from services.search_service import SearchService
+from services.stats_service import StatsService
+from services.suggest_service import SuggestService
+from utils.conditional import not_modified, page_not_modified
+from utils.pagination import CursorPagination
+from utils.query_budget import query_budget
+from utils.serializers import student_serializer
 
 students_bp = Blueprint('students', __name__, url_prefix='/api/students')
 
 
 @students_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_students():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
@@ -18,26 +24,67 @@ def get_students():
     query = Student.query
 
     if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Student.name.ilike(search_term),
-                Student.student_id.ilike(search_term),
-                Student.class_name.ilike(search_term)
-            )
-        )
-
-    pagination = query.paginate(page=page, per_page=per_page)
+        query = SearchService.search_students(query, search)
+
+    # Cursor mode: keyset pagination on id, counting only when asked. Search results come in id
+    # order here rather than by rank, since a rank cannot serve as a stable cursor
+    if 'after' in request.args:
+        after = CursorPagination.get_after_id(request.args)
+        if after is None:
+            return jsonify({'error': 'after must be an integer'}), 400
+        students = student_serializer.select(
+            query.filter(Student.id > after).order_by(None).order_by(Student.id)
+        ).limit(per_page + 1).all()
+
+        total = None
+        if request.args.get('include_count', '').lower() == 'true':
+            total = CursorPagination.count(query, ('students', search), current_app.config['COUNT_CACHE_TTL'])
+
+        cached = page_not_modified(students, depends_on=[total])
+        if cached:
+            return cached
+
+        has_more = len(students) > per_page
+        students = students[:per_page]
+
+        response = {
+            'per_page': per_page,
+            'has_more': has_more,
+            'next_after': students[-1].id if has_more else None,
+            'students': student_serializer.serialize(students)
+        }
+        if total is not None:
+            response['total'] = total
+
+        return jsonify(response), 200
+
+    pagination = student_serializer.select(query).paginate(page=page, per_page=per_page)
+
+    cached = page_not_modified(pagination.items, depends_on=[pagination.total])
+    if cached:
+        return cached
 
     return jsonify({
         'total': pagination.total,
         'pages': pagination.pages,
         'current_page': page,
         'per_page': per_page,
-        'students': [student.to_dict() for student in pagination.items]
+        'students': student_serializer.serialize(pagination.items)
     }), 200
 
 
+@students_bp.route('/suggest', methods=['GET'])
+@jwt_required()
+def suggest_students():
+    prefix = request.args.get('q', '').strip()
+    limit = max(1, min(request.args.get('limit', 10, type=int), 50))
+
+    if not prefix:
+        return jsonify([]), 200
+
+    return jsonify(SuggestService.suggest(prefix, limit)), 200
+
+
 @students_bp.route('', methods=['POST'])
 @jwt_required()
 def create_student():
@@ -63,7 +110,9 @@ def create_student():
     )
 
     db.session.add(student)
+    StatsService.adjust(total_students=1)
     db.session.commit()
+    SuggestService.student_saved(student)
 
     return jsonify(student.to_dict()), 201
 
@@ -81,60 +130,38 @@ def bulk_import_students():
     if not file.filename.endswith('.csv'):
         return jsonify({'error': 'Only CSV files are allowed'}), 400
 
-    try:
-        # Read CSV file
-        df = pd.read_csv(file.stream)
-
-        # Validate CSV structure
-        required_columns = ['student_id', 'name', 'class_name', 'section']
-        for column in required_columns:
-            if column not in df.columns:
-                return jsonify({'error': f'Missing required column: {column}'}), 400
-
-        # Process each row
-        success_count = 0
-        error_count = 0
-        errors = []
-
-        for index, row in df.iterrows():
-            try:
-                # Check if student already exists
-                if Student.query.filter_by(student_id=row['student_id']).first():
-                    errors.append(f"Row {index + 1}: Student ID {row['student_id']} already exists")
-                    error_count += 1
-                    continue
-
-                student = Student(
-                    student_id=row['student_id'],
-                    name=row['name'],
-                    class_name=row['class_name'],
-                    section=row['section'],
-                    age=row.get('age') if 'age' in row else None,
-                    gender=row.get('gender') if 'gender' in row else None
-                )
-
-                db.session.add(student)
-                success_count += 1
-            except Exception as e:
-                errors.append(f"Row {index + 1}: {str(e)}")
-                error_count += 1
-
-        db.session.commit()
-
-        return jsonify({
-            'message': 'Bulk import completed',
-            'success_count': success_count,
-            'error_count': error_count,
-            'errors': errors
-        }), 200
-
-    except Exception as e:
-        return jsonify({'error': f'Failed to process CSV file: {str(e)}'}), 400
+    # Queue the import and return immediately; progress is polled via the job id
+    job = ImportJobService.enqueue(current_app._get_current_object(), file)
+
+    return jsonify({
+        'message': 'Bulk import queued',
+        'job_id': job.id,
+        'status': job.status
+    }), 202
+
+
+@students_bp.route('/bulk/<job_id>', methods=['GET'])
+@jwt_required()
+def get_bulk_import_job(job_id):
+    cached = not_modified(ImportJob.query.filter_by(id=job_id), ImportJob.updated_at)
+    if cached:
+        return cached
+
+    job = ImportJob.query.get(job_id)
+
+    if not job:
+        return jsonify({'error': 'Import job not found'}), 404
+
+    return jsonify(job.to_dict()), 200
 
 
 @students_bp.route('/<int:id>', methods=['GET'])
 @jwt_required()
 def get_student(id):
+    cached = not_modified(Student.query.filter_by(id=id), Student.updated_at)
+    if cached:
+        return cached
+
     student = Student.query.get(id)
 
     if not student:
@@ -166,6 +193,7 @@ def update_student(id):
         student.gender = data['gender']
 
     db.session.commit()
+    SuggestService.student_saved(student)
 
     return jsonify(student.to_dict()), 200
 
@@ -179,6 +207,8 @@ def delete_student(id):
         return jsonify({'error': 'Student not found'}), 404
 
     db.session.delete(student)
+    StatsService.adjust(total_students=-1)
     db.session.commit()
+    SuggestService.student_deleted(id)
 
     return jsonify({'message': 'Student deleted successfully'}), 200
\ No newline at end of file
@@ -1,25 +1,97 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required
-from datetime import datetime, timedelta
-from models import db, VaccinationDrive
+from datetime import datetime
+from sqlalchemy import and_, func, or_, tuple_
+from sqlalchemy.exc import IntegrityError
+from models import db, Student, VaccinationDrive
+from services.scheduling_service import SchedulingService
+from services.stats_service import StatsService
+from services.vaccination_service import VaccinationService
+from utils.conditional import not_modified, page_not_modified
+from utils.pagination import CursorPagination
+from utils.query_budget import query_budget
 
 drives_bp = Blueprint('drives', __name__, url_prefix='/api/drives')
 
 
 @drives_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(3)
 def get_drives():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
     status = request.args.get('status')
+    class_name = request.args.get('class_name')
 
     query = VaccinationDrive.query
 
+    if class_name:
+        query = VaccinationService.drives_for_class_query(class_name)
+
     if status:
         query = query.filter_by(status=status)
 
+    # Cursor mode: keyset pagination on (date, id) descending, counting only when asked
+    if 'after' in request.args:
+        after = request.args.get('after', '')
+        after_date = request.args.get('after_date', '')
+        page_query = query
+
+        # The cursor is the (date, id) pair; half of it would silently restart from the first page
+        if bool(after) != bool(after_date):
+            return jsonify({'error': 'after and after_date must be given together'}), 400
+
+        if after:
+            try:
+                after = int(after)
+            except ValueError:
+                return jsonify({'error': 'after must be an integer'}), 400
+            try:
+                after_date = datetime.strptime(after_date, '%Y-%m-%d').date()
+            except ValueError:
+                return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+            page_query = query.filter(or_(
+                VaccinationDrive.date < after_date,
+                and_(VaccinationDrive.date == after_date, VaccinationDrive.id < after)
+            ))
+
+        drives = page_query.order_by(
+            VaccinationDrive.date.desc(), VaccinationDrive.id.desc()
+        ).limit(per_page + 1).all()
+
+        total = None
+        if request.args.get('include_count', '').lower() == 'true':
+            total = CursorPagination.count(
+                query, ('drives', status, class_name), current_app.config['COUNT_CACHE_TTL']
+            )
+
+        # Class changes bump the drive's updated_at, so the page's rows cover applicable_classes too
+        cached = page_not_modified(drives, depends_on=[total])
+        if cached:
+            return cached
+
+        has_more = len(drives) > per_page
+        drives = drives[:per_page]
+
+        response = {
+            'per_page': per_page,
+            'has_more': has_more,
+            'next_after': drives[-1].id if has_more else None,
+            'next_after_date': drives[-1].date.isoformat() if has_more else None,
+            'drives': [drive.to_dict() for drive in drives]
+        }
+        if total is not None:
+            response['total'] = total
+
+        return jsonify(response), 200
+
     pagination = query.order_by(VaccinationDrive.date.desc()).paginate(page=page, per_page=per_page)
 
+    cached = page_not_modified(pagination.items, depends_on=[pagination.total])
+    if cached:
+        return cached
+
     return jsonify({
         'total': pagination.total,
         'pages': pagination.pages,
@@ -46,35 +118,71 @@ def create_drive():
     except ValueError:
         return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
 
-    # Check if drive date is at least 15 days in the future
-    today = datetime.now().date()
-    if drive_date < today + timedelta(days=15):
-        return jsonify({'error': 'Vaccination drive must be scheduled at least 15 days in advance'}), 400
-
-    # Check for overlapping drives on the same date
-    existing_drive = VaccinationDrive.query.filter_by(date=drive_date).first()
-    if existing_drive:
-        return jsonify({'error': 'A vaccination drive is already scheduled for this date'}), 400
+    # Check lead time and find a free slot on that date
+    error, slot = SchedulingService.check_date(drive_date)
+    if error:
+        return jsonify({'error': error}), 400
 
     # Create vaccination drive
     drive = VaccinationDrive(
         vaccine_name=data['vaccine_name'],
         date=drive_date,
+        slot=slot,
         available_doses=data['available_doses'],
-        applicable_classes=','.join(data['applicable_classes']) if isinstance(data['applicable_classes'], list) else
-        data['applicable_classes'],
+        applicable_classes=data['applicable_classes'],
         status='Scheduled'
     )
 
+    # Flush before touching the counters, whose UPDATE would otherwise autoflush outside the try
     db.session.add(drive)
+    try:
+        db.session.flush()
+    except IntegrityError:
+        # Another request took the same slot since it was checked
+        db.session.rollback()
+        return jsonify({'error': 'The date was booked by another drive just now, please try again'}), 409
+
+    StatsService.adjust(total_drives=1)
     db.session.commit()
 
     return jsonify(drive.to_dict()), 201
 
 
+@drives_bp.route('/availability', methods=['GET'])
+@jwt_required()
+def get_availability():
+    count = max(1, min(request.args.get('count', 5, type=int), 60))
+    exclude_drive_id = request.args.get('exclude_drive_id', type=int)
+
+    response = {
+        'earliest_date': SchedulingService.earliest_date().isoformat(),
+        'slots_per_day': current_app.config['DRIVE_SLOTS_PER_DAY']
+    }
+
+    # Check one requested date, then list free dates from there
+    start = None
+    if request.args.get('date'):
+        try:
+            start = datetime.strptime(request.args['date'], '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+
+        error, slot = SchedulingService.check_date(start, exclude_drive_id)
+        response.update({'date': start.isoformat(), 'available': error is None, 'slot': slot, 'error': error})
+
+    free_dates = SchedulingService.next_free_dates(start or SchedulingService.earliest_date(), count, exclude_drive_id)
+    response['next_available_dates'] = [day.isoformat() for day in free_dates]
+
+    return jsonify(response), 200
+
+
 @drives_bp.route('/<int:id>', methods=['GET'])
 @jwt_required()
 def get_drive(id):
+    cached = not_modified(VaccinationDrive.query.filter_by(id=id), VaccinationDrive.updated_at)
+    if cached:
+        return cached
+
     drive = VaccinationDrive.query.get(id)
 
     if not drive:
@@ -83,6 +191,103 @@ def get_drive(id):
     return jsonify(drive.to_dict()), 200
 
 
+@drives_bp.route('/<int:id>/eligible-students', methods=['GET'])
+@jwt_required()
+def get_eligible_students(id):
+    drive = VaccinationDrive.query.get(id)
+
+    if not drive:
+        return jsonify({'error': 'Vaccination drive not found'}), 404
+
+    per_page = request.args.get('per_page', 50, type=int)
+    after = CursorPagination.get_after_id(request.args)
+    if after is None:
+        return jsonify({'error': 'after must be an integer'}), 400
+
+    # Keyset pagination on student id over the class_name join
+    students = VaccinationService.eligible_students_query(drive).filter(
+        Student.id > after
+    ).order_by(Student.id).limit(per_page + 1).all()
+
+    cached = page_not_modified(students)
+    if cached:
+        return cached
+
+    has_more = len(students) > per_page
+    students = students[:per_page]
+
+    return jsonify({
+        'drive_id': drive.id,
+        'per_page': per_page,
+        'has_more': has_more,
+        'next_after': students[-1].id if has_more else None,
+        'students': [student.to_dict() for student in students]
+    }), 200
+
+
+@drives_bp.route('/<int:id>/pending', methods=['GET'])
+@jwt_required()
+def get_pending_students(id):
+    drive = VaccinationDrive.query.get(id)
+
+    if not drive:
+        return jsonify({'error': 'Vaccination drive not found'}), 404
+
+    per_page = request.args.get('per_page', 100, type=int)
+    query = VaccinationService.pending_students_query(drive)
+
+    # Keyset pagination on (class_name, section, id) so students arrive grouped
+    page_query = query
+    cursor = request.args.get('cursor')
+    if cursor:
+        after = VaccinationService.decode_pending_cursor(cursor)
+        if after is None:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        page_query = query.filter(tuple_(Student.class_name, Student.section, Student.id) > tuple_(*after))
+
+    students = page_query.order_by(
+        Student.class_name, Student.section, Student.id
+    ).limit(per_page + 1).all()
+
+    # Pending totals per class and section for the whole drive
+    summary = None
+    if request.args.get('include_counts', '').lower() == 'true':
+        summary = query.with_entities(
+            Student.class_name, Student.section, func.count(Student.id)
+        ).group_by(Student.class_name, Student.section).order_by(Student.class_name, Student.section).all()
+
+    # A student vaccinated in the drive leaves the fetched rows, so they cover new records too
+    cached = page_not_modified(students, depends_on=[summary])
+    if cached:
+        return cached
+
+    has_more = len(students) > per_page
+    students = students[:per_page]
+
+    groups = []
+    for student in students:
+        if not groups or (groups[-1]['class_name'], groups[-1]['section']) != (student.class_name, student.section):
+            groups.append({'class_name': student.class_name, 'section': student.section, 'students': []})
+        groups[-1]['students'].append(student.to_dict())
+
+    last = students[-1] if has_more else None
+    response = {
+        'drive_id': drive.id,
+        'per_page': per_page,
+        'count': len(students),
+        'next_cursor': CursorPagination.encode_cursor([last.class_name, last.section, last.id]) if last else None,
+        'groups': groups
+    }
+
+    if summary is not None:
+        response['summary'] = [
+            {'class_name': class_name, 'section': section, 'pending': pending}
+            for class_name, section, pending in summary
+        ]
+
+    return jsonify(response), 200
+
+
 @drives_bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()
 def update_drive(id):
@@ -105,35 +310,34 @@ def update_drive(id):
     if 'date' in data:
         try:
             new_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
-
-            # Check if new date is at least 15 days in the future
-            if new_date < today + timedelta(days=15):
-                return jsonify({'error': 'Vaccination drive must be scheduled at least 15 days in advance'}), 400
-
-            # Check for overlapping drives on the new date (excluding current drive)
-            existing_drive = VaccinationDrive.query.filter(
-                VaccinationDrive.date == new_date,
-                VaccinationDrive.id != id
-            ).first()
-
-            if existing_drive:
-                return jsonify({'error': 'A vaccination drive is already scheduled for this date'}), 400
-
-            drive.date = new_date
         except ValueError:
             return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
 
+        # Check lead time and find a free slot on the new date (excluding current drive)
+        error, slot = SchedulingService.check_date(new_date, exclude_drive_id=id)
+        if error:
+            return jsonify({'error': error}), 400
+
+        drive.date = new_date
+        drive.slot = slot
+
     if 'available_doses' in data:
         drive.available_doses = data['available_doses']
 
     if 'applicable_classes' in data:
-        drive.applicable_classes = ','.join(data['applicable_classes']) if isinstance(data['applicable_classes'],
-                                                                                      list) else data[
-            'applicable_classes']
+        drive.applicable_classes = data['applicable_classes']
 
+    old_status = drive.status
     if 'status' in data:
         drive.status = data['status']
 
+    try:
+        db.session.flush()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'The date was booked by another drive just now, please try again'}), 409
+
+    StatsService.status_changed(old_status, drive.status)
     db.session.commit()
 
     return jsonify(drive.to_dict()), 200
@@ -153,6 +357,7 @@ def delete_drive(id):
         return jsonify({'error': 'Cannot delete past vaccination drives'}), 400
 
     db.session.delete(drive)
+    StatsService.adjust(total_drives=-1, completed_drives=-1 if drive.status == 'Completed' else 0)
     db.session.commit()
 
     return jsonify({'message': 'Vaccination drive deleted successfully'}), 200
\ No newline at end of file
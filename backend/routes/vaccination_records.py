@@ -1,7 +1,14 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required
 from datetime import datetime
+from sqlalchemy.exc import IntegrityError
 from models import db, Student, VaccinationDrive, VaccinationRecord
+from services.stats_service import StatsService
+from services.vaccination_service import VaccinationService
+from utils.conditional import not_modified
+from utils.query_budget import query_budget
+from utils.serializers import vaccination_record_serializer
+from utils.streaming import requested_stream_format, stream_json
 
 vaccinations_bp = Blueprint('vaccinations', __name__, url_prefix='/api/vaccinations')
 
@@ -27,58 +34,119 @@ def create_vaccination_record():
     if not drive:
         return jsonify({'error': 'Vaccination drive not found'}), 404
 
-    # Check if drive has available doses
-    if drive.used_doses >= drive.available_doses:
-        return jsonify({'error': 'No available doses left for this drive'}), 400
-
     # Check if student is in applicable classes
-    applicable_classes = drive.applicable_classes.split(',') if drive.applicable_classes else []
-    if applicable_classes and student.class_name not in applicable_classes:
+    if not drive.is_open_to(student.class_name):
         return jsonify({'error': f'This vaccination drive is not applicable for class {student.class_name}'}), 400
 
-    # Check if student is already vaccinated in this drive
-    existing_record = VaccinationRecord.query.filter_by(
-        student_id=data['student_id'],
-        drive_id=data['drive_id']
-    ).first()
-
-    if existing_record:
+    # Report a repeat submission as such, even when the drive has no doses left
+    if VaccinationRecord.query.filter_by(student_id=student.id, drive_id=drive.id).first():
         return jsonify({'error': 'Student already vaccinated in this drive'}), 400
 
+    # Atomically take a dose; fails if the drive has none left
+    if not VaccinationService.allocate_doses(drive.id):
+        db.session.rollback()
+        return jsonify({'error': 'No available doses left for this drive'}), 400
+
     # Create vaccination record
     record = VaccinationRecord(
-        student_id=data['student_id'],
-        drive_id=data['drive_id'],
+        student_id=student.id,
+        drive_id=drive.id,
         date=datetime.now().date(),
         status=data.get('status', 'Completed')
     )
 
-    # Update drive used doses
-    drive.used_doses += 1
-
+    # The unique (student_id, drive_id) index rejects a concurrent duplicate; rolling back returns the dose
     db.session.add(record)
+    try:
+        db.session.flush()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'Student already vaccinated in this drive'}), 400
+
+    StatsService.record_added(record.student_id)
     db.session.commit()
 
     return jsonify(record.to_dict()), 201
 
 
+@vaccinations_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def create_vaccination_records_batch():
+    data = request.get_json()
+
+    # Check required fields
+    required_fields = ['drive_id', 'student_ids']
+    for field in required_fields:
+        if field not in data:
+            return jsonify({'error': f'Missing required field: {field}'}), 400
+
+    student_ids = data['student_ids']
+    if not isinstance(student_ids, list) or not all(isinstance(sid, int) for sid in student_ids):
+        return jsonify({'error': 'student_ids must be a list of student IDs'}), 400
+
+    max_batch = current_app.config['VACCINATION_BATCH_MAX_SIZE']
+    if len(student_ids) > max_batch:
+        return jsonify({'error': f'A batch can contain at most {max_batch} students'}), 400
+
+    # Validate drive exists
+    drive = VaccinationDrive.query.get(data['drive_id'])
+    if not drive:
+        return jsonify({'error': 'Vaccination drive not found'}), 404
+
+    try:
+        results = VaccinationService.record_batch(drive, student_ids, data.get('status', 'Completed'))
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request recorded one of these students first
+        db.session.rollback()
+        return jsonify({'error': 'Batch conflicted with another recording, please retry'}), 409
+
+    created_count = sum(1 for result in results if result['status'] == 'created')
+
+    return jsonify({
+        'drive_id': drive.id,
+        'created_count': created_count,
+        'failed_count': len(results) - created_count,
+        'results': results
+    }), 200
+
+
 @vaccinations_bp.route('', methods=['GET'])
 @jwt_required()
+@query_budget(2)
 def get_vaccination_records():
     student_id = request.args.get('student_id')
     drive_id = request.args.get('drive_id')
 
-    query = VaccinationRecord.query
+    query = VaccinationRecord.query.join(
+        Student, VaccinationRecord.student_id == Student.id
+    ).join(
+        VaccinationDrive, VaccinationRecord.drive_id == VaccinationDrive.id
+    )
 
     if student_id:
-        query = query.filter_by(student_id=student_id)
+        query = query.filter(VaccinationRecord.student_id == student_id)
 
     if drive_id:
-        query = query.filter_by(drive_id=drive_id)
+        query = query.filter(VaccinationRecord.drive_id == drive_id)
+
+    # Records embed student and vaccine names, so renames must change the validators too
+    cached = not_modified(query, VaccinationRecord.updated_at, Student.updated_at, VaccinationDrive.updated_at)
+    if cached:
+        return cached
+
+    query = vaccination_record_serializer.select(query)
+
+    # Streaming mode: emit rows from the cursor in batches instead of building one list
+    stream_format = requested_stream_format()
+    if stream_format:
+        batch_size = current_app.config['REPORT_STREAM_BATCH_SIZE']
+        return stream_json(query.yield_per(batch_size), vaccination_record_serializer.serialize,
+                           stream_format, batch_size)
 
     records = query.all()
 
-    return jsonify([record.to_dict() for record in records]), 200
+    return jsonify(vaccination_record_serializer.serialize(records)), 200
 
 
 @vaccinations_bp.route('/<int:id>', methods=['DELETE'])
@@ -90,11 +158,10 @@ def delete_vaccination_record(id):
         return jsonify({'error': 'Vaccination record not found'}), 404
 
     # Update drive used doses
-    drive = VaccinationDrive.query.get(record.drive_id)
-    if drive:
-        drive.used_doses = max(0, drive.used_doses - 1)
+    VaccinationService.release_doses(record.drive_id)
 
     db.session.delete(record)
+    StatsService.record_removed(record.student_id)
     db.session.commit()
 
     return jsonify({'message': 'Vaccination record deleted successfully'}), 200
\ No newline at end of file
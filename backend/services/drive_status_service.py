@@ -0,0 +1,78 @@
+import time
+from functools import partial
+from datetime import datetime
+from models import db, VaccinationDrive, DriveStatusRun
+from services.stats_service import StatsService
+from utils.background import start_periodic_task
+from utils.response_cache import invalidate_cache
+from utils.tenancy import known_schools, tenant_context
+
+
+class DriveStatusService:
+    @staticmethod
+    def reconcile(drive_id=None):
+        """Bring drive statuses in line with their dates using two set-based UPDATEs.
+
+        Only rows whose status is wrong for today match the WHERE clauses, so
+        already-correct drives are never rewritten. Cancelled drives are left alone.
+        """
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+        today = datetime.now().date()
+
+        def drives(status):
+            query = VaccinationDrive.query.filter(VaccinationDrive.status == status)
+            return query.filter(VaccinationDrive.id == drive_id) if drive_id else query
+
+        completed = drives('Scheduled').filter(VaccinationDrive.date < today).update(
+            {'status': 'Completed'}, synchronize_session=False
+        )
+        reopened = drives('Completed').filter(VaccinationDrive.date > today).update(
+            {'status': 'Scheduled'}, synchronize_session=False
+        )
+        if completed or reopened:
+            StatsService.adjust(completed_drives=completed - reopened)
+
+        run = DriveStatusRun(
+            started_at=started_at,
+            duration_ms=round((time.perf_counter() - start) * 1000, 3),
+            completed_count=completed,
+            reopened_count=reopened
+        )
+        db.session.add(run)
+        db.session.commit()
+
+        if completed or reopened:
+            # Loaded drives may still hold the old status
+            db.session.expire_all()
+            invalidate_cache('drives')
+
+        return run
+
+    @staticmethod
+    def reconcile_all(app):
+        """Reconcile every school's drives, logging each run"""
+        for school in known_schools(app):
+            with tenant_context(app, school):
+                try:
+                    run = DriveStatusService.reconcile()
+                    app.logger.info(
+                        'Drive status reconciliation for %s: %d completed, %d reopened in %.1f ms',
+                        school, run.completed_count, run.reopened_count, run.duration_ms
+                    )
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception('Drive status reconciliation failed for %s', school)
+
+    @staticmethod
+    def start_scheduler(app):
+        """Start reconciling every DRIVE_STATUS_INTERVAL seconds, unless it is 0.
+
+        The first pass runs at once and catches up on drives whose date passed
+        while no server was running.
+        """
+        interval = app.config['DRIVE_STATUS_INTERVAL']
+        if interval <= 0:
+            return None
+
+        return start_periodic_task('drive-status-scheduler', interval, partial(DriveStatusService.reconcile_all, app))
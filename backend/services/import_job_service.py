@@ -0,0 +1,191 @@
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import partial
+from sqlalchemy import or_
+from models import db, ImportJob
+from services.student_service import StudentService
+from utils.background import start_periodic_task
+from utils.tenancy import DEFAULT_SCHOOL, current_school, known_schools, tenant_context
+
+
+class ImportJobService:
+    _executor = None
+    _executor_lock = threading.Lock()
+    # (school, job id) of every job this process has queued or is running
+    _owned_jobs = set()
+    _owned_lock = threading.Lock()
+
+    @staticmethod
+    def get_executor(app):
+        """Return the shared worker pool, creating it on first use"""
+        with ImportJobService._executor_lock:
+            if ImportJobService._executor is None:
+                ImportJobService._executor = ThreadPoolExecutor(
+                    max_workers=app.config['BULK_IMPORT_WORKERS'],
+                    thread_name_prefix='bulk-import'
+                )
+            return ImportJobService._executor
+
+    @staticmethod
+    def submit(app, job_id, school):
+        """Hand a job to this process's worker pool and renew its lease until it finishes"""
+        with ImportJobService._owned_lock:
+            ImportJobService._owned_jobs.add((school, job_id))
+        ImportJobService.get_executor(app).submit(ImportJobService.run_job, app, job_id, school)
+
+    @staticmethod
+    def enqueue(app, file):
+        """Save an uploaded CSV file and queue it for import"""
+        upload_dir = app.config['BULK_IMPORT_UPLOAD_DIR']
+        os.makedirs(upload_dir, exist_ok=True)
+
+        job = ImportJob(filename=file.filename, status='Queued', heartbeat_at=datetime.utcnow())
+        db.session.add(job)
+        db.session.flush()
+
+        job.file_path = os.path.join(upload_dir, f'{job.id}.csv')
+        file.save(job.file_path)
+        db.session.commit()
+
+        ImportJobService.submit(app, job.id, current_school())
+
+        return job
+
+    @staticmethod
+    def run_job(app, job_id, school=DEFAULT_SCHOOL):
+        """Run a queued import job inside its own application context, against its school's database"""
+        try:
+            ImportJobService._run_job(app, job_id, school)
+        finally:
+            with ImportJobService._owned_lock:
+                ImportJobService._owned_jobs.discard((school, job_id))
+
+    @staticmethod
+    def _run_job(app, job_id, school):
+        with tenant_context(app, school):
+            # Claim the job atomically so it never runs twice
+            claimed = ImportJob.query.filter_by(id=job_id, status='Queued').update(
+                {'status': 'Running', 'started_at': datetime.utcnow(), 'heartbeat_at': datetime.utcnow()}
+            )
+            db.session.commit()
+            if not claimed:
+                return
+
+            job = ImportJob.query.get(job_id)
+
+            def update_progress(progress):
+                job.chunks_processed = progress['chunks_processed']
+                job.rows_processed = progress['rows_processed']
+                job.success_count = progress['success_count']
+                job.error_count = progress['error_count']
+                job.heartbeat_at = datetime.utcnow()
+                db.session.commit()
+
+            try:
+                with open(job.file_path, 'rb') as csv_file:
+                    result, status = StudentService.process_bulk_import(
+                        csv_file,
+                        chunk_size=app.config['BULK_IMPORT_CHUNK_SIZE'],
+                        progress_callback=update_progress
+                    )
+
+                if status == 200:
+                    job.status = 'Completed'
+                    job.errors = json.dumps(result['errors'])
+                    job.message = result['message']
+                else:
+                    job.status = 'Failed'
+                    job.message = result['error']
+            except Exception as e:
+                db.session.rollback()
+                job.status = 'Failed'
+                job.message = f'Failed to process CSV file: {str(e)}'
+            finally:
+                job.finished_at = datetime.utcnow()
+                db.session.commit()
+                if job.file_path and os.path.exists(job.file_path):
+                    os.remove(job.file_path)
+
+    @staticmethod
+    def renew_leases():
+        """Refresh the heartbeat of the current school's jobs that this process owns"""
+        school = current_school()
+        with ImportJobService._owned_lock:
+            job_ids = [job_id for owner, job_id in ImportJobService._owned_jobs if owner == school]
+        if not job_ids:
+            return 0
+
+        renewed = ImportJob.query.filter(
+            ImportJob.id.in_(job_ids), ImportJob.status.in_(['Queued', 'Running'])
+        ).update(
+            # Leave updated_at alone so polling clients' ETags only change with progress
+            {ImportJob.heartbeat_at: datetime.utcnow(), ImportJob.updated_at: ImportJob.updated_at},
+            synchronize_session=False
+        )
+        db.session.commit()
+        return renewed
+
+    @staticmethod
+    def recover_jobs(app):
+        """Take over the current school's orphaned jobs: requeue waiting ones and fail interrupted ones.
+
+        A job is orphaned when its heartbeat is older than BULK_IMPORT_LEASE_TIMEOUT,
+        meaning the process that queued it has stopped. Jobs owned by other live
+        processes keep renewing their heartbeat and are left alone. Each job is
+        claimed with a conditional UPDATE on its old heartbeat, so only one
+        process recovers it.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=app.config['BULK_IMPORT_LEASE_TIMEOUT'])
+        orphans = ImportJob.query.filter(
+            ImportJob.status.in_(['Queued', 'Running']),
+            or_(ImportJob.heartbeat_at.is_(None), ImportJob.heartbeat_at < cutoff)
+        ).all()
+
+        recovered = 0
+        for job in orphans:
+            unchanged = (ImportJob.heartbeat_at.is_(None) if job.heartbeat_at is None
+                         else ImportJob.heartbeat_at == job.heartbeat_at)
+            claimed = ImportJob.query.filter(
+                ImportJob.id == job.id, ImportJob.status == job.status, unchanged
+            ).update({'heartbeat_at': datetime.utcnow()}, synchronize_session=False)
+            db.session.commit()
+            if not claimed:
+                continue
+
+            db.session.refresh(job)
+            if job.status == 'Running':
+                job.status = 'Failed'
+                job.message = 'Import interrupted by server restart'
+                job.finished_at = datetime.utcnow()
+            elif job.file_path and os.path.exists(job.file_path):
+                ImportJobService.submit(app, job.id, current_school())
+            else:
+                job.status = 'Failed'
+                job.message = 'Uploaded file is no longer available'
+            db.session.commit()
+            recovered += 1
+
+        return recovered
+
+    @staticmethod
+    def heartbeat(app):
+        """Renew this process's job leases and recover orphaned jobs in every school"""
+        for school in known_schools(app):
+            with tenant_context(app, school):
+                try:
+                    ImportJobService.renew_leases()
+                    recovered = ImportJobService.recover_jobs(app)
+                    if recovered:
+                        app.logger.info('Recovered %d orphaned import jobs for %s', recovered, school)
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception('Import job heartbeat failed for %s', school)
+
+    @staticmethod
+    def start_heartbeat(app):
+        """Start the lease renewal thread once per process; its first pass recovers jobs left by stopped processes"""
+        return start_periodic_task('bulk-import-heartbeat', app.config['BULK_IMPORT_HEARTBEAT_INTERVAL'],
+                                   partial(ImportJobService.heartbeat, app))
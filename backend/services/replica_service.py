@@ -0,0 +1,69 @@
+from datetime import datetime
+from functools import partial
+from models import db, ReplicaHeartbeat
+from utils.background import start_periodic_task
+from utils.replica import replica_bind_key
+from utils.tenancy import known_schools, tenant_context, tenant_engine
+
+
+class ReplicaService:
+    @staticmethod
+    def schools_with_replicas(app):
+        return [school for school in known_schools(app) if school in app.config['REPLICA_DATABASES']]
+
+    @staticmethod
+    def beat():
+        """Stamp the current school's primary with the time; replicas measure their lag from it"""
+        db.session.merge(ReplicaHeartbeat(id=1, beat_at=datetime.utcnow()))
+        db.session.commit()
+
+    @staticmethod
+    def sync(school):
+        """Write a heartbeat and, for SQLite stand-ins, copy the primary over the replica.
+
+        A real replica (e.g. PostgreSQL streaming replication) receives the
+        heartbeat row by itself; two SQLite files have no replication, so the
+        primary is copied with SQLite's online backup API, which is safe while
+        both are in use.
+        """
+        replica = db.engines.get(replica_bind_key(school))
+        if replica is None:
+            return False
+
+        ReplicaService.beat()
+        primary = tenant_engine(db)
+        if primary.dialect.name != 'sqlite' or replica.dialect.name != 'sqlite':
+            return False
+
+        source = primary.raw_connection()
+        target = replica.raw_connection()
+        try:
+            source.driver_connection.backup(target.driver_connection)
+        finally:
+            target.close()
+            source.close()
+        return True
+
+    @staticmethod
+    def sync_all(app):
+        """Sync every school's replica"""
+        for school in ReplicaService.schools_with_replicas(app):
+            with tenant_context(app, school):
+                try:
+                    ReplicaService.sync(school)
+                except Exception:
+                    db.session.rollback()
+                    app.logger.exception('Replica sync failed for %s', school)
+
+    @staticmethod
+    def start_scheduler(app):
+        """Start syncing every REPLICA_HEARTBEAT_INTERVAL seconds if any school has a replica.
+
+        The first pass runs at once, so SQLite stand-ins are brought up to date
+        before the lag check lets reads through to them.
+        """
+        interval = app.config['REPLICA_HEARTBEAT_INTERVAL']
+        if interval <= 0 or not ReplicaService.schools_with_replicas(app):
+            return None
+
+        return start_periodic_task('replica-heartbeat', interval, partial(ReplicaService.sync_all, app))
@@ -0,0 +1,227 @@
+import csv
+import io
+from datetime import datetime
+from sqlalchemy import and_, func, or_
+from models import db, Student, VaccinationDrive, VaccinationRecord
+from utils.pagination import CursorPagination
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency, needed only for Parquet/Arrow exports
+    pa = None
+
+
+class ExportSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain().
+
+    tell() keeps counting across drains, since writers record absolute offsets
+    (the Parquet footer, for one) as they go.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ReportService:
+    # Output column name -> selected SQL column
+    REPORT_COLUMNS = [
+        ('record_id', VaccinationRecord.id),
+        ('student_id', Student.student_id),
+        ('student_name', Student.name),
+        ('class_name', Student.class_name),
+        ('section', Student.section),
+        ('vaccine_name', VaccinationDrive.vaccine_name),
+        ('vaccination_date', VaccinationRecord.date),
+        ('status', VaccinationRecord.status)
+    ]
+
+    # Export format -> (mimetype, file extension)
+    EXPORT_FORMATS = {
+        'csv': ('text/csv', 'csv'),
+        'parquet': ('application/vnd.apache.parquet', 'parquet'),
+        'arrow': ('application/vnd.apache.arrow.stream', 'arrows')
+    }
+
+    @staticmethod
+    def parse_date(value):
+        """Parse a YYYY-MM-DD filter value, ignoring invalid input"""
+        if not value:
+            return None
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            return None
+
+    @staticmethod
+    def build_report_query(vaccine_name=None, class_name=None, start_date=None, end_date=None):
+        """Build the filtered report query selecting only the report columns"""
+        query = db.session.query(
+            *[column.label(name) for name, column in ReportService.REPORT_COLUMNS]
+        ).join(
+            Student, VaccinationRecord.student_id == Student.id
+        ).join(
+            VaccinationDrive, VaccinationRecord.drive_id == VaccinationDrive.id
+        )
+
+        # Apply filters
+        if vaccine_name:
+            query = query.filter(VaccinationDrive.vaccine_name == vaccine_name)
+
+        if class_name:
+            query = query.filter(Student.class_name == class_name)
+
+        start_date = ReportService.parse_date(start_date)
+        if start_date:
+            query = query.filter(VaccinationRecord.date >= start_date)
+
+        end_date = ReportService.parse_date(end_date)
+        if end_date:
+            query = query.filter(VaccinationRecord.date <= end_date)
+
+        return query
+
+    @staticmethod
+    def decode_report_cursor(token):
+        """Decode a report cursor into its (date, record id) sort key, or None if invalid"""
+        values = CursorPagination.decode_cursor(token)
+        if not values or len(values) != 2:
+            return None
+        vaccination_date = ReportService.parse_date(values[0] if isinstance(values[0], str) else None)
+        if vaccination_date is None or not isinstance(values[1], int):
+            return None
+        return vaccination_date, values[1]
+
+    @staticmethod
+    def paginate_report(query, after, limit):
+        """Return one keyset page of report rows ordered by (date, id) descending.
+
+        after is the (date, record id) key of the last row on the previous page,
+        so each page costs O(limit) regardless of how deep the client has paged.
+        """
+        if after:
+            vaccination_date, record_id = after
+            query = query.filter(or_(
+                VaccinationRecord.date < vaccination_date,
+                and_(VaccinationRecord.date == vaccination_date, VaccinationRecord.id < record_id)
+            ))
+
+        rows = query.order_by(
+            VaccinationRecord.date.desc(), VaccinationRecord.id.desc()
+        ).limit(limit + 1).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = CursorPagination.encode_cursor([last.vaccination_date.isoformat(), last.record_id])
+
+        return [row._asdict() for row in rows], next_cursor
+
+    @staticmethod
+    def estimate_count(query, filtered, cap):
+        """Count matching records up to cap, returning (count, capped).
+
+        At most cap + 1 record ids are read, so the cost stays bounded however
+        many records match; unfiltered reports probe the record table without joins.
+        """
+        if filtered:
+            probe = query.order_by(None).with_entities(VaccinationRecord.id)
+        else:
+            probe = db.session.query(VaccinationRecord.id)
+        count = db.session.query(func.count()).select_from(probe.limit(cap + 1).subquery()).scalar()
+        return min(count, cap), count > cap
+
+    @staticmethod
+    def generate_csv(rows, batch_size):
+        """Yield CSV text for report rows, one chunk per batch_size rows"""
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow([name for name, _ in ReportService.REPORT_COLUMNS])
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate(0)
+
+        for count, row in enumerate(rows, start=1):
+            writer.writerow(row)
+            if count % batch_size == 0:
+                yield output.getvalue()
+                output.seek(0)
+                output.truncate(0)
+
+        yield output.getvalue()
+
+    @staticmethod
+    def columnar_available():
+        return pa is not None
+
+    @staticmethod
+    def arrow_schema():
+        """Typed schema of columnar exports; repeated text values are dictionary encoded"""
+        text = pa.dictionary(pa.int32(), pa.string())
+        return pa.schema([
+            ('record_id', pa.int64()),
+            ('student_id', pa.string()),
+            ('student_name', pa.string()),
+            ('class_name', text),
+            ('section', text),
+            ('vaccine_name', text),
+            ('vaccination_date', pa.date32()),
+            ('status', text)
+        ])
+
+    @staticmethod
+    def to_record_batch(rows, schema):
+        """Build one Arrow record batch from a list of report row tuples"""
+        arrays = []
+        for field, values in zip(schema, zip(*rows)):
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    @staticmethod
+    def generate_columnar(rows, batch_size, export_format):
+        """Yield a zstd-compressed Parquet file or Arrow IPC stream, one record batch per batch_size rows.
+
+        Each batch becomes a Parquet row group or an IPC message, so only one
+        batch of rows is held in memory at a time.
+        """
+        schema = ReportService.arrow_schema()
+        sink = ExportSink()
+        if export_format == 'parquet':
+            writer = pq.ParquetWriter(sink, schema, compression='zstd')
+        else:
+            writer = pa.ipc.new_stream(sink, schema, options=pa.ipc.IpcWriteOptions(compression='zstd'))
+
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == batch_size:
+                writer.write_batch(ReportService.to_record_batch(batch, schema))
+                batch = []
+                yield sink.drain()
+
+        if batch:
+            writer.write_batch(ReportService.to_record_batch(batch, schema))
+        writer.close()
+        yield sink.drain()
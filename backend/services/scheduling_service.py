@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func
+from models import db, VaccinationDrive
+
+
+class SchedulingService:
+    @staticmethod
+    def earliest_date():
+        """First date a new drive may be scheduled on"""
+        return datetime.now().date() + timedelta(days=current_app.config['DRIVE_MIN_LEAD_DAYS'])
+
+    @staticmethod
+    def check_date(drive_date, exclude_drive_id=None):
+        """Return (error, slot) for scheduling a drive on drive_date.
+
+        slot is the lowest free slot on that date, found with one range scan of
+        the (date, slot) unique index. exclude_drive_id lets a drive keep or move
+        within its own date when it is rescheduled.
+        """
+        lead_days = current_app.config['DRIVE_MIN_LEAD_DAYS']
+        if drive_date < SchedulingService.earliest_date():
+            return f'Vaccination drive must be scheduled at least {lead_days} days in advance', None
+
+        query = db.session.query(VaccinationDrive.slot).filter(VaccinationDrive.date == drive_date)
+        if exclude_drive_id:
+            query = query.filter(VaccinationDrive.id != exclude_drive_id)
+        taken = {row[0] for row in query}
+
+        slots_per_day = current_app.config['DRIVE_SLOTS_PER_DAY']
+        slot = next((slot for slot in range(slots_per_day) if slot not in taken), None)
+        if slot is None:
+            if slots_per_day == 1:
+                return 'A vaccination drive is already scheduled for this date', None
+            return f'All {slots_per_day} drive slots on this date are taken', None
+
+        return None, slot
+
+    @staticmethod
+    def next_free_dates(start, count, exclude_drive_id=None):
+        """Return the first count dates from start that still have a free slot.
+
+        One grouped query over the date index finds the fully booked dates;
+        every other day is free.
+        """
+        start = max(start, SchedulingService.earliest_date())
+
+        query = db.session.query(VaccinationDrive.date).filter(VaccinationDrive.date >= start)
+        if exclude_drive_id:
+            query = query.filter(VaccinationDrive.id != exclude_drive_id)
+        full = {row[0] for row in query.group_by(VaccinationDrive.date).having(
+            func.count() >= current_app.config['DRIVE_SLOTS_PER_DAY']
+        )}
+
+        dates = []
+        day = start
+        while len(dates) < count:
+            if day not in full:
+                dates.append(day)
+            day += timedelta(days=1)
+        return dates
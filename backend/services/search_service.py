@@ -0,0 +1,97 @@
+import re
+from sqlalchemy import case, column, func, literal, or_, table, text, union_all
+from models import db, Student
+
+student_fts = table('student_fts', column('rowid'), column('rank'))
+student_id_trigram = table('student_id_trigram', column('rowid'), column('rank'))
+
+
+class SearchService:
+    # Search index tables present in each database, by engine URL
+    _indexes = {}
+
+    @staticmethod
+    def detect_indexes():
+        """Look up which search indexes the current database has.
+
+        Called at startup after migrations, so requests never pay for the
+        probe; later calls for an unseen database probe lazily.
+        """
+        engine = db.session.get_bind()
+        found = set()
+        if engine.dialect.name == 'sqlite':
+            found = {row[0] for row in db.session.execute(text(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name IN ('student_fts', 'student_id_trigram')"
+            ))}
+        SearchService._indexes[str(engine.url)] = found
+        return found
+
+    @staticmethod
+    def indexes():
+        indexes = SearchService._indexes.get(str(db.session.get_bind().url))
+        return SearchService.detect_indexes() if indexes is None else indexes
+
+    @staticmethod
+    def fts_available():
+        """Whether the current database has the student_fts index"""
+        return 'student_fts' in SearchService.indexes()
+
+    @staticmethod
+    def build_match_expression(search):
+        """Turn free text into an FTS5 query where every word must match as a prefix"""
+        tokens = re.findall(r'\w+', search)
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+    @staticmethod
+    def search_students(query, search):
+        """Filter a Student query by search text, most relevant first.
+
+        Uses the FTS5 index when present (word-prefix matching ranked by bm25),
+        plus the student ID trigram index for searches of three or more
+        characters, so IDs still match by any substring. Shorter searches are
+        below the trigram length and match IDs with ILIKE instead. Without FTS5
+        everything falls back to ILIKE, which PostgreSQL serves from trigram indexes.
+        """
+        if SearchService.fts_available():
+            match = SearchService.build_match_expression(search)
+            if not match:
+                return query.filter(db.false())
+
+            matches = db.select(student_fts.c.rowid, student_fts.c.rank).select_from(student_fts).where(
+                text('student_fts MATCH :match').bindparams(match=match)
+            )
+            term = search.strip()
+            id_matches = None
+            if len(term) >= 3 and 'student_id_trigram' in SearchService.indexes():
+                id_matches = db.select(student_id_trigram.c.rowid, student_id_trigram.c.rank).select_from(
+                    student_id_trigram
+                ).where(text('student_id_trigram MATCH :id_match').bindparams(
+                    id_match='"' + term.replace('"', '""') + '"'
+                ))
+            elif 0 < len(term) < 3:
+                # Too short for trigrams: match IDs with ILIKE, ranked after the word-prefix matches
+                pattern = '%' + re.sub(r'([\\%_])', r'\\\1', term) + '%'
+                id_matches = db.select(Student.id.label('rowid'), literal(0.0).label('rank')).where(
+                    Student.student_id.ilike(pattern, escape='\\')
+                )
+
+            if id_matches is not None:
+                both = union_all(matches, id_matches).subquery()
+                # A student found by both indexes keeps its better rank
+                matches = db.select(both.c.rowid, func.min(both.c.rank).label('rank')).group_by(both.c.rowid)
+
+            matches = matches.subquery()
+            return query.join(matches, matches.c.rowid == Student.id).order_by(matches.c.rank, Student.id)
+
+        search_term = f"%{search}%"
+        return query.filter(
+            or_(
+                Student.name.ilike(search_term),
+                Student.student_id.ilike(search_term),
+                Student.class_name.ilike(search_term)
+            )
+        ).order_by(
+            case((Student.student_id.ilike(search), 0), (Student.name.ilike(f'{search}%'), 1), else_=2),
+            Student.id
+        )
@@ -0,0 +1,103 @@
+from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from models import db, Student, VaccinationDrive, VaccinationRecord, DashboardCounter, LOOKUP_CHUNK_SIZE
+
+
+class StatsService:
+    COUNTERS = ['total_students', 'vaccinated_students', 'total_drives', 'completed_drives']
+
+    @staticmethod
+    def compute():
+        """Compute every dashboard counter from the base tables with a single aggregate query"""
+        row = db.session.execute(select(
+            select(func.count(Student.id)).scalar_subquery(),
+            select(func.count(func.distinct(VaccinationRecord.student_id))).scalar_subquery(),
+            select(func.count(VaccinationDrive.id)).scalar_subquery(),
+            select(func.count(VaccinationDrive.id)).where(VaccinationDrive.status == 'Completed').scalar_subquery()
+        )).one()
+        return dict(zip(StatsService.COUNTERS, row))
+
+    @staticmethod
+    def rebuild():
+        """Recompute every dashboard counter and store the result"""
+        counters = StatsService.compute()
+        for name, value in counters.items():
+            db.session.merge(DashboardCounter(name=name, value=value, updated_at=datetime.utcnow()))
+        db.session.commit()
+
+        return counters
+
+    @staticmethod
+    def get_counters():
+        """Return the dashboard counters, rebuilding them if they have never been computed"""
+        counters = {counter.name: counter.value for counter in DashboardCounter.query.all()}
+        if set(counters) != set(StatsService.COUNTERS):
+            try:
+                counters = StatsService.rebuild()
+            except IntegrityError:
+                # Another process booting at the same time inserted them first
+                db.session.rollback()
+                counters = {counter.name: counter.value for counter in DashboardCounter.query.all()}
+        return counters
+
+    @staticmethod
+    def adjust(**deltas):
+        """Apply counter deltas in the caller's transaction, e.g. adjust(total_students=1)"""
+        for name, delta in deltas.items():
+            if delta:
+                DashboardCounter.query.filter_by(name=name).update(
+                    {DashboardCounter.value: DashboardCounter.value + delta,
+                     DashboardCounter.updated_at: datetime.utcnow()},
+                    synchronize_session=False
+                )
+
+    @staticmethod
+    def lock_students(student_ids):
+        """Lock the students' rows until commit (a no-op on SQLite, whose writers are serialized anyway).
+
+        The first-record and last-record checks below then run one transaction at
+        a time per student. Under READ COMMITTED the waiting transaction's check
+        sees the records the other one committed, so two concurrent first records
+        for a student count them once.
+        """
+        if db.session.get_bind().dialect.name == 'sqlite':
+            return
+        db.session.query(Student.id).filter(Student.id.in_(student_ids)).order_by(Student.id).with_for_update().all()
+
+    @staticmethod
+    def record_added(student_id):
+        """Count a student as vaccinated when their first record is flushed"""
+        db.session.flush()
+        StatsService.lock_students([student_id])
+        if VaccinationRecord.query.filter_by(student_id=student_id).limit(2).count() == 1:
+            StatsService.adjust(vaccinated_students=1)
+
+    @staticmethod
+    def records_added(student_ids):
+        """Count newly vaccinated students after a batch of records, one per student, is flushed"""
+        db.session.flush()
+        # Lock in id order across chunks so concurrent batches cannot deadlock
+        student_ids = sorted(student_ids)
+        newly_vaccinated = 0
+        for start in range(0, len(student_ids), LOOKUP_CHUNK_SIZE):
+            chunk = student_ids[start:start + LOOKUP_CHUNK_SIZE]
+            StatsService.lock_students(chunk)
+            newly_vaccinated += db.session.query(VaccinationRecord.student_id).filter(
+                VaccinationRecord.student_id.in_(chunk)
+            ).group_by(VaccinationRecord.student_id).having(func.count(VaccinationRecord.id) == 1).count()
+        StatsService.adjust(vaccinated_students=newly_vaccinated)
+
+    @staticmethod
+    def record_removed(student_id):
+        """Stop counting a student as vaccinated once their last record is deleted"""
+        db.session.flush()
+        StatsService.lock_students([student_id])
+        if not db.session.query(VaccinationRecord.query.filter_by(student_id=student_id).exists()).scalar():
+            StatsService.adjust(vaccinated_students=-1)
+
+    @staticmethod
+    def status_changed(old_status, new_status):
+        """Keep completed_drives in step with a drive status transition"""
+        if old_status != new_status:
+            StatsService.adjust(completed_drives=(new_status == 'Completed') - (old_status == 'Completed'))
@@ -1,89 +1,173 @@
 import pandas as pd
-from models import db, Student
+from flask import current_app
+from models import db, Student, LOOKUP_CHUNK_SIZE
+from services.stats_service import StatsService
+from services.suggest_service import SuggestService
 from sqlalchemy.exc import SQLAlchemyError
+from utils.response_cache import invalidate_cache
 
 
 class StudentService:
+    REQUIRED_COLUMNS = ['student_id', 'name', 'class_name', 'section']
+    OPTIONAL_COLUMNS = ['age', 'gender']
+
     @staticmethod
     def validate_csv_data(df):
-        """Validate CSV data structure and content"""
-        required_columns = ['student_id', 'name', 'class_name', 'section']
-
+        """Validate CSV data structure and normalize column values"""
         # Check if all required columns are present
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in StudentService.REQUIRED_COLUMNS if col not in df.columns]
         if missing_columns:
             return False, f"Missing required columns: {', '.join(missing_columns)}"
 
-        # Remove empty rows
-        df = df.dropna(subset=required_columns)
+        df = df.copy()
+        for column in StudentService.REQUIRED_COLUMNS + StudentService.OPTIONAL_COLUMNS:
+            if column not in df.columns:
+                df[column] = None
+            df[column] = df[column].astype('string').str.strip().replace('', pd.NA)
 
-        # Validate data types
-        df['student_id'] = df['student_id'].astype(str)
-        df['name'] = df['name'].astype(str)
-        df['class_name'] = df['class_name'].astype(str)
-        df['section'] = df['section'].astype(str)
+        return True, df
 
-        if 'age' in df.columns:
-            df['age'] = pd.to_numeric(df['age'], errors='coerce')
+    @staticmethod
+    def find_existing_student_ids(student_ids):
+        """Return the subset of student_ids already present, using one IN query per chunk"""
+        student_ids = list(student_ids)
+        existing = set()
+        for start in range(0, len(student_ids), LOOKUP_CHUNK_SIZE):
+            chunk = student_ids[start:start + LOOKUP_CHUNK_SIZE]
+            rows = db.session.query(Student.student_id).filter(Student.student_id.in_(chunk))
+            existing.update(row[0] for row in rows)
+        return existing
 
-        return True, df
+    @staticmethod
+    def check_rows(df):
+        """Run per-row checks over the whole frame, returning one error message (or NA) per row"""
+        row_labels = 'Row ' + pd.Series(df.index + 1, index=df.index).astype(str) + ': '
+        errors = pd.Series(pd.NA, index=df.index, dtype='object')
+
+        # Missing required values
+        missing = df[StudentService.REQUIRED_COLUMNS].isna()
+        has_missing = missing.any(axis=1)
+        if has_missing.any():
+            missing_fields = missing[has_missing].apply(
+                lambda row: ', '.join(row.index[row]), axis=1
+            )
+            errors[has_missing] = row_labels[has_missing] + 'Missing required field(s): ' + missing_fields
+
+        # Age must be a whole number when given
+        ages = pd.to_numeric(df['age'], errors='coerce')
+        bad_age = errors.isna() & df['age'].notna() & (ages.isna() | (ages % 1 != 0))
+        errors[bad_age] = row_labels[bad_age] + 'Invalid age ' + df.loc[bad_age, 'age']
+
+        # Duplicates within the file itself
+        duplicate = errors.isna() & df['student_id'].duplicated(keep='first')
+        errors[duplicate] = (row_labels[duplicate] + 'Student ID ' + df.loc[duplicate, 'student_id'] +
+                             ' is duplicated in the file')
+
+        # Students that already exist
+        candidates = errors.isna()
+        existing = StudentService.find_existing_student_ids(df.loc[candidates, 'student_id'].unique())
+        exists = candidates & df['student_id'].isin(existing)
+        errors[exists] = row_labels[exists] + 'Student ID ' + df.loc[exists, 'student_id'] + ' already exists'
+
+        return errors, ages
+
+    @staticmethod
+    def insert_students(mappings, batch_size):
+        """Insert student mappings with executemany in batches"""
+        for start in range(0, len(mappings), batch_size):
+            db.session.bulk_insert_mappings(Student, mappings[start:start + batch_size])
 
     @staticmethod
-    def process_bulk_import(csv_file):
-        """Process bulk student import from CSV file"""
+    def import_frame(df, batch_size):
+        """Validate and insert one DataFrame of rows, returning (inserted student_ids, errors)"""
+        errors, ages = StudentService.check_rows(df)
+        valid = errors.isna()
+
+        rows = df.loc[valid, ['student_id', 'name', 'class_name', 'section', 'gender']].astype('object')
+        rows['age'] = ages[valid].astype('Int64').astype('object')
+        rows = rows.where(rows.notna(), None)
+        mappings = rows.to_dict('records')
+
+        StudentService.insert_students(mappings, batch_size)
+        StatsService.adjust(total_students=len(mappings))
+
+        return [mapping['student_id'] for mapping in mappings], errors.dropna().tolist()
+
+    @staticmethod
+    def process_bulk_import(csv_file, batch_size=None, chunk_size=None, progress_callback=None):
+        """Process bulk student import from CSV file.
+
+        When chunk_size is given the file is read and committed chunk_size rows at a
+        time, so memory and transaction length stay bounded regardless of file size.
+        progress_callback, if given, receives a progress dict after every chunk.
+        """
+        batch_size = batch_size or current_app.config['BULK_IMPORT_BATCH_SIZE']
+        max_errors = current_app.config['BULK_IMPORT_MAX_ERRORS'] if chunk_size else None
+
+        progress = {
+            'chunks_processed': 0,
+            'rows_processed': 0,
+            'success_count': 0,
+            'error_count': 0
+        }
+        errors = []
+
         try:
-            # Read CSV file
-            df = pd.read_csv(csv_file)
-
-            # Validate data
-            is_valid, result = StudentService.validate_csv_data(df)
-            if not is_valid:
-                return {'error': result}, 400
-
-            df = result
-
-            # Process each row
-            success_count = 0
-            error_count = 0
-            errors = []
-
-            for index, row in df.iterrows():
-                try:
-                    # Check if student already exists
-                    existing_student = Student.query.filter_by(student_id=row['student_id']).first()
-                    if existing_student:
-                        errors.append(f"Row {index + 1}: Student ID {row['student_id']} already exists")
-                        error_count += 1
-                        continue
-
-                    # Create new student
-                    student = Student(
-                        student_id=row['student_id'],
-                        name=row['name'],
-                        class_name=row['class_name'],
-                        section=row['section'],
-                        age=row.get('age') if pd.notna(row.get('age')) else None,
-                        gender=row.get('gender') if pd.notna(row.get('gender')) else None
-                    )
-
-                    db.session.add(student)
-                    success_count += 1
-
-                except Exception as e:
-                    errors.append(f"Row {index + 1}: {str(e)}")
-                    error_count += 1
-                    db.session.rollback()
-
-            # Commit successful imports
-            db.session.commit()
+            # Read CSV file, keeping identifiers as text
+            if chunk_size:
+                frames = pd.read_csv(csv_file, dtype=str, chunksize=chunk_size)
+            else:
+                frames = [pd.read_csv(csv_file, dtype=str)]
+
+            for df in frames:
+                # Validate data
+                is_valid, result = StudentService.validate_csv_data(df)
+                if not is_valid:
+                    return {'error': result}, 400
+
+                imported_ids, chunk_errors = StudentService.import_frame(result, batch_size)
+                success_count = len(imported_ids)
+
+                # Commit successful imports
+                db.session.commit()
+                SuggestService.students_imported(imported_ids)
+                invalidate_cache('students')
+
+                progress['chunks_processed'] += 1
+                progress['rows_processed'] += len(df)
+                progress['success_count'] += success_count
+                progress['error_count'] += len(chunk_errors)
+
+                if max_errors is None:
+                    errors.extend(chunk_errors)
+                else:
+                    errors.extend(chunk_errors[:max(0, max_errors - len(errors))])
+
+                current_app.logger.info(
+                    'Bulk import chunk %d: %d rows processed, %d imported, %d failed',
+                    progress['chunks_processed'], progress['rows_processed'],
+                    progress['success_count'], progress['error_count']
+                )
+                if progress_callback:
+                    progress_callback(dict(progress))
 
             return {
                 'message': 'Bulk import completed',
-                'success_count': success_count,
-                'error_count': error_count,
+                'success_count': progress['success_count'],
+                'error_count': progress['error_count'],
+                'chunks_processed': progress['chunks_processed'],
                 'errors': errors
             }, 200
 
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return {
+                'error': f'Failed to import students: {str(e)}',
+                'success_count': progress['success_count']
+            }, 400
         except Exception as e:
             db.session.rollback()
-            return {'error': f'Failed to process CSV file: {str(e)}'}, 400
\ No newline at end of file
+            return {
+                'error': f'Failed to process CSV file: {str(e)}',
+                'success_count': progress['success_count']
+            }, 400
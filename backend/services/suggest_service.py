@@ -0,0 +1,228 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from flask import current_app
+from models import db, Student, LOOKUP_CHUNK_SIZE
+from utils.tenancy import current_school, tenant_context
+
+
+class StudentSuggestIndex:
+    """In-memory sorted prefix index over student IDs and names.
+
+    Keys are kept in sorted lists of (key, id) tuples, so a prefix lookup is a
+    bisect to the first candidate followed by a short forward scan. lock guards
+    the arrays for lookups; write_lock serializes writers, so bulk changes can
+    build new arrays without blocking lookups and only take lock to swap them in.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.refresh_lock = threading.Lock()
+        self.students = {}
+        self.id_keys = []
+        self.name_keys = []
+        self.built_at = None
+        self.refreshing = False
+
+    @staticmethod
+    def name_keys_for(name):
+        """Index the full name and every word after the first, so surnames match too"""
+        name = (name or '').lower()
+        words = name.split()
+        return list(dict.fromkeys([name] + [' '.join(words[i:]) for i in range(1, len(words))]))
+
+    def build(self, rows):
+        students = {}
+        id_keys = []
+        name_keys = []
+        for row in rows:
+            students[row['id']] = row
+            id_keys.append((row['student_id'].lower(), row['id']))
+            name_keys.extend((key, row['id']) for key in self.name_keys_for(row['name']))
+        id_keys.sort()
+        name_keys.sort()
+
+        with self.write_lock, self.lock:
+            self.students, self.id_keys, self.name_keys = students, id_keys, name_keys
+            self.built_at = time.monotonic()
+
+    def start_refresh(self):
+        """Claim the index's single background rebuild; False if one is already running"""
+        with self.refresh_lock:
+            if self.refreshing:
+                return False
+            self.refreshing = True
+            return True
+
+    def finish_refresh(self):
+        with self.refresh_lock:
+            self.refreshing = False
+
+    def _remove_locked(self, student_pk):
+        row = self.students.pop(student_pk, None)
+        if not row:
+            return
+        self._discard(self.id_keys, (row['student_id'].lower(), student_pk))
+        for key in self.name_keys_for(row['name']):
+            self._discard(self.name_keys, (key, student_pk))
+
+    @staticmethod
+    def _discard(keys, entry):
+        position = bisect_left(keys, entry)
+        if position < len(keys) and keys[position] == entry:
+            del keys[position]
+
+    @staticmethod
+    def _without(keys, student_pks):
+        """Copy of keys minus the entries of student_pks"""
+        if not student_pks:
+            return list(keys)
+        return [entry for entry in keys if entry[1] not in student_pks]
+
+    def upsert(self, rows):
+        """Insert or replace a few students in place"""
+        with self.write_lock, self.lock:
+            for row in rows:
+                self._remove_locked(row['id'])
+                self.students[row['id']] = row
+                insort(self.id_keys, (row['student_id'].lower(), row['id']))
+                for key in self.name_keys_for(row['name']):
+                    insort(self.name_keys, (key, row['id']))
+
+    def merge(self, rows):
+        """Insert or replace many students by building new arrays and swapping them in.
+
+        Each insort shifts the whole array, so adding an import chunk one row at
+        a time is quadratic and blocks lookups throughout. Appending the new
+        keys and sorting once is linear-ish, since both parts are already runs
+        Timsort can merge, and lookups keep using the old arrays until the swap.
+        """
+        with self.write_lock:
+            # Drop the old keys of students being replaced; new students need no scan
+            replaced = {row['id'] for row in rows if row['id'] in self.students}
+            id_keys = self._without(self.id_keys, replaced)
+            name_keys = self._without(self.name_keys, replaced)
+            students = dict(self.students)
+            new_id_keys = []
+            new_name_keys = []
+            for row in rows:
+                students[row['id']] = row
+                new_id_keys.append((row['student_id'].lower(), row['id']))
+                new_name_keys.extend((key, row['id']) for key in self.name_keys_for(row['name']))
+            new_id_keys.sort()
+            new_name_keys.sort()
+            id_keys.extend(new_id_keys)
+            id_keys.sort()
+            name_keys.extend(new_name_keys)
+            name_keys.sort()
+
+            with self.lock:
+                self.students, self.id_keys, self.name_keys = students, id_keys, name_keys
+
+    def remove(self, student_pk):
+        with self.write_lock, self.lock:
+            self._remove_locked(student_pk)
+
+    def search(self, prefix, limit):
+        """Return up to limit students whose ID, then name, starts with prefix"""
+        prefix = prefix.lower()
+        found = []
+        seen = set()
+        with self.lock:
+            for keys in (self.id_keys, self.name_keys):
+                position = bisect_left(keys, (prefix,))
+                while position < len(keys) and len(found) < limit:
+                    key, student_pk = keys[position]
+                    if not key.startswith(prefix):
+                        break
+                    if student_pk not in seen:
+                        seen.add(student_pk)
+                        found.append(self.students[student_pk])
+                    position += 1
+        return found
+
+
+class SuggestService:
+    COLUMNS = (Student.id, Student.student_id, Student.name, Student.class_name, Student.section)
+
+    @staticmethod
+    def get_index():
+        """Return the current school's suggest index, building it on first use.
+
+        Once the index is older than SUGGEST_INDEX_TTL, one background thread
+        rebuilds it while lookups keep using the current arrays.
+        """
+        indexes = current_app.extensions.setdefault('student_suggest_index', {})
+        school = current_school()
+        index = indexes.get(school) or indexes.setdefault(school, StudentSuggestIndex())
+
+        if index.built_at is None:
+            # Concurrent first requests wait for one build instead of each running their own
+            with index.refresh_lock:
+                if index.built_at is None:
+                    index.build(SuggestService.load_rows())
+            return index
+
+        ttl = current_app.config['SUGGEST_INDEX_TTL']
+        if ttl and time.monotonic() - index.built_at > ttl and index.start_refresh():
+            threading.Thread(
+                target=SuggestService.refresh,
+                args=(current_app._get_current_object(), school, index),
+                name='suggest-refresh',
+                daemon=True
+            ).start()
+        return index
+
+    @staticmethod
+    def refresh(app, school, index):
+        """Rebuild index from its school's database in the background"""
+        with tenant_context(app, school):
+            try:
+                index.build(SuggestService.load_rows())
+            except Exception:
+                app.logger.exception('Rebuilding the suggest index for %s failed', school)
+            finally:
+                index.finish_refresh()
+
+    @staticmethod
+    def load_rows(filter_clause=None):
+        query = db.session.query(*SuggestService.COLUMNS)
+        if filter_clause is not None:
+            query = query.filter(filter_clause)
+        return [row._asdict() for row in query]
+
+    @staticmethod
+    def suggest(prefix, limit):
+        return SuggestService.get_index().search(prefix, limit)
+
+    @staticmethod
+    def _built_index():
+        """Return the index only if it has been built; unbuilt indexes pick changes up when built"""
+        index = current_app.extensions.get('student_suggest_index', {}).get(current_school())
+        return index if index and index.built_at is not None else None
+
+    @staticmethod
+    def student_saved(student):
+        index = SuggestService._built_index()
+        if index:
+            index.upsert([{'id': student.id, 'student_id': student.student_id, 'name': student.name,
+                           'class_name': student.class_name, 'section': student.section}])
+
+    @staticmethod
+    def student_deleted(student_pk):
+        index = SuggestService._built_index()
+        if index:
+            index.remove(student_pk)
+
+    @staticmethod
+    def students_imported(student_ids):
+        """Add freshly imported students, looked up by student_id in chunks"""
+        index = SuggestService._built_index()
+        if not index:
+            return
+        rows = []
+        for start in range(0, len(student_ids), LOOKUP_CHUNK_SIZE):
+            chunk = student_ids[start:start + LOOKUP_CHUNK_SIZE]
+            rows.extend(SuggestService.load_rows(Student.student_id.in_(chunk)))
+        index.merge(rows)
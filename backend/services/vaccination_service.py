@@ -1,28 +1,21 @@
-from datetime import datetime, timedelta
-from models import db, VaccinationDrive, VaccinationRecord, Student
+from datetime import datetime
+from models import db, VaccinationDrive, VaccinationRecord, Student, DriveClass, LOOKUP_CHUNK_SIZE
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.exc import SQLAlchemyError
+from services.drive_status_service import DriveStatusService
+from services.scheduling_service import SchedulingService
+from services.stats_service import StatsService
+from utils.pagination import CursorPagination
 
 
 class VaccinationService:
+    ALLOCATION_ATTEMPTS = 5  # Re-reads allowed when concurrent requests keep taking the remaining doses
+
     @staticmethod
     def validate_drive_date(date, exclude_drive_id=None):
         """Validate vaccination drive date"""
-        today = datetime.now().date()
-
-        # Check if date is at least 15 days in the future
-        if date < today + timedelta(days=15):
-            return False, "Vaccination drive must be scheduled at least 15 days in advance"
-
-        # Check for overlapping drives
-        query = VaccinationDrive.query.filter_by(date=date)
-        if exclude_drive_id:
-            query = query.filter(VaccinationDrive.id != exclude_drive_id)
-
-        existing_drive = query.first()
-        if existing_drive:
-            return False, "A vaccination drive is already scheduled for this date"
-
-        return True, ""
+        error, _ = SchedulingService.check_date(date, exclude_drive_id)
+        return error is None, error or ""
 
     @staticmethod
     def validate_vaccination_record(student_id, drive_id):
@@ -38,12 +31,11 @@ class VaccinationService:
             return False, "Vaccination drive not found"
 
         # Check if drive has available doses
-        if drive.used_doses >= drive.available_doses:
+        if (drive.used_doses or 0) >= drive.available_doses:
             return False, "No available doses left for this drive"
 
         # Check if student is in applicable classes
-        applicable_classes = drive.applicable_classes.split(',') if drive.applicable_classes else []
-        if applicable_classes and student.class_name not in applicable_classes:
+        if not drive.is_open_to(student.class_name):
             return False, f"This vaccination drive is not applicable for class {student.class_name}"
 
         # Check if student is already vaccinated in this drive
@@ -57,23 +49,170 @@ class VaccinationService:
 
         return True, {"student": student, "drive": drive}
 
+    @staticmethod
+    def eligible_students_query(drive):
+        """Students whose class is eligible for the drive, as an indexed join on class_name"""
+        if not drive.classes:
+            return Student.query
+        return Student.query.join(DriveClass, and_(
+            DriveClass.class_name == Student.class_name,
+            DriveClass.drive_id == drive.id
+        ))
+
+    @staticmethod
+    def pending_students_query(drive):
+        """Eligible students not yet vaccinated in the drive, via an anti-join on vaccination_record"""
+        return VaccinationService.eligible_students_query(drive).outerjoin(VaccinationRecord, and_(
+            VaccinationRecord.student_id == Student.id,
+            VaccinationRecord.drive_id == drive.id
+        )).filter(VaccinationRecord.id.is_(None))
+
+    @staticmethod
+    def decode_pending_cursor(token):
+        """Decode a pending worklist cursor into its (class_name, section, student id) sort key, or None if invalid"""
+        values = CursorPagination.decode_cursor(token)
+        if not values or len(values) != 3:
+            return None
+        class_name, section, student_id = values
+        if not isinstance(class_name, str) or not isinstance(section, str):
+            return None
+        if not isinstance(student_id, int) or isinstance(student_id, bool):
+            return None
+        return class_name, section, student_id
+
+    @staticmethod
+    def drives_for_class_query(class_name):
+        """Drives open to class_name: those listing it plus those open to every class"""
+        return VaccinationDrive.query.filter(or_(
+            VaccinationDrive.id.in_(select(DriveClass.drive_id).where(DriveClass.class_name == class_name)),
+            ~VaccinationDrive.classes.any()
+        ))
+
+    @staticmethod
+    def allocate_doses(drive_id, count=1):
+        """Reserve doses with a single conditional UPDATE, returning False if not enough are left.
+
+        The check and the increment happen in one statement, so concurrent requests
+        for the same drive can never push used_doses past available_doses.
+        """
+        # used_doses is nullable; NULL + count would never match and never be incremented
+        used_doses = func.coalesce(VaccinationDrive.used_doses, 0)
+        allocated = VaccinationDrive.query.filter(
+            VaccinationDrive.id == drive_id,
+            used_doses + count <= VaccinationDrive.available_doses
+        ).update(
+            {VaccinationDrive.used_doses: used_doses + count},
+            synchronize_session=False
+        )
+        return allocated == 1
+
+    @staticmethod
+    def release_doses(drive_id, count=1):
+        """Return doses to a drive without letting used_doses drop below zero"""
+        VaccinationDrive.query.filter(VaccinationDrive.id == drive_id).update(
+            {VaccinationDrive.used_doses: db.case(
+                (VaccinationDrive.used_doses > count, VaccinationDrive.used_doses - count),
+                else_=0
+            )},
+            synchronize_session=False
+        )
+
+    @staticmethod
+    def allocate_available_doses(drive_id, wanted):
+        """Reserve up to wanted doses atomically, returning how many were reserved"""
+        if wanted <= 0:
+            return 0
+
+        for _ in range(VaccinationService.ALLOCATION_ATTEMPTS):
+            remaining = db.session.query(
+                VaccinationDrive.available_doses - func.coalesce(VaccinationDrive.used_doses, 0)
+            ).filter(VaccinationDrive.id == drive_id).scalar() or 0
+
+            count = min(wanted, remaining)
+            if count <= 0:
+                return 0
+            if VaccinationService.allocate_doses(drive_id, count):
+                return count
+            # Another request took doses in between; re-read and try again
+        return 0  # Still contended after every attempt: reserve nothing rather than spin
+
+    @staticmethod
+    def insert_returning_supported():
+        """Whether the database returns generated ids from a multi-row INSERT (SQLite 3.35+, PostgreSQL)"""
+        return db.session.get_bind().dialect.insert_executemany_returning
+
+    @staticmethod
+    def record_batch(drive, student_ids, status='Completed'):
+        """Record vaccinations for many students in one drive using set-wise checks.
+
+        Returns one outcome dict per requested student id, in request order. Students,
+        eligibility and existing records are checked with a few IN queries, doses are
+        reserved with one conditional UPDATE and all records are inserted together.
+        """
+        unique_ids = list(dict.fromkeys(student_ids))
+
+        students = {}
+        already_vaccinated = set()
+        for start in range(0, len(unique_ids), LOOKUP_CHUNK_SIZE):
+            chunk = unique_ids[start:start + LOOKUP_CHUNK_SIZE]
+            students.update(db.session.query(Student.id, Student.class_name).filter(Student.id.in_(chunk)))
+            already_vaccinated.update(row[0] for row in db.session.query(VaccinationRecord.student_id).filter(
+                VaccinationRecord.drive_id == drive.id,
+                VaccinationRecord.student_id.in_(chunk)
+            ))
+
+        errors = {}
+        eligible = []
+        for student_id in unique_ids:
+            if student_id not in students:
+                errors[student_id] = 'Student not found'
+            elif not drive.is_open_to(students[student_id]):
+                errors[student_id] = f'This vaccination drive is not applicable for class {students[student_id]}'
+            elif student_id in already_vaccinated:
+                errors[student_id] = 'Student already vaccinated in this drive'
+            else:
+                eligible.append(student_id)
+
+        # Reserve doses for as many eligible students as the drive can still serve
+        allocated = VaccinationService.allocate_available_doses(drive.id, len(eligible))
+        for student_id in eligible[allocated:]:
+            errors[student_id] = 'No available doses left for this drive'
+        eligible = eligible[:allocated]
+
+        record_ids = {}
+        if eligible:
+            today = datetime.now().date()
+            now = datetime.utcnow()
+            rows = [{'student_id': student_id, 'drive_id': drive.id, 'date': today, 'status': status,
+                     'created_at': now, 'updated_at': now} for student_id in eligible]
+            if VaccinationService.insert_returning_supported():
+                inserted = db.session.execute(
+                    db.insert(VaccinationRecord).returning(VaccinationRecord.id, VaccinationRecord.student_id), rows
+                )
+                record_ids = {student_id: record_id for record_id, student_id in inserted}
+            else:
+                # Without RETURNING the ORM inserts row by row to learn the ids
+                records = [VaccinationRecord(**row) for row in rows]
+                db.session.add_all(records)
+                db.session.flush()
+                record_ids = {record.student_id: record.id for record in records}
+            StatsService.records_added(eligible)
+
+        seen = set()
+        outcomes = []
+        for student_id in student_ids:
+            if student_id in seen:
+                outcomes.append({'student_id': student_id, 'status': 'failed',
+                                 'error': 'Student listed more than once in this batch'})
+            elif student_id in record_ids:
+                outcomes.append({'student_id': student_id, 'status': 'created', 'record_id': record_ids[student_id]})
+            else:
+                outcomes.append({'student_id': student_id, 'status': 'failed', 'error': errors[student_id]})
+            seen.add(student_id)
+
+        return outcomes
+
     @staticmethod
     def update_drive_status(drive_id=None):
         """Update vaccination drive status based on date"""
-        today = datetime.now().date()
-
-        if drive_id:
-            drives = [VaccinationDrive.query.get(drive_id)]
-        else:
-            drives = VaccinationDrive.query.filter(
-                VaccinationDrive.status != 'Cancelled'
-            ).all()
-
-        for drive in drives:
-            if drive:
-                if drive.date < today and drive.status == 'Scheduled':
-                    drive.status = 'Completed'
-                elif drive.date > today and drive.status == 'Completed':
-                    drive.status = 'Scheduled'
-
-        db.session.commit()
\ No newline at end of file
+        return DriveStatusService.reconcile(drive_id)
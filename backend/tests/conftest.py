@@ -0,0 +1,136 @@
+import itertools
+import os
+import tempfile
+from datetime import date, timedelta
+import pytest
+
+# Configure the app before config.py is imported: a throwaway database with a
+# SQLite replica whose lag is probed on every request, strict query budgets so
+# overruns fail the request, and no scheduler work
+TEST_DIR = tempfile.mkdtemp(prefix='vaccination_tests_')
+os.environ.update({
+    'DATABASE_URI': f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}",
+    'JWT_SECRET_KEY': 'test-only-jwt-secret-key-32-bytes',
+    'REPLICA_DATABASE_URI': f"sqlite:///{os.path.join(TEST_DIR, 'replica.db')}",
+    'REPLICA_LAG_CHECK_INTERVAL': '0',
+    'REPLICA_HEARTBEAT_INTERVAL': '0',
+    'QUERY_BUDGET_STRICT': 'true',
+    'DRIVE_STATUS_INTERVAL': '0',
+    'BULK_IMPORT_UPLOAD_DIR': os.path.join(TEST_DIR, 'imports'),
+})
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from app import create_app  # noqa: E402
+
+STUDENTS = 30
+CLASSES = ['5', '6', '7']
+# Days ahead for drives created by tests, one date each so they never compete for a slot
+DRIVE_DAYS = itertools.count(100)
+STUDENT_NUMBERS = itertools.count(1)
+
+
+def seed(db):
+    """Enough rows per table that an N+1 query shows up as extra statements"""
+    from models import Student, VaccinationDrive, VaccinationRecord
+    from services.stats_service import StatsService
+
+    today = date.today()
+    students = [
+        Student(student_id=f'ST{i:03d}', name=f'Student {i}', class_name=CLASSES[i % len(CLASSES)],
+                section='AB'[i % 2], age=10 + i % 5, gender=['Male', 'Female'][i % 2])
+        for i in range(1, STUDENTS + 1)
+    ]
+    drives = [
+        VaccinationDrive(vaccine_name=f'Vaccine {i}', date=today + timedelta(days=offset),
+                         available_doses=100, used_doses=0, applicable_classes=CLASSES[:2],
+                         status='Completed' if offset < 0 else 'Scheduled')
+        for i, offset in enumerate([-20, -10, 5, 20, 40])
+    ]
+    db.session.add_all(students + drives)
+    db.session.flush()
+
+    for drive in drives[:3]:
+        for student in students[::2]:
+            db.session.add(VaccinationRecord(student_id=student.id, drive_id=drive.id, date=drive.date))
+            drive.used_doses += 1
+    db.session.commit()
+    StatsService.rebuild()
+
+
+@pytest.fixture(scope='session')
+def app():
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        from models import db
+        from services.replica_service import ReplicaService
+        seed(db)
+        ReplicaService.sync('default')
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture(scope='session')
+def auth_headers(app):
+    with app.app_context():
+        token = create_access_token(identity='1', additional_claims={'school': 'default'})
+    return {'Authorization': f'Bearer {token}'}
+
+
+@pytest.fixture
+def make_drive(client, auth_headers):
+    """Create a drive through the API on a date no other test uses and return its JSON"""
+    def make(available_doses=10, applicable_classes=CLASSES, vaccine_name='Test Vaccine'):
+        response = client.post('/api/drives', headers=auth_headers, json={
+            'vaccine_name': vaccine_name,
+            'date': (date.today() + timedelta(days=next(DRIVE_DAYS))).isoformat(),
+            'available_doses': available_doses,
+            'applicable_classes': list(applicable_classes)
+        })
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()
+    return make
+
+
+@pytest.fixture
+def make_student(client, auth_headers):
+    """Create a student through the API and return its JSON"""
+    def make(class_name='5', **fields):
+        number = next(STUDENT_NUMBERS)
+        response = client.post('/api/students', headers=auth_headers, json={
+            'student_id': f'NEW{number:04d}', 'name': f'New Student {number}',
+            'class_name': class_name, 'section': 'A', **fields
+        })
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()
+    return make
+
+
+@pytest.fixture
+def assert_counters_match(app):
+    """Check that the maintained counters equal a fresh aggregate over the base tables"""
+    from services.stats_service import StatsService
+    from utils.tenancy import tenant_context
+
+    def check():
+        with tenant_context(app, 'default'):
+            assert StatsService.get_counters() == StatsService.compute()
+    check()
+    return check
+
+
+@pytest.fixture(params=[
+    pytest.param(True, id='orjson'),
+    pytest.param(False, id='stdlib'),
+])
+def use_orjson(request, app, monkeypatch):
+    """Run the test once with orjson (when installed) and once with the standard library encoder"""
+    from utils.json_provider import orjson
+    if request.param and orjson is None:
+        pytest.skip('orjson is not installed')
+    monkeypatch.setattr(app.json, 'use_orjson', request.param)
+    return request.param
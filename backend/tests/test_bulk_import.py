@@ -0,0 +1,155 @@
+import io
+import itertools
+import os
+import time
+from datetime import datetime, timedelta
+from models import db, ImportJob, Student
+from services.import_job_service import ImportJobService
+from services.student_service import StudentService
+from utils.tenancy import tenant_context
+
+BATCHES = itertools.count(1)
+
+
+def csv_file(rows, header='student_id,name,class_name,section,age,gender'):
+    return io.BytesIO(('\n'.join([header] + rows) + '\n').encode())
+
+
+def new_ids(count):
+    """Student IDs no other import in the session uses"""
+    batch = next(BATCHES)
+    return [f'BI{batch:02d}{i:04d}' for i in range(count)]
+
+
+def import_rows(app, rows, header=None, **kwargs):
+    with tenant_context(app, 'default'):
+        file = csv_file(rows, header) if header else csv_file(rows)
+        return StudentService.process_bulk_import(file, **kwargs)
+
+
+def stored_ages(app, student_ids):
+    with tenant_context(app, 'default'):
+        return dict(db.session.query(Student.student_id, Student.age).filter(Student.student_id.in_(student_ids)))
+
+
+def test_row_errors_are_reported_and_valid_rows_imported(app):
+    ok, whole, blank_age, dup, bad_age, fraction, missing = new_ids(7)
+    result, status = import_rows(app, [
+        f'{ok},Valid,5,A,11,Male',
+        f'{whole},Whole Float,5,A,12.0,Female',
+        f'{blank_age},No Age,6,B,,',
+        f'{ok},Again,5,A,11,Male',
+        f'{bad_age},Bad Age,5,A,eleven,Male',
+        f'{fraction},Fraction,5,A,11.6,Male',
+        f'{missing},,5,,10,Male',
+        'ST001,Existing,5,A,10,Male',
+    ])
+
+    assert status == 200
+    assert result['success_count'] == 3
+    assert result['errors'] == [
+        f'Row 4: Student ID {ok} is duplicated in the file',
+        'Row 5: Invalid age eleven',
+        'Row 6: Invalid age 11.6',
+        'Row 7: Missing required field(s): name, section',
+        'Row 8: Student ID ST001 already exists',
+    ]
+    assert stored_ages(app, [ok, whole, blank_age, dup, bad_age, fraction, missing]) == {
+        ok: 11, whole: 12, blank_age: None
+    }
+
+
+def test_missing_columns_reject_the_file(app):
+    result, status = import_rows(app, ['X1,Name,5'], header='student_id,name,class_name')
+    assert status == 400
+    assert result['error'] == 'Missing required columns: section'
+
+
+def test_chunked_import_commits_each_chunk(app):
+    ids = new_ids(5)
+    progress = []
+    result, status = import_rows(app, [f'{student_id},Chunked,7,A,9,Female' for student_id in ids],
+                                 chunk_size=2, progress_callback=progress.append)
+
+    assert status == 200
+    assert (result['chunks_processed'], result['success_count'], result['error_count']) == (3, 5, 0)
+    assert [update['rows_processed'] for update in progress] == [2, 4, 5]
+    assert set(stored_ages(app, ids)) == set(ids)
+
+
+def test_chunked_import_caps_error_messages(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'BULK_IMPORT_MAX_ERRORS', 3)
+    result, status = import_rows(app, [f'{student_id},,5,A,9,' for student_id in new_ids(10)], chunk_size=4)
+
+    assert status == 200
+    assert result['error_count'] == 10
+    assert len(result['errors']) == 3
+
+
+def wait_for_job(client, auth_headers, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f'/api/students/bulk/{job_id}', headers=auth_headers).get_json()
+        if job['status'] in ('Completed', 'Failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f'import job {job_id} did not finish')
+
+
+def test_bulk_import_job_lifecycle(app, client, auth_headers):
+    first, second = new_ids(2)
+    response = client.post('/api/students/bulk', headers=auth_headers, content_type='multipart/form-data', data={
+        'file': (csv_file([f'{first},Queued One,5,A,10,Male', f'{second},,5,A,10,Male']), 'students.csv')
+    })
+    assert response.status_code == 202
+    assert response.get_json()['status'] == 'Queued'
+
+    job = wait_for_job(client, auth_headers, response.get_json()['job_id'])
+
+    assert job['status'] == 'Completed'
+    assert (job['rows_processed'], job['success_count'], job['error_count']) == (2, 1, 1)
+    assert job['errors'] == ['Row 2: Missing required field(s): name']
+    assert job['finished_at'] is not None
+    assert set(stored_ages(app, [first, second])) == {first}
+    with tenant_context(app, 'default'):
+        assert not os.path.exists(ImportJob.query.get(job['job_id']).file_path)
+
+
+def test_bulk_import_rejects_non_csv(client, auth_headers):
+    response = client.post('/api/students/bulk', headers=auth_headers, content_type='multipart/form-data',
+                           data={'file': (io.BytesIO(b'x'), 'students.txt')})
+    assert response.status_code == 400
+
+
+def test_recovery_only_takes_orphaned_jobs(app, client, auth_headers, tmp_path):
+    student_id, = new_ids(1)
+    upload = tmp_path / 'waiting.csv'
+    upload.write_bytes(csv_file([f'{student_id},Recovered,5,A,10,Male']).getvalue())
+    stale = datetime.utcnow() - timedelta(seconds=app.config['BULK_IMPORT_LEASE_TIMEOUT'] + 60)
+
+    with tenant_context(app, 'default'):
+        jobs = {
+            'interrupted': ImportJob(filename='a.csv', status='Running', heartbeat_at=stale),
+            'waiting': ImportJob(filename='b.csv', status='Queued', heartbeat_at=stale, file_path=str(upload)),
+            'file_gone': ImportJob(filename='c.csv', status='Queued', heartbeat_at=None,
+                                   file_path=str(tmp_path / 'missing.csv')),
+            'alive': ImportJob(filename='d.csv', status='Running', heartbeat_at=datetime.utcnow()),
+        }
+        db.session.add_all(jobs.values())
+        db.session.commit()
+        job_ids = {name: job.id for name, job in jobs.items()}
+
+        assert ImportJobService.recover_jobs(app) == 3
+        # A second pass finds nothing left to take over
+        assert ImportJobService.recover_jobs(app) == 0
+
+    assert wait_for_job(client, auth_headers, job_ids['waiting'])['status'] == 'Completed'
+    assert set(stored_ages(app, [student_id])) == {student_id}
+
+    with tenant_context(app, 'default'):
+        statuses = {name: db.session.get(ImportJob, job_id) for name, job_id in job_ids.items()}
+        assert statuses['interrupted'].status == 'Failed'
+        assert statuses['interrupted'].message == 'Import interrupted by server restart'
+        assert statuses['file_gone'].status == 'Failed'
+        assert statuses['file_gone'].message == 'Uploaded file is no longer available'
+        assert statuses['alive'].status == 'Running'
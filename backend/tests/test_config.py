@@ -0,0 +1,20 @@
+import pytest
+from config import database_binds, engine_options_for
+
+OPTIONS = {'pool_size': 10, 'max_overflow': 20, 'pool_recycle': 1800, 'pool_pre_ping': True}
+
+
+@pytest.mark.parametrize('uri', ['sqlite://', 'sqlite:///:memory:', 'sqlite:///file:db?mode=memory&uri=true'])
+def test_in_memory_sqlite_drops_pool_sizing(uri):
+    assert engine_options_for(uri, OPTIONS) == {'pool_recycle': 1800, 'pool_pre_ping': True}
+
+
+@pytest.mark.parametrize('uri', ['sqlite:///portal.db', 'postgresql://user@localhost/portal'])
+def test_pooled_engines_keep_pool_sizing(uri):
+    assert engine_options_for(uri, OPTIONS) == OPTIONS
+
+
+def test_binds_carry_engine_options():
+    binds = database_binds('replica', {'default': 'sqlite:///replica.db', 'north': 'sqlite://'}, OPTIONS)
+    assert binds['replica:default'] == {'url': 'sqlite:///replica.db', **OPTIONS}
+    assert 'pool_size' not in binds['replica:north']
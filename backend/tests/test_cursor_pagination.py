@@ -0,0 +1,81 @@
+import pytest
+
+
+def walk(client, auth_headers, url, key, per_page, cursor=lambda body: {'after': body['next_after']}, **filters):
+    """Follow next cursors from the first page to the last, returning every row and the number of pages"""
+    rows, pages, params = [], 0, {'after': ''}
+    while True:
+        response = client.get(url, headers=auth_headers, query_string={**filters, **params, 'per_page': per_page})
+        assert response.status_code == 200
+        body = response.get_json()
+        rows.extend(body[key])
+        pages += 1
+        if not body['has_more']:
+            assert body['next_after'] is None
+            return rows, pages
+        params = cursor(body)
+
+
+@pytest.mark.parametrize('per_page', [1, 7, 30, 100])
+def test_student_cursor_visits_every_student_once(client, auth_headers, per_page):
+    total = client.get('/api/students?per_page=1', headers=auth_headers).get_json()['total']
+
+    students, pages = walk(client, auth_headers, '/api/students', 'students', per_page)
+
+    ids = [student['id'] for student in students]
+    assert ids == sorted(set(ids))
+    assert len(ids) == total
+    assert pages == max(1, -(-total // per_page))
+
+
+def test_student_cursor_page_boundaries(client, auth_headers):
+    ids = [student['id'] for student in walk(client, auth_headers, '/api/students', 'students', 100)[0]]
+
+    exact = client.get(f'/api/students?after={ids[-4]}&per_page=3', headers=auth_headers).get_json()
+    assert [student['id'] for student in exact['students']] == ids[-3:]
+    assert exact['has_more'] is False and exact['next_after'] is None
+
+    short = client.get(f'/api/students?after={ids[-4]}&per_page=2', headers=auth_headers).get_json()
+    assert [student['id'] for student in short['students']] == ids[-3:-1]
+    assert short['has_more'] is True and short['next_after'] == ids[-2]
+
+    past_end = client.get(f'/api/students?after={ids[-1]}', headers=auth_headers).get_json()
+    assert past_end['students'] == [] and past_end['has_more'] is False
+
+
+def test_student_cursor_with_search_filters_in_id_order(client, auth_headers):
+    students, _ = walk(client, auth_headers, '/api/students', 'students', 4, search='student')
+    ids = [student['id'] for student in students]
+    assert ids == sorted(ids)
+    assert len(ids) == client.get('/api/students?search=student&per_page=1', headers=auth_headers).get_json()['total']
+
+
+def test_drive_cursor_visits_every_drive_once(client, auth_headers):
+    total = client.get('/api/drives?per_page=1', headers=auth_headers).get_json()['total']
+
+    drives, _ = walk(client, auth_headers, '/api/drives', 'drives', 2,
+                     cursor=lambda body: {'after': body['next_after'], 'after_date': body['next_after_date']})
+
+    keys = [(drive['date'], drive['id']) for drive in drives]
+    assert keys == sorted(set(keys), reverse=True)
+    assert len(keys) == total
+
+
+def test_eligible_cursor_visits_every_eligible_student_once(client, auth_headers):
+    students, _ = walk(client, auth_headers, '/api/drives/1/eligible-students', 'students', 4)
+
+    ids = [student['id'] for student in students]
+    assert ids == sorted(set(ids))
+    assert {student['class_name'] for student in students} <= {'5', '6'}
+
+
+@pytest.mark.parametrize('url', [
+    '/api/students?after=abc',
+    '/api/students?after=1.5',
+    '/api/drives/1/eligible-students?after=abc',
+    '/api/drives?after=abc&after_date=2026-01-01',
+    '/api/drives?after=3',
+    '/api/drives?after=3&after_date=yesterday',
+])
+def test_malformed_cursor_is_rejected(client, auth_headers, url):
+    assert client.get(url, headers=auth_headers).status_code == 400
@@ -0,0 +1,46 @@
+import io
+from services.student_service import StudentService
+from utils.tenancy import tenant_context
+
+
+def test_counters_follow_students_and_records(client, auth_headers, make_drive, make_student, assert_counters_match):
+    first_drive, second_drive = make_drive(), make_drive()
+    student = make_student()
+    assert_counters_match()
+
+    records = []
+    for drive in (first_drive, second_drive):
+        response = client.post('/api/vaccinations', headers=auth_headers,
+                               json={'student_id': student['id'], 'drive_id': drive['id']})
+        assert response.status_code == 201
+        records.append(response.get_json()['id'])
+        assert_counters_match()
+
+    for record_id in records:
+        assert client.delete(f'/api/vaccinations/{record_id}', headers=auth_headers).status_code == 200
+        assert_counters_match()
+
+    assert client.delete(f"/api/students/{student['id']}", headers=auth_headers).status_code == 200
+    assert_counters_match()
+
+
+def test_counters_follow_batch_recording(client, auth_headers, make_drive, make_student, assert_counters_match):
+    drive = make_drive()
+    already_vaccinated = make_student()
+    client.post('/api/vaccinations', headers=auth_headers,
+                json={'student_id': already_vaccinated['id'], 'drive_id': make_drive()['id']})
+    students = [already_vaccinated] + [make_student() for _ in range(3)]
+
+    response = client.post('/api/vaccinations/batch', headers=auth_headers,
+                           json={'drive_id': drive['id'], 'student_ids': [student['id'] for student in students]})
+    assert response.get_json()['created_count'] == 4
+    assert_counters_match()
+
+
+def test_counters_follow_bulk_import(app, client, auth_headers, assert_counters_match):
+    rows = '\n'.join(f'DC{i:03d},Imported {i},5,A,10,Male' for i in range(5))
+    csv_file = io.BytesIO(f'student_id,name,class_name,section,age,gender\n{rows}\nDC000,Duplicate,5,A,,\n'.encode())
+    with tenant_context(app, 'default'):
+        result, status = StudentService.process_bulk_import(csv_file, chunk_size=2)
+    assert (status, result['success_count']) == (200, 5)
+    assert_counters_match()
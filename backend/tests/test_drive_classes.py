@@ -0,0 +1,100 @@
+import pytest
+from models import db, DriveClass, VaccinationDrive
+from utils.tenancy import tenant_context
+
+
+def drive_class_rows(app, drive_id):
+    with tenant_context(app, 'default'):
+        return sorted(name for name, in db.session.query(DriveClass.class_name).filter_by(drive_id=drive_id))
+
+
+def listed_ids(client, auth_headers, url, key, **args):
+    body = client.get(url, headers=auth_headers, query_string={**args, 'per_page': 1000}).get_json()
+    return {item['id'] for item in body[key]}
+
+
+@pytest.mark.parametrize('classes, open_to, closed_to', [
+    (['5'], ['5'], ['6', '50', '']),
+    (['KG', '10'], ['KG', '10'], ['kg', '1']),
+    ([], ['5', 'KG', ''], []),
+])
+def test_is_open_to(app, classes, open_to, closed_to):
+    with app.app_context():
+        drive = VaccinationDrive(vaccine_name='Unsaved', applicable_classes=classes)
+        assert all(drive.is_open_to(name) for name in open_to)
+        assert not any(drive.is_open_to(name) for name in closed_to)
+
+
+def test_classes_are_stored_as_rows(app, make_drive):
+    drive = make_drive(applicable_classes=['6', ' 5', '5', 'KG', '10', ''])
+
+    # Trimmed, de-duplicated, numeric classes in numeric order before named ones
+    assert drive['applicable_classes'] == ['5', '6', '10', 'KG']
+    assert drive_class_rows(app, drive['id']) == ['10', '5', '6', 'KG']
+
+
+def test_classes_accept_a_comma_separated_string(client, auth_headers, make_drive):
+    drive = make_drive()
+    response = client.put(f"/api/drives/{drive['id']}", headers=auth_headers,
+                          json={'applicable_classes': '7, 5,,7'})
+    assert response.status_code == 200
+    assert response.get_json()['applicable_classes'] == ['5', '7']
+
+
+def test_updating_classes_replaces_rows_and_bumps_updated_at(app, client, auth_headers, make_drive):
+    drive = make_drive(applicable_classes=['5', '6'])
+    url = f"/api/drives/{drive['id']}"
+
+    # The same set in another order is not a change
+    unchanged = client.put(url, headers=auth_headers, json={'applicable_classes': ['6', '5']}).get_json()
+    assert unchanged['updated_at'] == drive['updated_at']
+
+    changed = client.put(url, headers=auth_headers, json={'applicable_classes': ['6', '7']}).get_json()
+    assert changed['applicable_classes'] == ['6', '7']
+    assert changed['updated_at'] > drive['updated_at']
+    assert drive_class_rows(app, drive['id']) == ['6', '7']
+
+    opened = client.put(url, headers=auth_headers, json={'applicable_classes': []}).get_json()
+    assert opened['applicable_classes'] == []
+    assert drive_class_rows(app, drive['id']) == []
+
+
+def test_deleting_a_drive_removes_its_classes(app, client, auth_headers, make_drive):
+    drive = make_drive(applicable_classes=['5'])
+    assert client.delete(f"/api/drives/{drive['id']}", headers=auth_headers).status_code == 200
+    assert drive_class_rows(app, drive['id']) == []
+
+
+def test_drive_listing_filters_by_class(client, auth_headers, make_drive):
+    for_five, for_six, for_all = (make_drive(applicable_classes=['5']), make_drive(applicable_classes=['6']),
+                                  make_drive(applicable_classes=[]))
+
+    listed = listed_ids(client, auth_headers, '/api/drives', 'drives', class_name='5')
+    assert {for_five['id'], for_all['id']} <= listed
+    assert for_six['id'] not in listed
+
+
+def test_eligible_students_follow_drive_classes(client, auth_headers, make_drive, make_student):
+    in_class, other_class = make_student(class_name='5'), make_student(class_name='6')
+
+    drive = make_drive(applicable_classes=['5'])
+    students = listed_ids(client, auth_headers, f"/api/drives/{drive['id']}/eligible-students", 'students')
+    assert in_class['id'] in students and other_class['id'] not in students
+
+    open_drive = make_drive(applicable_classes=[])
+    students = listed_ids(client, auth_headers, f"/api/drives/{open_drive['id']}/eligible-students", 'students')
+    assert {in_class['id'], other_class['id']} <= students
+
+
+def test_recording_checks_drive_classes(client, auth_headers, make_drive, make_student):
+    drive, open_drive = make_drive(applicable_classes=['5']), make_drive(applicable_classes=[])
+    student = make_student(class_name='6')
+
+    response = client.post('/api/vaccinations', headers=auth_headers,
+                           json={'student_id': student['id'], 'drive_id': drive['id']})
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'This vaccination drive is not applicable for class 6'
+
+    response = client.post('/api/vaccinations', headers=auth_headers,
+                           json={'student_id': student['id'], 'drive_id': open_drive['id']})
+    assert response.status_code == 201
@@ -0,0 +1,155 @@
+from datetime import date, timedelta
+import pytest
+from sqlalchemy.exc import IntegrityError
+from models import db, VaccinationDrive
+from services.scheduling_service import SchedulingService
+from utils.tenancy import tenant_context
+
+# Days ahead reserved for this module, away from the dates other tests book
+SCHEDULING_DAYS = iter(range(2000, 3000, 10))
+
+
+def day(offset):
+    return (date.today() + timedelta(days=offset)).isoformat()
+
+
+def post_drive(client, auth_headers, drive_date):
+    return client.post('/api/drives', headers=auth_headers, json={
+        'vaccine_name': 'Scheduling Vaccine', 'date': drive_date, 'available_doses': 5, 'applicable_classes': ['5']
+    })
+
+
+def availability(client, auth_headers, **args):
+    response = client.get('/api/drives/availability', headers=auth_headers, query_string=args)
+    return response.status_code, response.get_json()
+
+
+def test_drives_need_the_minimum_lead_time(client, auth_headers, app, monkeypatch):
+    monkeypatch.setitem(app.config, 'DRIVE_MIN_LEAD_DAYS', 1000)
+
+    response = post_drive(client, auth_headers, day(999))
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Vaccination drive must be scheduled at least 1000 days in advance'
+
+    assert post_drive(client, auth_headers, day(next(SCHEDULING_DAYS))).status_code == 201
+
+
+def test_one_drive_per_date_by_default(client, auth_headers):
+    drive_date = day(next(SCHEDULING_DAYS))
+    first = post_drive(client, auth_headers, drive_date)
+    assert first.status_code == 201
+    assert first.get_json()['slot'] == 0
+
+    second = post_drive(client, auth_headers, drive_date)
+    assert second.status_code == 400
+    assert second.get_json()['error'] == 'A vaccination drive is already scheduled for this date'
+
+
+def test_drives_take_the_lowest_free_slot(client, auth_headers, app, monkeypatch):
+    monkeypatch.setitem(app.config, 'DRIVE_SLOTS_PER_DAY', 2)
+    drive_date = day(next(SCHEDULING_DAYS))
+
+    first = post_drive(client, auth_headers, drive_date).get_json()
+    second = post_drive(client, auth_headers, drive_date).get_json()
+    assert (first['slot'], second['slot']) == (0, 1)
+
+    third = post_drive(client, auth_headers, drive_date)
+    assert third.status_code == 400
+    assert third.get_json()['error'] == 'All 2 drive slots on this date are taken'
+
+    # Deleting the first drive frees slot 0 for the next one
+    assert client.delete(f"/api/drives/{first['id']}", headers=auth_headers).status_code == 200
+    assert post_drive(client, auth_headers, drive_date).get_json()['slot'] == 0
+
+
+def test_unique_index_rejects_a_taken_slot(client, auth_headers, app, monkeypatch, assert_counters_match):
+    drive_date = day(next(SCHEDULING_DAYS))
+    assert post_drive(client, auth_headers, drive_date).status_code == 201
+
+    with tenant_context(app, 'default'):
+        db.session.add(VaccinationDrive(vaccine_name='Clash', date=date.fromisoformat(drive_date), slot=0,
+                                        available_doses=1, applicable_classes=['5']))
+        with pytest.raises(IntegrityError):
+            db.session.commit()
+        db.session.rollback()
+
+    # A request whose check ran before another booked the slot gets a conflict rather than a duplicate
+    monkeypatch.setattr(SchedulingService, 'check_date', lambda drive_date, exclude_drive_id=None: (None, 0))
+    response = post_drive(client, auth_headers, drive_date)
+    assert response.status_code == 409
+
+    # The same goes for moving a drive, even when its status changes in the same request
+    drive = post_drive(client, auth_headers, day(next(SCHEDULING_DAYS))).get_json()
+    response = client.put(f"/api/drives/{drive['id']}", headers=auth_headers,
+                          json={'date': drive_date, 'status': 'Cancelled'})
+    assert response.status_code == 409
+    with tenant_context(app, 'default'):
+        assert db.session.get(VaccinationDrive, drive['id']).status == 'Scheduled'
+    assert_counters_match()
+
+
+def test_rescheduling_checks_the_new_date(client, auth_headers):
+    taken_date, free_date = day(next(SCHEDULING_DAYS)), day(next(SCHEDULING_DAYS))
+    assert post_drive(client, auth_headers, taken_date).status_code == 201
+    drive = post_drive(client, auth_headers, day(next(SCHEDULING_DAYS))).get_json()
+
+    response = client.put(f"/api/drives/{drive['id']}", headers=auth_headers, json={'date': taken_date})
+    assert response.status_code == 400
+
+    # Keeping its own date does not count as a clash with itself
+    response = client.put(f"/api/drives/{drive['id']}", headers=auth_headers, json={'date': drive['date']})
+    assert response.status_code == 200
+    assert response.get_json()['slot'] == drive['slot']
+
+    response = client.put(f"/api/drives/{drive['id']}", headers=auth_headers, json={'date': day(1)})
+    assert response.status_code == 400
+
+    response = client.put(f"/api/drives/{drive['id']}", headers=auth_headers, json={'date': free_date})
+    assert response.status_code == 200
+    assert response.get_json()['date'] == free_date
+
+
+def test_availability_checks_a_date_and_lists_free_ones(client, auth_headers, app):
+    start = next(SCHEDULING_DAYS)
+    booked = post_drive(client, auth_headers, day(start)).get_json()
+    assert post_drive(client, auth_headers, day(start + 2)).status_code == 201
+
+    status, body = availability(client, auth_headers, date=day(start), count=3)
+    assert status == 200
+    assert body['earliest_date'] == day(app.config['DRIVE_MIN_LEAD_DAYS'])
+    assert body['slots_per_day'] == app.config['DRIVE_SLOTS_PER_DAY']
+    assert (body['date'], body['available'], body['slot']) == (day(start), False, None)
+    assert body['error'] == 'A vaccination drive is already scheduled for this date'
+    assert body['next_available_dates'] == [day(start + 1), day(start + 3), day(start + 4)]
+
+    status, body = availability(client, auth_headers, date=day(start + 1), count=1)
+    assert (body['available'], body['slot'], body['error']) == (True, 0, None)
+    assert body['next_available_dates'] == [day(start + 1)]
+
+    # A drive being rescheduled may stay on its own date
+    status, body = availability(client, auth_headers, date=day(start), count=1, exclude_drive_id=booked['id'])
+    assert (body['available'], body['slot']) == (True, booked['slot'])
+    assert body['next_available_dates'] == [day(start)]
+
+
+def test_availability_starts_no_earlier_than_the_lead_time(client, auth_headers, app):
+    lead_days = app.config['DRIVE_MIN_LEAD_DAYS']
+    status, body = availability(client, auth_headers, date=day(lead_days - 1), count=1)
+    assert status == 200
+    assert body['available'] is False
+    assert body['error'] == f'Vaccination drive must be scheduled at least {lead_days} days in advance'
+    assert body['next_available_dates'][0] >= body['earliest_date']
+
+    status, body = availability(client, auth_headers)
+    assert 'date' not in body
+    assert len(body['next_available_dates']) == 5
+    assert body['next_available_dates'][0] >= body['earliest_date']
+
+
+def test_availability_limits_and_validation(client, auth_headers):
+    assert len(availability(client, auth_headers, count=0)[1]['next_available_dates']) == 1
+    assert len(availability(client, auth_headers, count=500)[1]['next_available_dates']) == 60
+
+    status, body = availability(client, auth_headers, date='15-06-2024')
+    assert status == 400
+    assert body['error'] == 'Invalid date format. Use YYYY-MM-DD'
@@ -0,0 +1,124 @@
+import threading
+from datetime import date, timedelta
+from models import db, DriveStatusRun, VaccinationDrive
+from services.drive_status_service import DriveStatusService
+from services.stats_service import StatsService
+from utils.background import start_periodic_task
+from utils.tenancy import tenant_context
+
+# Dates far from the seeded and API-created drives, so the (date, slot) index never clashes
+PAST_DAYS = iter(range(-400, -1000, -1))
+FUTURE_DAYS = iter(range(3000, 4000))
+
+
+def add_drives(app, **statuses):
+    """Insert drives directly, bypassing the API's date checks, and return their ids by name"""
+    with tenant_context(app, 'default'):
+        drives = {}
+        for name, (status, days) in statuses.items():
+            drives[name] = VaccinationDrive(vaccine_name=name, date=date.today() + timedelta(days=next(days)),
+                                            available_doses=10, applicable_classes=['5'], status=status)
+        db.session.add_all(drives.values())
+        db.session.commit()
+        return {name: drive.id for name, drive in drives.items()}
+
+
+def drive_statuses(app, drive_ids):
+    with tenant_context(app, 'default'):
+        return {name: db.session.get(VaccinationDrive, drive_id).status for name, drive_id in drive_ids.items()}
+
+
+def test_reconcile_fixes_only_wrong_statuses(app, assert_counters_match):
+    # Start from a clean slate; earlier tests may have left drives behind
+    with tenant_context(app, 'default'):
+        DriveStatusService.reconcile()
+
+    drive_ids = add_drives(
+        app,
+        past_scheduled=('Scheduled', PAST_DAYS),
+        past_completed=('Completed', PAST_DAYS),
+        past_cancelled=('Cancelled', PAST_DAYS),
+        future_completed=('Completed', FUTURE_DAYS),
+        future_scheduled=('Scheduled', FUTURE_DAYS),
+    )
+    with tenant_context(app, 'default'):
+        StatsService.rebuild()
+        runs_before = DriveStatusRun.query.count()
+
+        run = DriveStatusService.reconcile()
+
+        assert (run.completed_count, run.reopened_count) == (1, 1)
+        assert run.duration_ms >= 0
+        assert DriveStatusRun.query.count() == runs_before + 1
+
+    assert drive_statuses(app, drive_ids) == {
+        'past_scheduled': 'Completed',
+        'past_completed': 'Completed',
+        'past_cancelled': 'Cancelled',
+        'future_completed': 'Scheduled',
+        'future_scheduled': 'Scheduled',
+    }
+    assert_counters_match()
+
+    # A second run has nothing left to change
+    with tenant_context(app, 'default'):
+        run = DriveStatusService.reconcile()
+        assert (run.completed_count, run.reopened_count) == (0, 0)
+
+
+def test_reconcile_adjusts_completed_counter(app, assert_counters_match):
+    with tenant_context(app, 'default'):
+        DriveStatusService.reconcile()
+
+    add_drives(app, first=('Scheduled', PAST_DAYS), second=('Scheduled', PAST_DAYS))
+    with tenant_context(app, 'default'):
+        StatsService.rebuild()
+        completed = StatsService.get_counters()['completed_drives']
+
+        DriveStatusService.reconcile()
+
+        assert StatsService.get_counters()['completed_drives'] == completed + 2
+    assert_counters_match()
+
+
+def test_reconcile_single_drive(app):
+    drive_ids = add_drives(app, target=('Scheduled', PAST_DAYS), other=('Scheduled', PAST_DAYS))
+
+    with tenant_context(app, 'default'):
+        run = DriveStatusService.reconcile(drive_ids['target'])
+        assert run.completed_count == 1
+    assert drive_statuses(app, drive_ids) == {'target': 'Completed', 'other': 'Scheduled'}
+
+    with tenant_context(app, 'default'):
+        DriveStatusService.reconcile(drive_ids['other'])
+
+
+def test_reconcile_shows_in_drive_listings(client, auth_headers, app):
+    drive_ids = add_drives(app, stale=('Scheduled', PAST_DAYS))
+    listed = client.get('/api/drives?status=Scheduled&per_page=1000', headers=auth_headers).get_json()
+    assert drive_ids['stale'] in {drive['id'] for drive in listed['drives']}
+
+    with tenant_context(app, 'default'):
+        DriveStatusService.reconcile()
+
+    listed = client.get('/api/drives?status=Scheduled&per_page=1000', headers=auth_headers).get_json()
+    assert drive_ids['stale'] not in {drive['id'] for drive in listed['drives']}
+
+
+def test_scheduler_is_off_when_interval_is_zero(app):
+    assert app.config['DRIVE_STATUS_INTERVAL'] == 0
+    assert DriveStatusService.start_scheduler(app) is None
+
+
+def test_periodic_task_runs_at_once_and_starts_once_per_name():
+    passes = threading.Semaphore(0)
+    thread, stop_event = start_periodic_task('test-periodic-task', 3600, passes.release)
+    try:
+        assert passes.acquire(timeout=5)
+        assert start_periodic_task('test-periodic-task', 3600, passes.release) == (thread, stop_event)
+    finally:
+        stop_event.set()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    # The second call started nothing, so there was only the first pass
+    assert not passes.acquire(blocking=False)
@@ -0,0 +1,72 @@
+import json
+from datetime import date, datetime
+import pytest
+from flask import jsonify
+from models import db, Student, VaccinationDrive, VaccinationRecord
+from utils.tenancy import tenant_context
+
+def by_id(items):
+    return {item['id']: item for item in items}
+
+
+def test_student_rows_match_to_dict(app, client, auth_headers, use_orjson):
+    listed = by_id(client.get('/api/students?per_page=1000', headers=auth_headers).get_json()['students'])
+
+    with tenant_context(app, 'default'):
+        expected = by_id(student.to_dict() for student in Student.query.filter(Student.id.in_(listed)))
+    assert listed == expected
+
+
+def test_vaccination_record_rows_match_to_dict(app, client, auth_headers, use_orjson):
+    listed = by_id(client.get('/api/vaccinations', headers=auth_headers).get_json())
+
+    with tenant_context(app, 'default'):
+        records = VaccinationRecord.query.filter(VaccinationRecord.id.in_(listed))
+        expected = by_id(record.to_dict() for record in records)
+    assert listed and listed == expected
+
+
+def test_dates_are_written_as_iso_8601(app, use_orjson):
+    values = {
+        'date': date(2024, 6, 15),
+        'datetime': datetime(2024, 6, 15, 9, 30, 0, 250),
+        'whole_second': datetime(2024, 6, 15, 9, 30),
+    }
+    with app.app_context():
+        written = json.loads(app.json.dumps(values))
+        assert jsonify(values).get_json() == written
+
+    assert written == {
+        'date': '2024-06-15',
+        'datetime': '2024-06-15T09:30:00.000250',
+        'whole_second': '2024-06-15T09:30:00',
+    }
+
+
+def test_drive_dates_match_to_dict(app, client, auth_headers, use_orjson):
+    listed = by_id(client.get('/api/drives?per_page=1000', headers=auth_headers).get_json()['drives'])
+
+    with tenant_context(app, 'default'):
+        expected = by_id(drive.to_dict() for drive in db.session.query(VaccinationDrive).filter(
+            VaccinationDrive.id.in_(listed)))
+    assert listed == expected
+
+
+def test_response_arguments_follow_jsonify(app, use_orjson):
+    with app.app_context():
+        single = jsonify({'a': 1})
+        assert single.mimetype == 'application/json'
+        assert single.get_data().endswith(b'\n')
+        assert single.get_json() == {'a': 1}
+        assert jsonify(1, 2).get_json() == [1, 2]
+        assert jsonify(a=1).get_json() == {'a': 1}
+        assert jsonify().get_json() is None
+        with pytest.raises(TypeError):
+            jsonify(1, a=1)
+        with pytest.raises(TypeError):
+            jsonify(object())
+
+
+def test_loads_accepts_bytes_and_str(app, use_orjson):
+    with app.app_context():
+        assert app.json.loads(b'{"a": [1, 2]}') == app.json.loads('{"a": [1, 2]}') == {'a': [1, 2]}
@@ -0,0 +1,42 @@
+import pytest
+from sqlalchemy import create_engine, text
+from migrations import m001_query_indexes
+from models import db
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """A database created before the unique (student_id, drive_id) index, holding duplicate records"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    db.metadata.create_all(engine, tables=[db.metadata.tables[name] for name in
+                                           ('student', 'vaccination_drive', 'vaccination_record')])
+    with engine.begin() as connection:
+        connection.execute(text('DROP INDEX uq_vaccination_record_student_drive'))
+        connection.execute(text(
+            "INSERT INTO vaccination_drive (id, school_id, vaccine_name, date, slot, available_doses, used_doses) "
+            "VALUES (1, 'default', 'A', '2026-01-01', 0, 10, 4), (2, 'default', 'B', '2026-01-02', 0, 10, 1)"
+        ))
+        connection.execute(text(
+            "INSERT INTO vaccination_record (id, school_id, student_id, drive_id, date) VALUES "
+            "(1, 'default', 7, 1, '2026-01-01'), (2, 'default', 7, 1, '2026-01-01'), "
+            "(3, 'default', 8, 1, '2026-01-01'), (4, 'default', 8, 1, '2026-01-01'), "
+            "(5, 'default', 9, 2, '2026-01-02')"
+        ))
+    return engine
+
+
+def test_duplicate_records_stop_the_migration(app, legacy_engine):
+    with app.app_context(), legacy_engine.connect() as connection:
+        with pytest.raises(m001_query_indexes.DuplicateRecordsError, match=r'2 .*: \(7, 1\), \(8, 1\)\.'):
+            m001_query_indexes.upgrade(connection)
+        assert connection.execute(text('SELECT COUNT(*) FROM vaccination_record')).scalar() == 5
+
+
+def test_dedupe_keeps_earliest_record_and_recounts_doses(app, legacy_engine, monkeypatch):
+    monkeypatch.setitem(app.config, 'DEDUPE_VACCINATION_RECORDS', True)
+    with app.app_context(), legacy_engine.begin() as connection:
+        m001_query_indexes.upgrade(connection)
+        assert connection.execute(text('SELECT id FROM vaccination_record ORDER BY id')).scalars().all() == [1, 3, 5]
+        assert connection.execute(text('SELECT used_doses FROM vaccination_drive ORDER BY id')).scalars().all() == [2, 1]
+        indexes = connection.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars().all()
+        assert 'uq_vaccination_record_student_drive' in indexes
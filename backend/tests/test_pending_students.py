@@ -0,0 +1,61 @@
+import pytest
+from utils.pagination import CursorPagination
+
+
+def walk_pending(client, auth_headers, drive_id, per_page):
+    """Follow next_cursor through a drive's pending worklist, returning its students in order"""
+    students, params = [], {}
+    while True:
+        response = client.get(f'/api/drives/{drive_id}/pending', headers=auth_headers,
+                              query_string={**params, 'per_page': per_page})
+        assert response.status_code == 200
+        body = response.get_json()
+        for group in body['groups']:
+            assert all((student['class_name'], student['section']) == (group['class_name'], group['section'])
+                       for student in group['students'])
+            students.extend(group['students'])
+        if body['next_cursor'] is None:
+            return students
+        params = {'cursor': body['next_cursor']}
+
+
+@pytest.mark.parametrize('per_page', [1, 3, 100])
+def test_pending_pages_cover_unvaccinated_eligible_students(client, auth_headers, make_drive, per_page):
+    drive = make_drive(applicable_classes=['6'])
+    eligible = client.get(f"/api/drives/{drive['id']}/eligible-students?per_page=1000",
+                          headers=auth_headers).get_json()['students']
+    vaccinated = {student['id'] for student in eligible[::3]}
+    for student_id in vaccinated:
+        response = client.post('/api/vaccinations', headers=auth_headers,
+                               json={'student_id': student_id, 'drive_id': drive['id']})
+        assert response.status_code == 201
+
+    pending = walk_pending(client, auth_headers, drive['id'], per_page)
+
+    keys = [(student['class_name'], student['section'], student['id']) for student in pending]
+    assert keys == sorted(set(keys))
+    assert {student['id'] for student in pending} == {student['id'] for student in eligible} - vaccinated
+
+    summary = client.get(f"/api/drives/{drive['id']}/pending?include_counts=true",
+                         headers=auth_headers).get_json()['summary']
+    assert sum(row['pending'] for row in summary) == len(pending)
+
+
+@pytest.mark.parametrize('values', [
+    ['6', 'A'],
+    ['6', 'A', 1, 2],
+    [{'class': '6'}, 'A', 1],
+    ['6', ['A'], 1],
+    ['6', 'A', None],
+    ['6', 'A', '1'],
+    [None, None, None],
+])
+def test_tampered_pending_cursor_is_rejected(client, auth_headers, values):
+    cursor = CursorPagination.encode_cursor(values)
+    response = client.get(f'/api/drives/1/pending?cursor={cursor}', headers=auth_headers)
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize('cursor', ['not-base64!', 'e30', CursorPagination.encode_cursor({'a': 1})])
+def test_malformed_pending_cursor_is_rejected(client, auth_headers, cursor):
+    assert client.get(f'/api/drives/1/pending?cursor={cursor}', headers=auth_headers).status_code == 400
@@ -0,0 +1,69 @@
+"""Every budgeted listing must stay within its SQL statement budget.
+
+QUERY_BUDGET_STRICT is on for the test app, so an endpoint that issues more
+statements than its @query_budget allows raises instead of answering.
+"""
+import pytest
+from sqlalchemy import event
+from models import db
+
+BUDGETED_ENDPOINTS = [
+    '/api/students',
+    '/api/students?page=2&per_page=5',
+    '/api/students?after=0&per_page=5',
+    '/api/students?after=5&per_page=5&include_count=true',
+    '/api/students?search=student',
+    '/api/students?search=T00',
+    '/api/drives',
+    '/api/drives?status=Scheduled',
+    '/api/drives?class_name=5',
+    '/api/drives?after=&per_page=2',
+    '/api/drives?after=&per_page=2&include_count=true',
+    '/api/vaccinations',
+    '/api/vaccinations?student_id=1',
+    '/api/vaccinations?drive_id=1',
+    '/api/vaccinations?stream=ndjson',
+    '/api/reports/vaccinations',
+    '/api/reports/vaccinations?class_name=5&vaccine_name=Vaccine%200',
+    '/api/reports/vaccinations?download=true',
+    '/api/dashboard/stats',
+    '/api/dashboard/upcoming-drives',
+]
+
+
+@pytest.mark.parametrize('url', BUDGETED_ENDPOINTS)
+def test_endpoint_within_query_budget(client, auth_headers, url):
+    response = client.get(url, headers=auth_headers)
+    assert response.status_code == 200, response.get_data(as_text=True)
+
+
+@pytest.mark.parametrize('url', ['/api/students', '/api/drives', '/api/vaccinations'])
+def test_conditional_get_within_query_budget(client, auth_headers, url):
+    etag = client.get(url, headers=auth_headers).headers['ETag']
+    response = client.get(url, headers={**auth_headers, 'If-None-Match': etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize('url', [
+    '/api/students?after=0&per_page=5',
+    '/api/drives?after=&per_page=2',
+    '/api/drives/1/eligible-students?per_page=5',
+    '/api/drives/1/pending?per_page=5',
+])
+def test_keyset_pages_skip_set_wide_count(app, client, auth_headers, url):
+    """Keyset pages stay O(limit): their validators come from the fetched rows, not a COUNT over the set"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lower())
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(url, headers=auth_headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    assert response.status_code == 200
+    assert not any('count(' in statement for statement in statements), statements
@@ -0,0 +1,28 @@
+"""Which reads the replica serves, and that probing it stays outside query budgets."""
+from services.replica_service import ReplicaService
+
+
+def test_listing_sees_own_write(app, client, auth_headers):
+    response = client.post('/api/students', headers=auth_headers, json={
+        'student_id': 'RW001', 'name': 'Fresh Student', 'class_name': '5', 'section': 'A'
+    })
+    assert response.status_code == 201
+
+    response = client.get('/api/students?search=RW001', headers=auth_headers)
+    assert [student['student_id'] for student in response.get_json()['students']] == ['RW001']
+
+
+def test_dashboard_reads_from_replica(app, client, auth_headers):
+    with app.app_context():
+        ReplicaService.sync('default')
+    before = client.get('/api/dashboard/stats', headers=auth_headers).get_json()['total_students']
+
+    response = client.post('/api/students', headers=auth_headers, json={
+        'student_id': 'RW002', 'name': 'Replicated Student', 'class_name': '6', 'section': 'B'
+    })
+    assert response.status_code == 201
+    assert client.get('/api/dashboard/stats', headers=auth_headers).get_json()['total_students'] == before
+
+    with app.app_context():
+        ReplicaService.sync('default')
+    assert client.get('/api/dashboard/stats', headers=auth_headers).get_json()['total_students'] == before + 1
@@ -0,0 +1,89 @@
+"""Parquet and Arrow report downloads; skipped when pyarrow is not installed."""
+import io
+import math
+import pytest
+from services.report_service import ReportService
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+REPORT = '/api/reports/vaccinations'
+DICTIONARY_COLUMNS = {'class_name', 'section', 'vaccine_name', 'status'}
+
+
+def download(client, auth_headers, export_format, **filters):
+    response = client.get(REPORT, headers=auth_headers, query_string={**filters, 'format': export_format})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    return response
+
+
+def json_report(client, auth_headers, **filters):
+    body = client.get(REPORT, headers=auth_headers, query_string={**filters, 'limit': 1000}).get_json()
+    return body['records']
+
+
+def as_records(table):
+    return [{**row, 'vaccination_date': row['vaccination_date'].isoformat()} for row in table.to_pylist()]
+
+
+def test_schema_is_typed_and_dictionary_encoded():
+    schema = ReportService.arrow_schema()
+    assert schema.names == [name for name, _ in ReportService.REPORT_COLUMNS]
+    assert schema.field('record_id').type == pa.int64()
+    assert schema.field('vaccination_date').type == pa.date32()
+    assert {field.name for field in schema if pa.types.is_dictionary(field.type)} == DICTIONARY_COLUMNS
+
+
+@pytest.mark.parametrize('batch_size', [4, 50000])
+def test_arrow_stream_matches_json_report(app, client, auth_headers, monkeypatch, batch_size):
+    monkeypatch.setitem(app.config, 'REPORT_COLUMNAR_BATCH_SIZE', batch_size)
+    expected = json_report(client, auth_headers)
+
+    response = download(client, auth_headers, 'arrow')
+    assert response.mimetype == 'application/vnd.apache.arrow.stream'
+    assert response.headers['Content-Disposition'] == 'attachment;filename=vaccination_report.arrows'
+
+    reader = pa.ipc.open_stream(response.get_data())
+    assert reader.schema == ReportService.arrow_schema()
+    batches = list(reader)
+    assert len(batches) == math.ceil(len(expected) / batch_size)
+    assert all(len(batch) <= batch_size for batch in batches)
+
+    table = pa.Table.from_batches(batches)
+    assert as_records(table) == expected
+    for name in DICTIONARY_COLUMNS:
+        # Each distinct value is stored once per batch
+        assert all(len(batch.column(name).dictionary) == len(set(batch.column(name).to_pylist()))
+                   for batch in batches)
+
+
+@pytest.mark.parametrize('batch_size', [4, 50000])
+def test_parquet_matches_json_report(app, client, auth_headers, monkeypatch, batch_size):
+    monkeypatch.setitem(app.config, 'REPORT_COLUMNAR_BATCH_SIZE', batch_size)
+    expected = json_report(client, auth_headers, class_name='5')
+
+    response = download(client, auth_headers, 'parquet', class_name='5')
+    assert response.mimetype == 'application/vnd.apache.parquet'
+    assert response.headers['Content-Disposition'] == 'attachment;filename=vaccination_report.parquet'
+
+    parquet = pq.ParquetFile(io.BytesIO(response.get_data()))
+    assert parquet.metadata.num_rows == len(expected)
+    assert parquet.metadata.num_row_groups == math.ceil(len(expected) / batch_size)
+
+    table = parquet.read()
+    assert table.schema.remove_metadata() == ReportService.arrow_schema()
+    assert as_records(table) == expected
+
+    columns = parquet.metadata.row_group(0)
+    for index, name in enumerate(parquet.schema_arrow.names):
+        column = columns.column(index)
+        assert column.compression == 'ZSTD'
+        if name in DICTIONARY_COLUMNS:
+            assert 'RLE_DICTIONARY' in column.encodings
+
+
+def test_columnar_download_without_records(client, auth_headers):
+    for export_format in ('parquet', 'arrow'):
+        response = client.get(REPORT, headers=auth_headers,
+                              query_string={'format': export_format, 'vaccine_name': 'No Such Vaccine'})
+        assert response.status_code == 404
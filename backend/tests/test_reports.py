@@ -0,0 +1,80 @@
+import pytest
+from services.report_service import ReportService
+from utils.pagination import CursorPagination
+
+
+def walk_report(client, auth_headers, limit, **filters):
+    """Follow next_cursor through the JSON report, returning every record"""
+    records, params = [], {}
+    while True:
+        response = client.get('/api/reports/vaccinations', headers=auth_headers,
+                              query_string={**filters, **params, 'limit': limit})
+        assert response.status_code == 200
+        body = response.get_json()
+        assert body['count'] == len(body['records']) <= limit
+        records.extend(body['records'])
+        if body['next_cursor'] is None:
+            return records
+        params = {'cursor': body['next_cursor']}
+
+
+@pytest.mark.parametrize('limit', [1, 4, 1000])
+def test_report_cursor_visits_every_record_once(client, auth_headers, limit):
+    total = client.get('/api/reports/vaccinations?include_count=true',
+                       headers=auth_headers).get_json()['estimated_total']
+
+    records = walk_report(client, auth_headers, limit)
+
+    keys = [(record['vaccination_date'], record['record_id']) for record in records]
+    assert keys == sorted(set(keys), reverse=True)
+    assert len(keys) == total
+
+
+def test_filtered_report_count_matches_records(client, auth_headers):
+    filters = {'class_name': '5', 'include_count': 'true'}
+    body = client.get('/api/reports/vaccinations', headers=auth_headers, query_string=filters).get_json()
+
+    records = walk_report(client, auth_headers, 3, class_name='5')
+    assert body['estimated_total'] == len(records) > 0
+    assert body['total_capped'] is False
+    assert {record['class_name'] for record in records} == {'5'}
+
+
+@pytest.mark.parametrize('filters', [{}, {'class_name': '5'}])
+def test_report_count_stops_at_cap(app, client, auth_headers, monkeypatch, filters):
+    monkeypatch.setitem(app.config, 'REPORT_COUNT_CAP', 2)
+    body = client.get('/api/reports/vaccinations', headers=auth_headers,
+                      query_string={**filters, 'include_count': 'true'}).get_json()
+    assert body['estimated_total'] == 2
+    assert body['total_capped'] is True
+
+
+def test_report_omits_count_unless_asked(client, auth_headers):
+    body = client.get('/api/reports/vaccinations', headers=auth_headers).get_json()
+    assert 'estimated_total' not in body
+
+
+@pytest.mark.parametrize('cursor', ['garbage', CursorPagination.encode_cursor(['2026-01-01']),
+                                    CursorPagination.encode_cursor(['yesterday', 1]),
+                                    CursorPagination.encode_cursor(['2026-01-01', 'one'])])
+def test_invalid_report_cursor_is_rejected(client, auth_headers, cursor):
+    response = client.get(f'/api/reports/vaccinations?cursor={cursor}', headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_unknown_export_format_is_rejected(client, auth_headers):
+    response = client.get('/api/reports/vaccinations?format=xlsx', headers=auth_headers)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Unsupported format. Use one of: csv, parquet, arrow'
+
+
+@pytest.mark.parametrize('export_format', ['parquet', 'arrow'])
+def test_columnar_export_needs_pyarrow(client, auth_headers, monkeypatch, export_format):
+    monkeypatch.setattr(ReportService, 'columnar_available', lambda: False)
+    response = client.get('/api/reports/vaccinations', headers=auth_headers, query_string={'format': export_format})
+    assert response.status_code == 501
+
+    # CSV downloads do not depend on it
+    response = client.get('/api/reports/vaccinations?format=csv', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
@@ -0,0 +1,76 @@
+"""Writes through each blueprint must invalidate the cached lookups that depend on them."""
+
+
+def get_json(client, auth_headers, url):
+    response = client.get(url, headers=auth_headers)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def upcoming_doses(client, auth_headers, drive_id):
+    drives = get_json(client, auth_headers, '/api/dashboard/upcoming-drives')
+    return next(drive['used_doses'] for drive in drives if drive['id'] == drive_id)
+
+
+def test_student_writes_invalidate_class_list(client, auth_headers, make_student):
+    assert 'Z9' not in get_json(client, auth_headers, '/api/reports/classes')
+
+    student = make_student(class_name='Z9')
+    assert 'Z9' in get_json(client, auth_headers, '/api/reports/classes')
+
+    response = client.put(f"/api/students/{student['id']}", headers=auth_headers, json={'class_name': 'Z8'})
+    assert response.status_code == 200
+    classes = get_json(client, auth_headers, '/api/reports/classes')
+    assert 'Z8' in classes and 'Z9' not in classes
+
+    assert client.delete(f"/api/students/{student['id']}", headers=auth_headers).status_code == 200
+    assert 'Z8' not in get_json(client, auth_headers, '/api/reports/classes')
+
+
+def test_drive_writes_invalidate_vaccine_list(client, auth_headers, make_drive):
+    assert 'Cache Vaccine' not in get_json(client, auth_headers, '/api/reports/vaccines')
+
+    drive = make_drive(vaccine_name='Cache Vaccine')
+    assert 'Cache Vaccine' in get_json(client, auth_headers, '/api/reports/vaccines')
+
+    response = client.put(f"/api/drives/{drive['id']}", headers=auth_headers, json={'vaccine_name': 'Renamed Vaccine'})
+    assert response.status_code == 200
+    vaccines = get_json(client, auth_headers, '/api/reports/vaccines')
+    assert 'Renamed Vaccine' in vaccines and 'Cache Vaccine' not in vaccines
+
+    assert client.delete(f"/api/drives/{drive['id']}", headers=auth_headers).status_code == 200
+    assert 'Renamed Vaccine' not in get_json(client, auth_headers, '/api/reports/vaccines')
+
+
+def test_record_writes_invalidate_upcoming_drives(client, auth_headers, make_student):
+    # The seeded drive five days out is open to class 5
+    drive_id = next(drive['id'] for drive in get_json(client, auth_headers, '/api/dashboard/upcoming-drives')
+                    if '5' in drive['applicable_classes'])
+    doses = upcoming_doses(client, auth_headers, drive_id)
+
+    response = client.post('/api/vaccinations', headers=auth_headers,
+                           json={'student_id': make_student()['id'], 'drive_id': drive_id})
+    assert response.status_code == 201
+    assert upcoming_doses(client, auth_headers, drive_id) == doses + 1
+
+    response = client.post('/api/vaccinations/batch', headers=auth_headers,
+                           json={'drive_id': drive_id, 'student_ids': [make_student()['id']]})
+    assert response.get_json()['created_count'] == 1
+    assert upcoming_doses(client, auth_headers, drive_id) == doses + 2
+
+    record_id = next(record['id'] for record in get_json(client, auth_headers, f'/api/vaccinations?drive_id={drive_id}'))
+    assert client.delete(f'/api/vaccinations/{record_id}', headers=auth_headers).status_code == 200
+    assert upcoming_doses(client, auth_headers, drive_id) == doses + 1
+
+
+def test_failed_write_keeps_cache(app, client, auth_headers):
+    get_json(client, auth_headers, '/api/reports/classes')
+    cache = app.extensions['response_cache']
+
+    def tag_versions():
+        return {key: value for key, value in cache.entries.items() if key.startswith('tag:')}
+
+    before = tag_versions()
+    response = client.post('/api/students', headers=auth_headers, json={'name': 'No ID'})
+    assert response.status_code == 400
+    assert tag_versions() == before
@@ -0,0 +1,60 @@
+import pytest
+from models import db, Student
+from services.search_service import SearchService
+from utils.tenancy import tenant_context
+
+
+def search(client, auth_headers, term):
+    response = client.get('/api/students', headers=auth_headers, query_string={'search': term, 'per_page': 1000})
+    assert response.status_code == 200
+    return [student['student_id'] for student in response.get_json()['students']]
+
+
+def test_search_indexes_are_present(app):
+    with app.app_context():
+        assert SearchService.indexes() == {'student_fts', 'student_id_trigram'}
+
+
+@pytest.mark.parametrize('term', ['1', '21', '021', 'T02'])
+def test_student_id_matches_by_substring(client, auth_headers, term):
+    # ST021 ("Student 21") only contains these terms inside its ID
+    assert 'ST021' in search(client, auth_headers, term)
+
+
+def test_short_search_escapes_like_wildcards(client, auth_headers):
+    # Unescaped, T_ would match every ST0.. ID
+    assert search(client, auth_headers, 'T_') == []
+
+
+def test_name_words_match_by_prefix(client, auth_headers):
+    results = search(client, auth_headers, 'stud 2')
+    assert {'ST002', 'ST020', 'ST029'} <= set(results)
+    assert 'ST013' not in results
+
+
+def test_best_match_comes_first(client, auth_headers, make_student):
+    longer = make_student(name='Alpha Beta Gamma Delta Zorilla')
+    exact = make_student(name='Zorilla')
+
+    assert search(client, auth_headers, 'zorilla') == [exact['student_id'], longer['student_id']]
+
+
+def test_index_follows_insert_update_and_delete(app, client, auth_headers, make_student):
+    student = make_student(name='Marmoset Original')
+    assert search(client, auth_headers, 'marmoset') == [student['student_id']]
+
+    response = client.put(f"/api/students/{student['id']}", headers=auth_headers, json={'name': 'Tamarin Renamed'})
+    assert response.status_code == 200
+    assert search(client, auth_headers, 'marmoset') == []
+    assert search(client, auth_headers, 'tamarin') == [student['student_id']]
+
+    # Student IDs are not editable through the API, but the triggers cover any UPDATE
+    with tenant_context(app, 'default'):
+        Student.query.filter_by(id=student['id']).update({'student_id': 'QZ9999'})
+        db.session.commit()
+    assert search(client, auth_headers, 'Z99') == ['QZ9999']
+    assert search(client, auth_headers, student['student_id']) == []
+
+    assert client.delete(f"/api/students/{student['id']}", headers=auth_headers).status_code == 200
+    assert search(client, auth_headers, 'tamarin') == []
+    assert search(client, auth_headers, 'Z99') == []
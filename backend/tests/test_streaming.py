@@ -0,0 +1,85 @@
+import json
+import pytest
+from utils.streaming import NDJSON_MIMETYPE, generate_json, requested_stream_format
+
+REPORT = '/api/reports/vaccinations'
+RECORDS = '/api/vaccinations'
+
+
+def ndjson_lines(response):
+    body = response.get_data(as_text=True)
+    assert body == '' or body.endswith('\n')
+    return [json.loads(line) for line in body.splitlines()]
+
+
+def report_records(client, auth_headers, **filters):
+    body = client.get(REPORT, headers=auth_headers, query_string={**filters, 'limit': 1000}).get_json()
+    assert body['next_cursor'] is None
+    return body['records']
+
+
+@pytest.mark.parametrize('batch_size', [1, 2, 1000])
+def test_streamed_report_matches_json_report(app, client, auth_headers, monkeypatch, use_orjson, batch_size):
+    monkeypatch.setitem(app.config, 'REPORT_STREAM_BATCH_SIZE', batch_size)
+    expected = report_records(client, auth_headers)
+    assert len(expected) > 2
+
+    response = client.get(REPORT, headers=auth_headers, query_string={'stream': 'json'})
+    assert response.mimetype == 'application/json'
+    assert response.is_streamed
+    assert json.loads(response.get_data(as_text=True)) == expected
+
+    response = client.get(REPORT, headers=auth_headers, query_string={'stream': 'ndjson'})
+    assert response.mimetype == NDJSON_MIMETYPE
+    assert ndjson_lines(response) == expected
+
+
+@pytest.mark.parametrize('batch_size', [1, 1000])
+def test_streamed_records_match_listing(app, client, auth_headers, monkeypatch, use_orjson, batch_size):
+    monkeypatch.setitem(app.config, 'REPORT_STREAM_BATCH_SIZE', batch_size)
+    expected = client.get(RECORDS, headers=auth_headers).get_json()
+
+    response = client.get(RECORDS, headers=auth_headers, query_string={'stream': 'true'})
+    assert json.loads(response.get_data(as_text=True)) == expected
+
+    response = client.get(RECORDS, headers={**auth_headers, 'Accept': NDJSON_MIMETYPE})
+    assert response.mimetype == NDJSON_MIMETYPE
+    assert ndjson_lines(response) == expected
+
+
+def test_empty_streams_are_well_formed(client, auth_headers, use_orjson):
+    filters = {'vaccine_name': 'No Such Vaccine'}
+
+    response = client.get(REPORT, headers=auth_headers, query_string={**filters, 'stream': 'json'})
+    assert response.get_data(as_text=True) == '[]\n'
+
+    response = client.get(REPORT, headers=auth_headers, query_string={**filters, 'stream': 'ndjson'})
+    assert response.status_code == 200
+    assert response.get_data(as_text=True) == ''
+
+
+def test_array_framing_skips_empty_batches(app, use_orjson):
+    with app.app_context():
+        chunks = list(generate_json(iter([[], [{'a': 1}], [], [{'a': 2}, {'a': 3}], []]), 'json'))
+        assert json.loads(''.join(chunks)) == [{'a': 1}, {'a': 2}, {'a': 3}]
+        assert chunks[0] == '[' and chunks[-1] == ']\n'
+
+        lines = ''.join(generate_json(iter([[{'a': 1}], [], [{'a': 2}]]), 'ndjson'))
+        assert lines.endswith('\n')
+        assert [json.loads(line) for line in lines.splitlines()] == [{'a': 1}, {'a': 2}]
+
+
+@pytest.mark.parametrize('args, accept, expected', [
+    ({}, None, None),
+    ({'stream': 'ndjson'}, None, 'ndjson'),
+    ({'stream': 'NDJSON'}, None, 'ndjson'),
+    ({}, NDJSON_MIMETYPE, 'ndjson'),
+    ({'stream': 'json'}, None, 'json'),
+    ({'stream': 'true'}, None, 'json'),
+    ({'stream': 'false'}, None, None),
+    ({}, 'application/json', None),
+])
+def test_requested_stream_format(app, args, accept, expected):
+    headers = {'Accept': accept} if accept else {}
+    with app.test_request_context('/', query_string=args, headers=headers):
+        assert requested_stream_format() == expected
@@ -0,0 +1,124 @@
+import io
+import itertools
+import time
+import pytest
+from models import db, Student
+from services.student_service import StudentService
+from services.suggest_service import StudentSuggestIndex
+from utils.tenancy import tenant_context
+
+# Prefixes no other test's student IDs or names start with
+PREFIXES = (f'SG{n:02d}' for n in itertools.count(1))
+
+
+def suggest(client, auth_headers, q, limit=10):
+    response = client.get('/api/students/suggest', headers=auth_headers, query_string={'q': q, 'limit': limit})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def suggested_ids(client, auth_headers, q):
+    return [row['student_id'] for row in suggest(client, auth_headers, q, 50)]
+
+
+@pytest.fixture
+def built_index(client, auth_headers):
+    """Make sure the index is built, so writes update it instead of waiting for the first lookup"""
+    suggest(client, auth_headers, 'ST')
+
+
+def row(pk, student_id, name):
+    return {'id': pk, 'student_id': student_id, 'name': name, 'class_name': '5', 'section': 'A'}
+
+
+def test_index_matches_ids_first_then_names():
+    index = StudentSuggestIndex()
+    index.build([row(1, 'AB100', 'Zed Able'), row(2, 'ZZ200', 'Abby Stone'), row(3, 'ZZ300', 'Carl Abbot')])
+
+    assert [found['id'] for found in index.search('ab', 10)] == [1, 3, 2]
+    assert [found['id'] for found in index.search('ab', 2)] == [1, 3]
+    # Every word after the first is a key too, and a student is listed once
+    assert [found['id'] for found in index.search('stone', 10)] == [2]
+    assert [found['id'] for found in index.search('abby stone', 10)] == [2]
+    assert index.search('xyz', 10) == []
+
+
+def test_index_upsert_merge_and_remove():
+    index = StudentSuggestIndex()
+    index.build([row(1, 'AA1', 'First Name'), row(2, 'AA2', 'Second Name')])
+
+    index.upsert([row(1, 'AA1', 'Renamed Person')])
+    assert index.search('first', 10) == []
+    assert [found['name'] for found in index.search('renamed', 10)] == ['Renamed Person']
+
+    index.merge([row(2, 'AA2', 'Merged Again'), row(3, 'AA3', 'Brand New')])
+    assert index.search('second', 10) == []
+    assert [found['id'] for found in index.search('aa', 10)] == [1, 2, 3]
+    assert [found['id'] for found in index.search('brand', 10)] == [3]
+
+    index.remove(1)
+    assert [found['id'] for found in index.search('aa', 10)] == [2, 3]
+    assert sorted(index.students) == [2, 3]
+    # The key arrays stay sorted for bisect
+    assert index.id_keys == sorted(index.id_keys) and index.name_keys == sorted(index.name_keys)
+
+
+def test_api_writes_update_the_index(client, auth_headers, built_index):
+    prefix = next(PREFIXES)
+    response = client.post('/api/students', headers=auth_headers, json={
+        'student_id': f'{prefix}01', 'name': 'Quentin Suggestable', 'class_name': '5', 'section': 'A'
+    })
+    student = response.get_json()
+    assert suggested_ids(client, auth_headers, prefix) == [f'{prefix}01']
+    assert suggested_ids(client, auth_headers, 'suggestable') == [f'{prefix}01']
+
+    client.put(f"/api/students/{student['id']}", headers=auth_headers, json={'name': 'Quentin Renamedsuggest'})
+    assert suggested_ids(client, auth_headers, 'suggestable') == []
+    assert suggested_ids(client, auth_headers, 'renamedsuggest') == [f'{prefix}01']
+
+    client.delete(f"/api/students/{student['id']}", headers=auth_headers)
+    assert suggested_ids(client, auth_headers, prefix) == []
+    assert suggested_ids(client, auth_headers, 'renamedsuggest') == []
+
+
+@pytest.mark.parametrize('chunk_size', [None, 2])
+def test_bulk_import_merges_into_the_index(app, client, auth_headers, built_index, chunk_size):
+    prefix = next(PREFIXES)
+    ids = [f'{prefix}{i:02d}' for i in range(5)]
+    csv_file = io.BytesIO(('student_id,name,class_name,section,age,gender\n' + ''.join(
+        f'{student_id},Imported {student_id},5,A,10,Male\n' for student_id in ids)).encode())
+
+    with tenant_context(app, 'default'):
+        result, status = StudentService.process_bulk_import(csv_file, chunk_size=chunk_size)
+    assert status == 200 and result['success_count'] == 5
+
+    assert suggested_ids(client, auth_headers, prefix) == ids
+    assert suggested_ids(client, auth_headers, f'imported {prefix}01') == [ids[1]]
+
+
+def test_stale_index_is_rebuilt_in_the_background(app, client, auth_headers, built_index, monkeypatch):
+    prefix = next(PREFIXES)
+    # A write from another process does not reach this process's index
+    with tenant_context(app, 'default'):
+        db.session.add(Student(student_id=f'{prefix}01', name='Elsewhere Written', class_name='5', section='A'))
+        db.session.commit()
+    assert suggested_ids(client, auth_headers, prefix) == []
+
+    monkeypatch.setitem(app.config, 'SUGGEST_INDEX_TTL', 1)
+    index = app.extensions['student_suggest_index']['default']
+    index.built_at = time.monotonic() - 5
+
+    # The lookup that notices the age still answers from the old arrays
+    assert suggested_ids(client, auth_headers, prefix) == []
+    deadline = time.monotonic() + 5
+    while index.refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert suggested_ids(client, auth_headers, prefix) == [f'{prefix}01']
+
+
+def test_suggest_limits_and_empty_queries(client, auth_headers, built_index):
+    assert suggest(client, auth_headers, '') == []
+    assert suggest(client, auth_headers, '   ') == []
+    assert len(suggest(client, auth_headers, 'ST', limit=0)) == 1
+    assert len(suggest(client, auth_headers, 'Student', limit=500)) <= 50
+    assert set(suggest(client, auth_headers, 'ST001')[0]) == {'id', 'student_id', 'name', 'class_name', 'section'}
@@ -0,0 +1,137 @@
+"""Routing of each school's statements to its own database, using an app with two SQLite schools."""
+import pytest
+from flask import g
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, func, insert, select
+from config import Config, database_binds
+from app import create_app
+from models import db, Student, User
+from services.replica_service import ReplicaService
+from utils.replica import replica_bind_key
+from utils.tenancy import bind_key, tenant_context
+
+SCHOOLS = ('school_a', 'school_b')
+
+
+@pytest.fixture(scope='module')
+def tenant_app(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('tenants')
+    databases = {school: f"sqlite:///{directory / f'{school}.db'}" for school in SCHOOLS}
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{directory / 'default.db'}")
+        monkeypatch.setattr(Config, 'TENANT_DATABASES', databases)
+        monkeypatch.setattr(Config, 'REPLICA_DATABASES', {})
+        monkeypatch.setattr(Config, 'SQLALCHEMY_BINDS',
+                            database_binds('school', databases, Config.DATABASE_ENGINE_OPTIONS))
+        app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture(scope='module')
+def tenant_client(tenant_app):
+    return tenant_app.test_client()
+
+
+def login(client, school):
+    response = client.post('/api/auth/login', json={'username': 'admin', 'password': 'admin123', 'school': school})
+    assert response.status_code == 200
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+
+def engines(app):
+    with app.app_context():
+        return {'default': db.engines[None], **{school: db.engines[bind_key(school)] for school in SCHOOLS}}
+
+
+def student_ids(app, school):
+    with tenant_context(app, school):
+        return {student_id for student_id, in db.session.query(Student.student_id)}
+
+
+@pytest.fixture
+def statements(tenant_app):
+    """Record which school's engine runs each statement"""
+    seen = []
+    listeners = []
+    for school, engine in engines(tenant_app).items():
+        def record(conn, cursor, statement, parameters, context, executemany, school=school):
+            seen.append((school, statement))
+        event.listen(engine, 'before_cursor_execute', record)
+        listeners.append((engine, record))
+    yield seen
+    for engine, record in listeners:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def test_each_school_gets_its_own_tables_and_admin(tenant_app):
+    for school in ('default',) + SCHOOLS:
+        with tenant_context(tenant_app, school):
+            assert db.session.execute(select(func.count()).select_from(Student)).scalar() == 0
+            assert User.query.filter_by(username='admin').count() == 1
+
+
+def test_requests_reach_only_their_schools_database(tenant_app, tenant_client, statements):
+    headers = login(tenant_client, 'school_a')
+    statements.clear()
+
+    response = tenant_client.post('/api/students', headers=headers, json={
+        'student_id': 'TA001', 'name': 'School A Student', 'class_name': '5', 'section': 'A'
+    })
+    assert response.status_code == 201
+    assert tenant_client.get('/api/students', headers=headers).get_json()['total'] == 1
+
+    assert statements
+    assert {school for school, statement in statements} == {'school_a'}
+    assert student_ids(tenant_app, 'school_a') == {'TA001'}
+    assert student_ids(tenant_app, 'school_b') == set()
+    assert student_ids(tenant_app, 'default') == set()
+
+    # The same student ID can exist in another school
+    headers = login(tenant_client, 'school_b')
+    response = tenant_client.post('/api/students', headers=headers, json={
+        'student_id': 'TA001', 'name': 'School B Student', 'class_name': '6', 'section': 'B'
+    })
+    assert response.status_code == 201
+    listed = tenant_client.get('/api/students', headers=headers).get_json()['students']
+    assert [student['name'] for student in listed] == ['School B Student']
+
+
+def test_unknown_schools_are_rejected(tenant_app, tenant_client, statements):
+    response = tenant_client.post('/api/auth/login',
+                                  json={'username': 'admin', 'password': 'admin123', 'school': 'school_x'})
+    assert response.status_code == 401
+
+    # A token for a school that is not configured is refused before any query runs
+    with tenant_app.app_context():
+        token = create_access_token(identity='1', additional_claims={'school': 'school_x'})
+    statements.clear()
+    response = tenant_client.get('/api/students', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 401
+    assert response.get_json()['error'] == 'Unknown school'
+    assert statements == []
+
+
+def test_replica_views_write_to_the_primary(app):
+    """Inside a @read_replica view only SELECTs go to the replica; flushes and DML stay on the primary"""
+    with tenant_context(app, 'default'):
+        ReplicaService.sync('default')
+        replica = db.engines[replica_bind_key('default')]
+        g.read_replica = True
+
+        assert db.session.get_bind(clause=select(Student.id)) is replica
+        assert db.session.get_bind(clause=insert(Student)) is not replica
+        assert db.session.get_bind() is not replica
+
+        written = []
+
+        def record(conn, cursor, statement, *args):
+            written.append(statement)
+        event.listen(replica, 'before_cursor_execute', record)
+        try:
+            db.session.add(Student(student_id='RP001', name='Primary Only', class_name='5', section='A'))
+            db.session.flush()
+            db.session.rollback()
+        finally:
+            event.remove(replica, 'before_cursor_execute', record)
+        assert not [statement for statement in written if not statement.lstrip().upper().startswith('SELECT')]
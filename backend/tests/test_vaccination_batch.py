@@ -0,0 +1,64 @@
+import pytest
+from services.vaccination_service import VaccinationService
+
+
+def record_batch(client, auth_headers, drive_id, student_ids):
+    response = client.post('/api/vaccinations/batch', headers=auth_headers,
+                           json={'drive_id': drive_id, 'student_ids': student_ids})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+@pytest.fixture(params=[True, False], ids=['returning', 'row-by-row'])
+def insert_path(request, monkeypatch):
+    """Run a test with and without multi-row INSERT ... RETURNING, as on SQLite before 3.35"""
+    monkeypatch.setattr(VaccinationService, 'insert_returning_supported', staticmethod(lambda: request.param))
+
+
+def test_batch_reports_an_outcome_per_student(client, auth_headers, make_drive, make_student, insert_path):
+    drive = make_drive(applicable_classes=['5'])
+    fresh, vaccinated = make_student(), make_student()
+    other_class = make_student(class_name='7')
+    assert record_batch(client, auth_headers, drive['id'], [vaccinated['id']])['created_count'] == 1
+
+    body = record_batch(client, auth_headers, drive['id'],
+                        [fresh['id'], vaccinated['id'], other_class['id'], 999999, fresh['id']])
+
+    assert (body['created_count'], body['failed_count']) == (1, 4)
+    created, *failed = body['results']
+    assert created['student_id'] == fresh['id'] and created['status'] == 'created'
+    assert [(result['student_id'], result['error']) for result in failed] == [
+        (vaccinated['id'], 'Student already vaccinated in this drive'),
+        (other_class['id'], 'This vaccination drive is not applicable for class 7'),
+        (999999, 'Student not found'),
+        (fresh['id'], 'Student listed more than once in this batch'),
+    ]
+
+    records = client.get(f"/api/vaccinations?drive_id={drive['id']}", headers=auth_headers).get_json()
+    assert {record['id'] for record in records if record['student_id'] == fresh['id']} == {created['record_id']}
+
+
+def test_batch_stops_when_doses_run_out(client, auth_headers, make_drive, make_student, insert_path):
+    drive = make_drive(available_doses=3)
+    students = [make_student() for _ in range(5)]
+
+    body = record_batch(client, auth_headers, drive['id'], [student['id'] for student in students])
+
+    assert [result['status'] for result in body['results']] == ['created'] * 3 + ['failed'] * 2
+    assert {result.get('error') for result in body['results'][3:]} == {'No available doses left for this drive'}
+    assert client.get(f"/api/drives/{drive['id']}", headers=auth_headers).get_json()['used_doses'] == 3
+
+    body = record_batch(client, auth_headers, drive['id'], [students[-1]['id']])
+    assert body['results'][0]['error'] == 'No available doses left for this drive'
+
+
+@pytest.mark.parametrize('payload', [{'drive_id': 1}, {'drive_id': 1, 'student_ids': '1,2'},
+                                     {'drive_id': 1, 'student_ids': [1, 'two']}])
+def test_batch_rejects_malformed_requests(client, auth_headers, payload):
+    assert client.post('/api/vaccinations/batch', headers=auth_headers, json=payload).status_code == 400
+
+
+def test_batch_size_is_limited(app, client, auth_headers, monkeypatch):
+    monkeypatch.setitem(app.config, 'VACCINATION_BATCH_MAX_SIZE', 2)
+    response = client.post('/api/vaccinations/batch', headers=auth_headers, json={'drive_id': 1, 'student_ids': [1, 2, 3]})
+    assert response.status_code == 400
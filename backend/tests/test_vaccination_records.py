@@ -0,0 +1,71 @@
+import threading
+import pytest
+
+
+def record(client, auth_headers, student_id, drive_id):
+    return client.post('/api/vaccinations', headers=auth_headers,
+                       json={'student_id': student_id, 'drive_id': drive_id})
+
+
+def used_doses(client, auth_headers, drive_id):
+    return client.get(f'/api/drives/{drive_id}', headers=auth_headers).get_json()['used_doses']
+
+
+def test_duplicate_is_reported_even_without_doses_left(client, auth_headers, make_drive, make_student):
+    drive = make_drive(available_doses=1)
+    student = make_student()
+    assert record(client, auth_headers, student['id'], drive['id']).status_code == 201
+
+    response = record(client, auth_headers, student['id'], drive['id'])
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Student already vaccinated in this drive'
+    assert used_doses(client, auth_headers, drive['id']) == 1
+
+
+def test_no_doses_left(client, auth_headers, make_drive, make_student):
+    drive = make_drive(available_doses=1)
+    first, second = make_student(), make_student()
+    assert record(client, auth_headers, first['id'], drive['id']).status_code == 201
+
+    response = record(client, auth_headers, second['id'], drive['id'])
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'No available doses left for this drive'
+
+
+def run_concurrently(app, auth_headers, requests):
+    """Send every (student_id, drive_id) request at once from its own thread and return the status codes"""
+    barrier = threading.Barrier(len(requests))
+    statuses = []
+
+    def send(student_id, drive_id):
+        with app.test_client() as client:
+            barrier.wait()
+            statuses.append(record(client, auth_headers, student_id, drive_id).status_code)
+
+    threads = [threading.Thread(target=send, args=request) for request in requests]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(statuses)
+
+
+@pytest.mark.parametrize('doses', [1, 5])
+def test_concurrent_recording_never_overallocates(app, client, auth_headers, make_drive, make_student, doses):
+    drive = make_drive(available_doses=doses)
+    students = [make_student() for _ in range(12)]
+
+    statuses = run_concurrently(app, auth_headers, [(student['id'], drive['id']) for student in students])
+
+    assert statuses == [201] * doses + [400] * (len(students) - doses)
+    assert used_doses(client, auth_headers, drive['id']) == doses
+
+
+def test_concurrent_duplicates_take_one_dose(app, client, auth_headers, make_drive, make_student):
+    drive = make_drive(available_doses=10)
+    student = make_student()
+
+    statuses = run_concurrently(app, auth_headers, [(student['id'], drive['id'])] * 8)
+
+    assert statuses == [201] + [400] * 7
+    assert used_doses(client, auth_headers, drive['id']) == 1
@@ -0,0 +1,50 @@
+import threading
+
+
+def init_background_tasks(app, *starters):
+    """Call each starter(app) once per process, before the first request it serves.
+
+    Worker threads and job recovery belong to server processes only. CLI
+    commands such as flask migrate build the app without serving requests, so
+    they never start threads or take over other processes' import jobs, and a
+    pre-forking server starts them in each worker rather than in the master.
+    """
+    started = threading.Event()
+    lock = threading.Lock()
+
+    @app.before_request
+    def start_background_tasks():
+        if started.is_set():
+            return
+        with lock:
+            if not started.is_set():
+                for starter in starters:
+                    starter(app)
+                started.set()
+
+
+_tasks = {}
+_tasks_lock = threading.Lock()
+
+
+def start_periodic_task(name, interval, task):
+    """Run task() now and then every interval seconds on a daemon thread, once per process.
+
+    Returns the (thread, stop_event) pair; a task already started under the
+    same name is returned as is. Setting stop_event ends the loop after the
+    pass in progress.
+    """
+    with _tasks_lock:
+        if name not in _tasks:
+            stop_event = threading.Event()
+
+            def run():
+                while True:
+                    task()
+                    if stop_event.wait(interval):
+                        return
+
+            thread = threading.Thread(target=run, name=name, daemon=True)
+            thread.start()
+            _tasks[name] = (thread, stop_event)
+        return _tasks[name]
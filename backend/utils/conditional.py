@@ -0,0 +1,72 @@
+import hashlib
+from datetime import timezone
+from flask import Response, g, request
+from sqlalchemy import func
+from utils.tenancy import current_school
+
+
+def init_conditional_requests(app):
+    """Attach the validators computed by not_modified to successful responses"""
+    @app.after_request
+    def add_validators(response):
+        etag = g.get('conditional_etag')
+        if etag and response.status_code == 200:
+            response.set_etag(etag, weak=True)
+            if g.conditional_last_modified:
+                response.last_modified = g.conditional_last_modified
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            response.vary.add('Accept')
+        return response
+
+
+def not_modified(query, *timestamps, depends_on=()):
+    """Return a 304 response if the client's copy of the rows query selects is current, else None.
+
+    For endpoints that return the whole set. The validators come from one
+    aggregate over the query's row set: its row count and max() of each
+    timestamp column, so inserts, updates and deletes anywhere in the set change
+    them. depends_on adds values the response depends on outside that set, such
+    as the updated_at of a parent row. Views call this before fetching and
+    serializing; a None result means carry on as usual.
+    """
+    row = query.order_by(None).with_entities(
+        func.count(), *[func.max(column) for column in timestamps]
+    ).one()
+
+    stamps = [value for value in (*row[1:], *depends_on) if hasattr(value, 'isoformat')]
+    return _conditional_response((*row, *depends_on), max(stamps) if stamps else None)
+
+
+def page_not_modified(rows, depends_on=()):
+    """Return a 304 response if the client's copy of a page built from rows is current, else None.
+
+    For paged and keyset listings, where an aggregate over the whole set would
+    cost more than the page itself. The body is determined by the rows fetched
+    for the page, including the limit + 1 lookahead row behind has_more, so the
+    ETag hashes each row's id and updated_at and costs no query. depends_on adds
+    the page's other inputs, such as a total count. No Last-Modified is sent,
+    since a row leaving the page need not raise the newest timestamp on it.
+    """
+    values = [value for row in rows for value in (row.id, row.updated_at)]
+    return _conditional_response((*values, *depends_on), None)
+
+
+def _conditional_response(values, last_modified):
+    # The Accept header picks between JSON and NDJSON bodies for the same URL
+    fingerprint = '|'.join(str(value) for value in (
+        current_school(), request.full_path, request.headers.get('Accept', ''), *values
+    ))
+    etag = hashlib.blake2b(fingerprint.encode(), digest_size=16).hexdigest()
+    if last_modified:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+    g.conditional_etag = etag
+    g.conditional_last_modified = last_modified
+
+    response = Response(status=200)
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    response.make_conditional(request)
+    return response if response.status_code == 304 else None
@@ -0,0 +1,63 @@
+from datetime import date
+from flask import current_app
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that uses orjson when it is installed and the standard library otherwise.
+
+    Dates and datetimes are written as ISO 8601 in both cases, so serializers
+    can hand raw values from SQL rows to jsonify instead of calling isoformat().
+    """
+
+    use_orjson = orjson is not None
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def _orjson_dumps(self, obj, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        if not self.use_orjson or kwargs:
+            kwargs.setdefault('default', self.default)
+            return super().dumps(obj, **kwargs)
+        return self._orjson_dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if not self.use_orjson or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if not self.use_orjson:
+            return super().response(*args, **kwargs)
+        if args and kwargs:
+            raise TypeError('app.json.response() takes either args or kwargs, not both')
+
+        # Same argument handling as jsonify: one value as is, several as a list, keywords as a dict
+        obj = args[0] if len(args) == 1 else args or kwargs or None
+
+        # Write bytes straight into the response instead of going through a str
+        indent = (self.compact is None and current_app.debug) or self.compact is False
+        return current_app.response_class(self._orjson_dumps(obj, indent) + b'\n', mimetype=self.mimetype)
+
+
+def init_json_provider(app):
+    """Install FastJSONProvider, using orjson unless JSON_USE_ORJSON is turned off"""
+    provider = FastJSONProvider(app)
+    provider.use_orjson = FastJSONProvider.use_orjson and app.config['JSON_USE_ORJSON']
+    app.json = provider
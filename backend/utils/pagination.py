@@ -0,0 +1,61 @@
+import base64
+import json
+import threading
+import time
+from utils.tenancy import current_school
+
+
+class CursorPagination:
+    _count_cache = {}
+    _count_cache_lock = threading.Lock()
+
+    @staticmethod
+    def encode_cursor(values):
+        """Encode the sort key of the last row into an opaque cursor token"""
+        payload = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(token):
+        """Decode a cursor token, returning None if it is malformed"""
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (ValueError, TypeError):
+            return None
+        return values if isinstance(values, list) else None
+
+    @staticmethod
+    def get_after_id(args):
+        """Read the after query parameter as a row id: 0 when empty or absent, None when it is not an integer"""
+        after = args.get('after', '').strip()
+        if not after:
+            return 0
+        try:
+            return int(after)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def get_limit(args, default, maximum):
+        """Read the limit query parameter, clamped to [1, maximum]"""
+        limit = args.get('limit', default, type=int)
+        return max(1, min(limit, maximum))
+
+    @staticmethod
+    def count(query, cache_key=None, ttl=0):
+        """Count the rows of a query, reusing a cached value for up to ttl seconds"""
+        if not cache_key or ttl <= 0:
+            return query.order_by(None).count()
+
+        cache_key = (current_school(), cache_key)
+        now = time.monotonic()
+        with CursorPagination._count_cache_lock:
+            cached = CursorPagination._count_cache.get(cache_key)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        total = query.order_by(None).count()
+        with CursorPagination._count_cache_lock:
+            CursorPagination._count_cache[cache_key] = (total, now + ttl)
+        return total
@@ -0,0 +1,44 @@
+import functools
+from flask import current_app, g, has_request_context
+from sqlalchemy import event
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and context.execution_options.get('skip_query_budget'):
+        return
+    if has_request_context() and 'query_count' in g:
+        g.query_count += 1
+
+
+def init_query_budget(app, db):
+    """Count SQL statements issued while serving each budgeted request, on every school's engine"""
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _count_statement)
+
+
+def query_budget(max_queries):
+    """Fail (in strict mode) or warn when a view issues more than max_queries SQL statements.
+
+    Guards listing endpoints against N+1 lazy loads creeping back in; set
+    QUERY_BUDGET_STRICT to turn overruns into errors during development.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            g.query_count = 0
+            response = view(*args, **kwargs)
+
+            if g.query_count > max_queries:
+                message = f'{view.__name__} issued {g.query_count} SQL statements (budget {max_queries})'
+                if current_app.config['QUERY_BUDGET_STRICT']:
+                    raise QueryBudgetExceeded(message)
+                current_app.logger.warning(message)
+
+            return response
+        return wrapper
+    return decorator
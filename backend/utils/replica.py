@@ -0,0 +1,76 @@
+import functools
+import threading
+import time
+from datetime import datetime
+from flask import current_app, g
+from sqlalchemy import DateTime, column, select, table
+
+heartbeat = table('replica_heartbeat', column('id'), column('beat_at', DateTime))
+
+
+def replica_bind_key(school):
+    return f'replica:{school}'
+
+
+def read_replica(view):
+    """Serve a read-only view from the school's read replica when it is fresh enough.
+
+    The replica may trail the primary by up to REPLICA_MAX_LAG seconds, so only
+    mark views whose readers can tolerate that, not ones a client reloads to
+    see its own writes.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        g.read_replica = True
+        return view(*args, **kwargs)
+    return wrapper
+
+
+class ReplicaMonitor:
+    """Cached per-school replica lag checks"""
+    _status = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def measure_lag(engine):
+        """Seconds since the heartbeat the replica last received, or None if it has none.
+
+        The probe is bookkeeping rather than the view's own work, so it is left
+        out of the view's query budget.
+        """
+        with engine.connect().execution_options(skip_query_budget=True) as connection:
+            beat_at = connection.execute(select(heartbeat.c.beat_at).where(heartbeat.c.id == 1)).scalar()
+        return (datetime.utcnow() - beat_at).total_seconds() if beat_at else None
+
+    @staticmethod
+    def is_fresh(school, engine):
+        """Whether reads may go to engine, re-measuring at most every REPLICA_LAG_CHECK_INTERVAL seconds"""
+        now = time.monotonic()
+        with ReplicaMonitor._lock:
+            cached = ReplicaMonitor._status.get(school)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        try:
+            lag = ReplicaMonitor.measure_lag(engine)
+            fresh = lag is not None and lag <= current_app.config['REPLICA_MAX_LAG']
+            if not fresh:
+                current_app.logger.warning('Replica for %s is %s s behind; reading from the primary', school,
+                                           'unknown' if lag is None else round(lag, 1))
+        except Exception as e:
+            current_app.logger.warning('Replica for %s is unreachable (%s); reading from the primary', school, e)
+            fresh = False
+
+        with ReplicaMonitor._lock:
+            ReplicaMonitor._status[school] = (fresh, now + current_app.config['REPLICA_LAG_CHECK_INTERVAL'])
+        return fresh
+
+
+def replica_engine(db, school):
+    """The school's replica engine if the current view asked for it and the replica is fresh, else None"""
+    if not g.get('read_replica'):
+        return None
+    engine = db.engines.get(replica_bind_key(school))
+    if engine is None or not ReplicaMonitor.is_fresh(school, engine):
+        return None
+    return engine
@@ -0,0 +1,153 @@
+import functools
+import hashlib
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from flask import Response, current_app, request
+from utils.tenancy import current_school
+
+# Cache tags invalidated by successful writes to each blueprint
+INVALIDATED_BY = {
+    'students': ('students',),
+    'drives': ('drives',),
+    'vaccinations': ('drives',)
+}
+
+
+class CacheBackend(ABC):
+    """Storage interface for cached responses.
+
+    Values are plain tuples of bytes and strings, so a backend shared between
+    worker processes (Redis, memcached) only needs to implement these methods
+    and be passed to init_response_cache. A backend missing one of them fails
+    when it is constructed.
+    """
+
+    @abstractmethod
+    def get(self, key):
+        """Return the value stored under key, or None if it is missing or expired"""
+
+    @abstractmethod
+    def set(self, key, value, ttl=None):
+        """Store value under key, expiring after ttl seconds if given"""
+
+    @abstractmethod
+    def delete(self, key):
+        """Remove key if present"""
+
+    @abstractmethod
+    def clear(self):
+        """Remove every entry"""
+
+
+class LRUCache(CacheBackend):
+    """In-process cache evicting the least recently used entry once max_entries is reached"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self.lock:
+            self.entries[key] = (value, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def init_response_cache(app, backend=None):
+    """Attach a response cache to the app and invalidate it after successful writes"""
+    app.extensions['response_cache'] = backend or LRUCache(app.config['RESPONSE_CACHE_MAX_ENTRIES'])
+
+    @app.after_request
+    def invalidate_after_write(response):
+        if request.method not in ('GET', 'HEAD', 'OPTIONS') and response.status_code < 400:
+            invalidate_cache(*INVALIDATED_BY.get(request.blueprint, ()))
+        return response
+
+
+def _tag_key(tag):
+    # Tags are versioned per school, so one school's writes leave the others cached
+    return f'tag:{current_school()}:{tag}'
+
+
+def _tag_version(cache, tag):
+    # A missing version (never set, or evicted) gets a fresh one, so entries
+    # stored under an earlier version can never become reachable again
+    version = cache.get(_tag_key(tag))
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.set(_tag_key(tag), version)
+    return version
+
+
+def invalidate_cache(*tags):
+    """Drop every cached response tagged with any of tags"""
+    cache = current_app.extensions.get('response_cache')
+    if cache is None:
+        return
+    for tag in tags:
+        cache.set(_tag_key(tag), uuid.uuid4().hex)
+
+
+def cached_response(*tags, vary=None):
+    """Cache a view's 200 response, keyed by URL and the current version of each tag.
+
+    Responses carry an ETag, and requests whose If-None-Match matches get a
+    bodiless 304. vary, if given, returns extra key material such as today's
+    date for views whose result depends on more than the database.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = current_app.extensions.get('response_cache')
+            ttl = current_app.config['RESPONSE_CACHE_TTL']
+            if cache is None or ttl <= 0:
+                return view(*args, **kwargs)
+
+            # Read tag versions before running the view, so a write that lands
+            # meanwhile leaves this response under an already stale key
+            versions = ','.join(_tag_version(cache, tag) for tag in tags)
+            key = f'response:{current_school()}:{request.full_path}|{versions}|{vary() if vary else ""}'
+
+            entry = cache.get(key)
+            if entry is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                body = response.get_data()
+                entry = (body, response.mimetype, hashlib.blake2b(body, digest_size=16).hexdigest())
+                cache.set(key, entry, ttl)
+
+            body, mimetype, etag = entry
+            response = Response(body, mimetype=mimetype)
+            response.set_etag(etag)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
@@ -0,0 +1,48 @@
+from models import Student, VaccinationDrive, VaccinationRecord
+
+
+class RowSerializer:
+    """Serialize query results straight from SQL row tuples instead of ORM instances.
+
+    Selects only the listed columns and zips each row with the output names,
+    producing the same dicts as the model's to_dict() without building
+    instances. Dates stay as date objects for the JSON provider to write.
+    """
+
+    def __init__(self, columns):
+        self.names = tuple(name for name, _ in columns)
+        self.columns = [column.label(name) for name, column in columns]
+
+    def select(self, query):
+        """Restrict query to the serialized columns"""
+        return query.with_entities(*self.columns)
+
+    def serialize(self, rows):
+        names = self.names
+        return [dict(zip(names, row)) for row in rows]
+
+
+student_serializer = RowSerializer([
+    ('id', Student.id),
+    ('student_id', Student.student_id),
+    ('name', Student.name),
+    ('class_name', Student.class_name),
+    ('section', Student.section),
+    ('age', Student.age),
+    ('gender', Student.gender),
+    ('created_at', Student.created_at),
+    ('updated_at', Student.updated_at)
+])
+
+# Expects the query to join Student and VaccinationDrive
+vaccination_record_serializer = RowSerializer([
+    ('id', VaccinationRecord.id),
+    ('student_id', VaccinationRecord.student_id),
+    ('drive_id', VaccinationRecord.drive_id),
+    ('vaccine_name', VaccinationDrive.vaccine_name),
+    ('student_name', Student.name),
+    ('date', VaccinationRecord.date),
+    ('status', VaccinationRecord.status),
+    ('created_at', VaccinationRecord.created_at),
+    ('updated_at', VaccinationRecord.updated_at)
+])
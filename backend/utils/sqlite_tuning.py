@@ -0,0 +1,29 @@
+import functools
+from sqlalchemy import event
+
+
+def _apply_pragmas(dbapi_connection, connection_record, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+
+def init_sqlite_pragmas(app, db):
+    """Run the profile's SQLITE_PRAGMAS on each new connection to every SQLite engine.
+
+    WAL lets readers keep going while a write is in progress instead of
+    locking the whole file, and synchronous=NORMAL is safe in WAL mode. Must run
+    before the first connection is opened, since pooled connections keep the
+    settings they were opened with.
+    """
+    pragmas = app.config['SQLITE_PRAGMAS']
+    if not pragmas:
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', functools.partial(_apply_pragmas, pragmas=pragmas))
@@ -0,0 +1,55 @@
+from itertools import islice
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def requested_stream_format():
+    """Return 'ndjson' or 'json' if the client asked for a streamed response, else None.
+
+    NDJSON is chosen by an Accept: application/x-ndjson header or stream=ndjson;
+    stream=json (or stream=true) streams a regular JSON array.
+    """
+    stream = request.args.get('stream', '').lower()
+    if stream == 'ndjson' or request.accept_mimetypes.best == NDJSON_MIMETYPE:
+        return 'ndjson'
+    if stream in ('json', 'true'):
+        return 'json'
+    return None
+
+
+def batched(rows, batch_size):
+    """Group an iterable of rows into lists of up to batch_size"""
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def generate_json(batches, stream_format):
+    """Yield JSON text one batch of dicts at a time, as NDJSON lines or one JSON array"""
+    dumps = current_app.json.dumps
+
+    if stream_format == 'ndjson':
+        for batch in batches:
+            yield ''.join(dumps(item) + '\n' for item in batch)
+        return
+
+    yield '['
+    separator = ''
+    for batch in batches:
+        if batch:
+            # Encode the whole batch as one list and drop its brackets
+            yield separator + dumps(batch)[1:-1]
+            separator = ','
+    yield ']\n'
+
+
+def stream_json(rows, serialize, stream_format, batch_size):
+    """Stream rows from a yield_per cursor, serializing batch_size rows at a time.
+
+    serialize turns a list of rows into a list of dicts, so only one batch is
+    held in memory however many rows the query returns.
+    """
+    batches = (serialize(batch) for batch in batched(rows, batch_size))
+    mimetype = NDJSON_MIMETYPE if stream_format == 'ndjson' else 'application/json'
+    return Response(stream_with_context(generate_json(batches, stream_format)), mimetype=mimetype)
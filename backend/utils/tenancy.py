@@ -0,0 +1,81 @@
+from contextlib import contextmanager
+from flask import current_app, g, has_app_context, jsonify
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from flask_sqlalchemy.session import Session
+from utils.replica import replica_engine
+
+DEFAULT_SCHOOL = 'default'
+
+
+def bind_key(school):
+    return f'school:{school}'
+
+
+def current_school():
+    """The school (tenant) whose database the current app context talks to"""
+    if has_app_context():
+        return g.get('school_id', DEFAULT_SCHOOL)
+    return DEFAULT_SCHOOL
+
+
+def known_schools(app=None):
+    """Every configured school; the default school lives in SQLALCHEMY_DATABASE_URI"""
+    app = app or current_app
+    return [DEFAULT_SCHOOL] + [school for school in app.config['TENANT_DATABASES'] if school != DEFAULT_SCHOOL]
+
+
+def is_known_school(school):
+    return school in known_schools()
+
+
+class TenantSession(Session):
+    """Session that sends every statement to the current school's engine.
+
+    Schools listed in TENANT_DATABASES are configured as binds, each with its
+    own SQLite file or PostgreSQL schema, so a school's queries only ever see
+    that school's tables. Other statements fall back to the default engine.
+    Views marked @read_replica send their SELECT statements to the school's
+    replica instead. Flushes (which pass no clause), DML and raw SQL always go
+    to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is not None:
+            return bind
+        if has_app_context() and clause is not None and clause.is_select:
+            engine = replica_engine(self._db, current_school())
+            if engine is not None:
+                return engine
+        engine = self._db.engines.get(bind_key(current_school()))
+        if engine is not None:
+            return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def tenant_engine(db):
+    """Engine holding the current school's tables"""
+    return db.engines.get(bind_key(current_school()), db.engine)
+
+
+@contextmanager
+def tenant_context(app, school):
+    """Push a fresh app context (and so a fresh session) bound to school"""
+    with app.app_context():
+        g.school_id = school
+        yield
+
+
+def init_tenancy(app):
+    """Select each request's school from the school claim of its access token"""
+    @app.before_request
+    def select_school():
+        try:
+            verify_jwt_in_request(optional=True)
+            school = get_jwt().get('school', DEFAULT_SCHOOL)
+        except Exception:
+            # Invalid or expired tokens are rejected by jwt_required on the view itself
+            school = DEFAULT_SCHOOL
+
+        if not is_known_school(school):
+            return jsonify({'error': 'Unknown school'}), 401
+        g.school_id = school
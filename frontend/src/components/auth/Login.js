@@ -2,11 +2,12 @@ import React, { useState } from 'react';
 import { Form, Button, Alert, Card } from 'react-bootstrap';
 import { useAuth } from '../../contexts/AuthContext';
 import { useNavigate } from 'react-router-dom';
-import { FaLock, FaUser } from 'react-icons/fa';
+import { FaLock, FaSchool, FaUser } from 'react-icons/fa';
 
 const Login = () => {
     const [username, setUsername] = useState('');
     const [password, setPassword] = useState('');
+    const [school, setSchool] = useState('');
     const [error, setError] = useState('');
     const [loading, setLoading] = useState(false);
 
@@ -19,7 +20,7 @@ const Login = () => {
         try {
             setError('');
             setLoading(true);
-            await login(username, password);
+            await login(username, password, school);
         } catch (err) {
             setError(err.response?.data?.error || 'Failed to login');
         } finally {
@@ -65,6 +66,19 @@ const Login = () => {
                             />
                         </Form.Group>
 
+                        <Form.Group className="mb-3">
+                            <Form.Label>
+                                <FaSchool className="me-2" />
+                                School code
+                            </Form.Label>
+                            <Form.Control
+                                type="text"
+                                placeholder="Leave blank for the default school"
+                                value={school}
+                                onChange={(e) => setSchool(e.target.value.trim())}
+                            />
+                        </Form.Group>
+
                         <Button
                             variant="primary"
                             type="submit"
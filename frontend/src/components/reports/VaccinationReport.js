@@ -57,6 +57,7 @@ const VaccinationReport = () => {
             setLoading(true);
 
             const filterParams = {
+                include_count: true,
                 ...filters,
                 start_date: filters.start_date ? formatDateForAPI(filters.start_date) : undefined,
                 end_date: filters.end_date ? formatDateForAPI(filters.end_date) : undefined,
@@ -68,7 +69,7 @@ const VaccinationReport = () => {
             );
 
             const response = await reportService.getVaccinationReport(filterParams);
-            setReport(response);
+            setReport({ ...response, filterParams });
         } catch (error) {
             toast.error('Failed to generate report');
         } finally {
@@ -76,6 +77,28 @@ const VaccinationReport = () => {
         }
     };
 
+    const loadMoreRecords = async () => {
+        try {
+            setLoading(true);
+
+            const { include_count, ...filterParams } = report.filterParams;
+            const response = await reportService.getVaccinationReport({
+                ...filterParams,
+                cursor: report.next_cursor,
+            });
+
+            setReport(prev => ({
+                ...prev,
+                next_cursor: response.next_cursor,
+                records: [...prev.records, ...response.records],
+            }));
+        } catch (error) {
+            toast.error('Failed to load more records');
+        } finally {
+            setLoading(false);
+        }
+    };
+
     const downloadReport = async () => {
         try {
             const filterParams = {
@@ -178,12 +201,12 @@ const VaccinationReport = () => {
             {report && (
                 <Card>
                     <Card.Header className="d-flex justify-content-between align-items-center">
-                        <h5 className="mb-0">Report Results ({report.count} records)</h5>
+                        <h5 className="mb-0">Report Results ({report.estimated_total}{report.total_capped ? '+' : ''} records)</h5>
                         <Button
                             variant="success"
                             size="sm"
                             onClick={downloadReport}
-                            disabled={report.count === 0}
+                            disabled={report.records.length === 0}
                         >
                             <FaDownload /> Download CSV
                         </Button>
@@ -219,6 +242,17 @@ const VaccinationReport = () => {
                                 </tbody>
                             </Table>
                         )}
+                        {report.next_cursor && (
+                            <div className="d-flex justify-content-center">
+                                <Button
+                                    variant="outline-primary"
+                                    onClick={loadMoreRecords}
+                                    disabled={loading}
+                                >
+                                    {loading ? 'Loading...' : 'Load More'}
+                                </Button>
+                            </div>
+                        )}
                     </Card.Body>
                 </Card>
             )}
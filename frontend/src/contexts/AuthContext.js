@@ -34,9 +34,9 @@ export const AuthProvider = ({ children }) => {
         initAuth();
     }, []);
 
-    const login = async (username, password) => {
+    const login = async (username, password, school = '') => {
         try {
-            const response = await authService.login(username, password);
+            const response = await authService.login(username, password, school);
             localStorage.setItem('token', response.access_token);
             localStorage.setItem('user', JSON.stringify(response.user));
             setUser(response.user);
@@ -9,22 +9,52 @@ const api = axios.create({
     },
 });
 
+// Last response body per GET URL, revalidated with its ETag
+const responseCache = new Map();
+
+const cacheKey = (config) => api.getUri(config);
+
 // Add authorization header to requests if token exists
 api.interceptors.request.use((config) => {
     const token = localStorage.getItem('token');
     if (token) {
         config.headers.Authorization = `Bearer ${token}`;
     }
+
+    // Ask the server to confirm our cached copy instead of resending it
+    if (config.method === 'get') {
+        const cached = responseCache.get(cacheKey(config));
+        if (cached) {
+            config.headers['If-None-Match'] = cached.etag;
+            config.validateStatus = (status) => (status >= 200 && status < 300) || status === 304;
+        }
+    }
     return config;
 });
 
 // Handle token expiration
 api.interceptors.response.use(
-    (response) => response,
+    (response) => {
+        if (response.config.method !== 'get') {
+            return response;
+        }
+
+        const key = cacheKey(response.config);
+        if (response.status === 304 && responseCache.has(key)) {
+            return { ...response, status: 200, data: responseCache.get(key).data };
+        }
+
+        const etag = response.headers.etag;
+        if (etag) {
+            responseCache.set(key, { etag, data: response.data });
+        }
+        return response;
+    },
     (error) => {
         if (error.response?.status === 401) {
             localStorage.removeItem('token');
             localStorage.removeItem('user');
+            responseCache.clear();
             window.location.href = '/login';
         }
         return Promise.reject(error);
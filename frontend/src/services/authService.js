@@ -1,8 +1,12 @@
 import api from './api';
 
 const authService = {
-    login: async (username, password) => {
-        const response = await api.post('/auth/login', { username, password });
+    // school is optional; it selects the school's own database on multi-school deployments
+    login: async (username, password, school = '') => {
+        const credentials = { username, password };
+        if (school) credentials.school = school;
+
+        const response = await api.post('/auth/login', credentials);
         return response.data;
     },
 
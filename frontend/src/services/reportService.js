@@ -6,17 +6,19 @@ const reportService = {
         return response.data;
     },
 
-    downloadVaccinationReport: async (filters = {}) => {
+    // format is 'csv', 'parquet' or 'arrow'
+    downloadVaccinationReport: async (filters = {}, format = 'csv') => {
         const response = await api.get('/reports/vaccinations', {
-            params: { ...filters, download: true },
+            params: { ...filters, download: true, format },
             responseType: 'blob',
         });
+        const extension = { csv: 'csv', parquet: 'parquet', arrow: 'arrows' }[format];
 
         // Create a download link
         const url = window.URL.createObjectURL(new Blob([response.data]));
         const link = document.createElement('a');
         link.href = url;
-        link.setAttribute('download', 'vaccination_report.csv');
+        link.setAttribute('download', `vaccination_report.${extension}`);
         document.body.appendChild(link);
         link.click();
         link.remove();
@@ -8,6 +8,13 @@ const studentService = {
         return response.data;
     },
 
+    suggestStudents: async (query, limit = 10) => {
+        const response = await api.get('/students/suggest', {
+            params: { q: query, limit },
+        });
+        return response.data;
+    },
+
     getStudent: async (id) => {
         const response = await api.get(`/students/${id}`);
         return response.data;
@@ -37,6 +44,22 @@ const studentService = {
                 'Content-Type': 'multipart/form-data',
             },
         });
+
+        // Imports run as background jobs; poll until the job finishes
+        let job = response.data;
+        while (job.status === 'Queued' || job.status === 'Running') {
+            await new Promise((resolve) => setTimeout(resolve, 1000));
+            job = await studentService.getImportJob(job.job_id);
+        }
+
+        if (job.status === 'Failed') {
+            throw new Error(job.message);
+        }
+        return job;
+    },
+
+    getImportJob: async (jobId) => {
+        const response = await api.get(`/students/bulk/${jobId}`);
         return response.data;
     },
 };
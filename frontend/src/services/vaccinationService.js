@@ -14,6 +14,23 @@ const vaccinationService = {
         return response.data;
     },
 
+    getPendingStudents: async (driveId, cursor = null, perPage = 100) => {
+        const params = { per_page: perPage };
+        if (cursor) params.cursor = cursor;
+
+        const response = await api.get(`/drives/${driveId}/pending`, { params });
+        return response.data;
+    },
+
+    getDriveAvailability: async (date = null, count = 5, excludeDriveId = null) => {
+        const params = { count };
+        if (date) params.date = date;
+        if (excludeDriveId) params.exclude_drive_id = excludeDriveId;
+
+        const response = await api.get('/drives/availability', { params });
+        return response.data;
+    },
+
     createDrive: async (driveData) => {
         const response = await api.post('/drives', driveData);
         return response.data;
@@ -35,6 +52,14 @@ const vaccinationService = {
         return response.data;
     },
 
+    recordVaccinationBatch: async (driveId, studentIds) => {
+        const response = await api.post('/vaccinations/batch', {
+            drive_id: driveId,
+            student_ids: studentIds,
+        });
+        return response.data;
+    },
+
     getVaccinationRecords: async (studentId = null, driveId = null) => {
         const params = {};
         if (studentId) params.student_id = studentId;